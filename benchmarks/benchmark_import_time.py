@@ -0,0 +1,73 @@
+"""
+Measure the import cost of the ode_gen modules in fresh interpreters.
+
+Each module is imported in a new process with `python -X importtime`; the
+cumulative time of the module itself is reported (minimum over repeats),
+together with the heavy third-party packages that the import pulled in.
+
+    python benchmarks/benchmark_import_time.py --repeat 5 --out import_time.json
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+MODULES = [
+    "ode_gen",
+    "ode_gen.reactions",
+    "ode_gen.complexes.examples",
+    "ode_gen.complexes.subcomplexes",
+    "ode_gen.reactions.dimer",
+    "ode_gen.reactions.transformation",
+    "ode_gen.symmetry.pointgroup",
+]
+
+HEAVY_PACKAGES = ["networkx", "numpy", "scipy", "pandas", "matplotlib"]
+
+def measure_import(module):
+    """Return (cumulative import time in microseconds, heavy packages loaded) for one fresh import."""
+    code = (
+        f"import {module}, sys; "
+        f"print(','.join(p for p in {HEAVY_PACKAGES!r} if p in sys.modules))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, check=True,
+    )
+
+    cumulative = None
+    for line in proc.stderr.splitlines():
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            cumulative = int(parts[1])
+
+    loaded = [p for p in proc.stdout.strip().split(",") if p]
+    return cumulative, loaded
+
+def benchmark_imports(modules=MODULES, repeat=5):
+    results = {}
+    for module in modules:
+        timings = []
+        loaded = []
+        for _ in range(repeat):
+            cumulative, loaded = measure_import(module)
+            timings.append(cumulative)
+        results[module] = {
+            "import_time_us": min(timings),
+            "heavy_packages": loaded,
+        }
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--out", type=str, default=None, help="write results as JSON")
+    args = parser.parse_args()
+
+    results = benchmark_imports(repeat=args.repeat)
+    for module, res in results.items():
+        print(f"{module:40s} {res['import_time_us'] / 1000:8.1f} ms  {', '.join(res['heavy_packages'])}")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=4)
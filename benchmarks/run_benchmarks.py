@@ -0,0 +1,267 @@
+"""
+Benchmark harness for the species / reaction generation pipeline.
+
+Every case is one assembly graph: an entry of `complexes.examples.graph_registry`
+or a member of a scaling family of `complexes.examples.scaling_families`
+(`ring:12`, `cage:octahedron,3`). A trailing integer range sweeps a family
+(`ring:4..12` expands to ring:4, ring:5, ..., ring:12). Each case runs in a fresh
+interpreter so that peak RSS is attributable to it; inside, the pipeline is run
+`--warmup` times untimed and `--repeat` times timed, with `time.perf_counter`
+around every stage.
+
+    python benchmarks/run_benchmarks.py                          # all registry examples
+    python benchmarks/run_benchmarks.py 8y7s ring:6..10 random:10..14 --skip-transformations
+    python benchmarks/run_benchmarks.py --out bench.json
+    python benchmarks/run_benchmarks.py --out new.json --compare bench.json
+
+The JSON output records, per case, the timing statistics of each stage, the
+peak RSS of the case process and its pool workers, and the object counts
+(species, reactions, transformations, live Python objects).
+"""
+import argparse
+import gc
+import json
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import networkx as nx
+
+from ode_gen.complexes.examples import get_example, graph_registry
+from ode_gen.complexes.subcomplexes import get_unique_fully_connected_subgraphs
+from ode_gen.reactions.dimer import find_all_dimer_reactions
+from ode_gen.reactions.transformation import find_all_transformable_subgraph_pairs
+
+STAGES = ["species", "dimer_reactions", "bonds_broken", "transformations"]
+
+################################
+# Cases
+################################
+
+def expand_cases(names):
+    """Expand family sweeps such as 'ring:4..8' or 'random:10..12,3' into single cases."""
+    cases = []
+    for name in names:
+        family, _, args = name.partition(":")
+        first, _, rest = args.partition(",")
+        if ".." in first:
+            start, stop = (int(x) for x in first.split(".."))
+            suffix = f",{rest}" if rest else ""
+            cases.extend(f"{family}:{size}{suffix}" for size in range(start, stop + 1))
+        else:
+            cases.append(name)
+    return cases
+
+################################
+# Measurement
+################################
+
+def capture_environment_info():
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "platform": platform.system(),
+        "platform_version": platform.version(),
+        "python_version": platform.python_version(),
+        "hostname": platform.node(),
+        "cpu": platform.processor(),
+        "networkx_version": nx.__version__,
+    }
+
+def peak_rss_kb():
+    """Peak resident set size of this process and of its (finished) children, in kB."""
+    scale = 1024 if sys.platform == "darwin" else 1  # macOS reports bytes
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale
+    return {"self": int(own), "children": int(children)}
+
+def run_pipeline(G, use_multiprocessing=False, transformations=True):
+    """Run all pipeline stages once; return per-stage durations and object counts."""
+    timings = {}
+
+    t0 = time.perf_counter()
+    species = get_unique_fully_connected_subgraphs(G)
+    timings["species"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    reactions = find_all_dimer_reactions(species, use_multiprocessing=use_multiprocessing)
+    timings["dimer_reactions"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    # cut masks are emitted by the split enumeration, so this only counts bits
+    n_bonds_broken = sum(reaction.n_broken_bonds for reaction in reactions)
+    timings["bonds_broken"] = time.perf_counter() - t0
+
+    n_transformations = None
+    if transformations:
+        t0 = time.perf_counter()
+        pairs = find_all_transformable_subgraph_pairs(G, species)
+        timings["transformations"] = time.perf_counter() - t0
+        n_transformations = len(pairs)
+
+    counts = {
+        "n_nodes": G.number_of_nodes(),
+        "n_edges": G.number_of_edges(),
+        "n_species": len(species),
+        "n_reactions": len(reactions),
+        "n_bonds_broken": n_bonds_broken,
+        "n_transformations": n_transformations,
+        "n_live_objects": len(gc.get_objects()),
+    }
+    return timings, counts
+
+def summarize(samples):
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.fmean(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "runs": samples,
+    }
+
+def benchmark_case(name, repeat=3, warmup=1, use_multiprocessing=False, transformations=True):
+    """Benchmark one case in the current process."""
+    G = get_example(name)
+
+    for _ in range(warmup):
+        run_pipeline(G, use_multiprocessing, transformations)
+
+    samples = {}
+    counts = None
+    for _ in range(repeat):
+        gc.collect()
+        timings, counts = run_pipeline(G, use_multiprocessing, transformations)
+        for stage, duration in timings.items():
+            samples.setdefault(stage, []).append(duration)
+
+    timings = {stage: summarize(values) for stage, values in samples.items()}
+    timings["total"] = summarize([sum(run) for run in zip(*samples.values())])
+
+    return {
+        "timings": timings,
+        "counts": counts,
+        "peak_rss_kb": peak_rss_kb(),
+    }
+
+def benchmark_case_isolated(name, args):
+    """Benchmark one case in a fresh interpreter so peak RSS belongs to it alone."""
+    cmd = [
+        sys.executable, __file__, name, "--single",
+        "--repeat", str(args.repeat), "--warmup", str(args.warmup),
+    ]
+    if args.multiprocessing:
+        cmd.append("--multiprocessing")
+    if args.skip_transformations:
+        cmd.append("--skip-transformations")
+
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    if proc.returncode != 0:
+        return {"error": proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "failed"}
+    return json.loads(proc.stdout)
+
+################################
+# Regression comparison
+################################
+
+def compare(results, baseline, threshold=0.2, min_seconds=0.01, statistic="median"):
+    """
+    Compare per-stage timings against a baseline report.
+
+    Returns a list of (case, stage, baseline, current, ratio, regressed) rows;
+    a stage regresses when it is more than `threshold` slower than the baseline
+    and by more than `min_seconds`, so timer noise on tiny stages is ignored.
+    Changed object counts are reported as regressions of the pseudo-stage 'counts'.
+    """
+    rows = []
+    for case, current in results["results"].items():
+        reference = baseline.get("results", {}).get(case)
+        if reference is None or "error" in current or "error" in reference:
+            continue
+
+        for stage, stats in current["timings"].items():
+            if stage not in reference["timings"]:
+                continue
+            before = reference["timings"][stage][statistic]
+            after = stats[statistic]
+            ratio = after / before if before > 0 else float("inf")
+            regressed = ratio > 1 + threshold and after - before > min_seconds
+            rows.append((case, stage, before, after, ratio, regressed))
+
+        for key in ("n_species", "n_reactions", "n_transformations"):
+            before, after = reference["counts"].get(key), current["counts"].get(key)
+            if before is not None and after is not None and before != after:
+                rows.append((case, f"counts.{key}", before, after, after / before if before else float("inf"), True))
+    return rows
+
+################################
+# Command line
+################################
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the ode_gen pipeline.")
+    parser.add_argument("cases", nargs="*", help="registry names or '<family>:<args>' (default: all registry examples)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs per case")
+    parser.add_argument("--multiprocessing", action="store_true", help="use a process pool for dimer reactions")
+    parser.add_argument("--skip-transformations", action="store_true", help="skip the pairwise transformation stage")
+    parser.add_argument("--out", type=str, default=None, help="write the JSON report to this file")
+    parser.add_argument("--compare", type=str, default=None, help="baseline JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="relative slowdown counted as a regression")
+    parser.add_argument("--min-seconds", type=float, default=0.01, help="absolute slowdown below which stages never regress")
+    parser.add_argument("--single", action="store_true", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.single:
+        result = benchmark_case(args.cases[0], args.repeat, args.warmup,
+                                args.multiprocessing, not args.skip_transformations)
+        json.dump(result, sys.stdout)
+        return 0
+
+    cases = expand_cases(args.cases) or list(graph_registry)
+    report = {
+        "environment": capture_environment_info(),
+        "config": {
+            "repeat": args.repeat,
+            "warmup": args.warmup,
+            "multiprocessing": args.multiprocessing,
+            "transformations": not args.skip_transformations,
+        },
+        "results": {},
+    }
+
+    for name in cases:
+        result = benchmark_case_isolated(name, args)
+        report["results"][name] = result
+        if "error" in result:
+            print(f"{name:20s} ERROR {result['error']}")
+            continue
+        timings = result["timings"]
+        stages = "  ".join(f"{stage}={timings[stage]['median']:.4f}s" for stage in STAGES if stage in timings)
+        print(f"{name:20s} species={result['counts']['n_species']:<7d} "
+              f"reactions={result['counts']['n_reactions']:<8d} {stages}  "
+              f"rss={result['peak_rss_kb']['self'] / 1024:.1f}MB")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=4)
+        print(f"Saved benchmark report to: {args.out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows = compare(report, baseline, args.threshold, args.min_seconds)
+        for case, stage, before, after, ratio, regressed in rows:
+            flag = "REGRESSION" if regressed else ""
+            print(f"{case:20s} {stage:28s} {before:10.4f} -> {after:10.4f}  x{ratio:5.2f} {flag}")
+        if any(row[-1] for row in rows):
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -25,3 +25,16 @@ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 THE SOFTWARE.
 """
+from importlib import import_module
+
+# Subpackages are imported on first attribute access (`ode_gen.symmetry`, ...),
+# so `import ode_gen` stays cheap for worker processes and short jobs.
+_SUBPACKAGES = ("complexes", "reactions", "symmetry")
+
+def __getattr__(name):
+    if name in _SUBPACKAGES:
+        return import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBPACKAGES))
@@ -0,0 +1,98 @@
+import hashlib
+import os
+import pickle
+import tempfile
+from time import perf_counter
+
+CHECKPOINT_VERSION = 5
+
+def graph_fingerprint(graphs):
+    """
+    Digest of the nodes (in iteration order), node types and typed edges of a
+    sequence of graphs, used to refuse resuming a checkpoint on other inputs.
+    """
+    digest = hashlib.sha256()
+    for H in graphs:
+        nodes = list(H.nodes(data="type"))
+        edges = list(H.edges(data="type"))
+        digest.update(repr((nodes, edges)).encode())
+    return digest.hexdigest()
+
+def save_checkpoint(path, state):
+    """
+    Atomically write a checkpoint: the state is pickled to a temporary file in
+    the same directory, which then replaces `path`, so an interruption never
+    leaves a truncated checkpoint behind.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".checkpoint-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+def load_checkpoint(path, kind, fingerprint):
+    """
+    Load a checkpoint written for the same kind of enumeration and inputs.
+
+    Returns
+    -------
+    dict or None
+        The saved state, or None if `path` does not exist.
+
+    Raises
+    ------
+    ValueError
+        If the checkpoint belongs to another enumeration, input or format version.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        state = pickle.load(f)
+    if state.get("version") != CHECKPOINT_VERSION or state.get("kind") != kind:
+        raise ValueError(f"{path} is not a version {CHECKPOINT_VERSION} '{kind}' checkpoint.")
+    if state.get("fingerprint") != fingerprint:
+        raise ValueError(f"{path} was written for a different input.")
+    return state
+
+class Checkpointer:
+    """
+    Periodic checkpoint writer of one enumeration.
+
+    Parameters
+    ----------
+    path : str
+        Checkpoint file.
+    kind : str
+        Enumeration that owns the checkpoint ('species' or 'dimer_reactions').
+    fingerprint : str
+        `graph_fingerprint` of the inputs.
+    interval : float
+        Minimum number of seconds between two saves.
+    """
+
+    def __init__(self, path, kind, fingerprint, interval=300.0):
+        self.path = path
+        self.kind = kind
+        self.fingerprint = fingerprint
+        self.interval = interval
+        self.n_saved = 0
+        self._next = perf_counter() + interval
+
+    def load(self):
+        return load_checkpoint(self.path, self.kind, self.fingerprint)
+
+    def due(self):
+        return perf_counter() >= self._next
+
+    def save(self, **state):
+        state.update(version=CHECKPOINT_VERSION, kind=self.kind, fingerprint=self.fingerprint)
+        save_checkpoint(self.path, state)
+        self.n_saved += 1
+        self._next = perf_counter() + self.interval
@@ -0,0 +1,253 @@
+from collections import Counter
+from time import perf_counter
+from networkx.algorithms.isomorphism import GraphMatcher
+from ode_gen.complexes.subcomplexes import _bit_indices
+from ode_gen.complexes.wl import BatchedWL, WL_BATCH_SIZE
+from ode_gen.hashset import CompactHashSet
+
+def _node_match(n1, n2):
+    return n1.get("type") == n2.get("type")
+
+def _edge_match(e1, e2):
+    return e1.get("type") == e2.get("type")
+
+def typed_automorphisms(G):
+    """
+    All automorphisms of G that preserve node and edge types, as tuples p
+    with p[i] the index (in G's node order) of the image of node i. The
+    identity comes first.
+    """
+    nodes = list(G)
+    index = {node: i for i, node in enumerate(nodes)}
+    identity = tuple(range(len(nodes)))
+    automorphisms = [identity]
+    matcher = GraphMatcher(G, G, node_match=_node_match, edge_match=_edge_match)
+    for mapping in matcher.isomorphisms_iter():
+        permutation = tuple(index[mapping[node]] for node in nodes)
+        if permutation != identity:
+            automorphisms.append(permutation)
+    return automorphisms
+
+def _cycles(permutation):
+    """Cycles of a permutation, as lists of indices."""
+    seen = [False] * len(permutation)
+    cycles = []
+    for start in range(len(permutation)):
+        if not seen[start]:
+            cycle = []
+            i = start
+            while not seen[i]:
+                seen[i] = True
+                cycle.append(i)
+                i = permutation[i]
+            cycles.append(cycle)
+    return cycles
+
+def _is_connected_mask(mask, neighbor_masks):
+    """Whether the nodes of a (nonempty) bitmask induce a connected subgraph."""
+    reached = frontier = mask & -mask
+    while frontier:
+        low = frontier & -frontier
+        frontier ^= low
+        new = neighbor_masks[low.bit_length() - 1] & mask & ~reached
+        reached |= new
+        frontier |= new
+    return reached == mask
+
+def _neighbor_masks(G):
+    index = {node: i for i, node in enumerate(G)}
+    neighbor_masks = [0] * len(G)
+    for u, v in G.edges():
+        neighbor_masks[index[u]] |= 1 << index[v]
+        neighbor_masks[index[v]] |= 1 << index[u]
+    return neighbor_masks
+
+def _connected_unions(neighbor_masks, cycles, max_size):
+    """
+    Yield (node mask, size) of the unions of cycles (disjoint node groups)
+    that are connected in the quotient graph of the cycles, each exactly once,
+    with ESU (Wernicke's extension-set scheme) on the quotient. With one cycle
+    per node these are exactly the connected node subsets. Single isolated
+    nodes are skipped, as in the species enumeration.
+    """
+    masks = []
+    cycle_of = {}
+    for c, cycle in enumerate(cycles):
+        mask = 0
+        for i in cycle:
+            mask |= 1 << i
+            cycle_of[i] = c
+        masks.append(mask)
+    sizes = [len(cycle) for cycle in cycles]
+    quotient = []
+    for c, cycle in enumerate(cycles):
+        reach = 0
+        for i in cycle:
+            reach |= neighbor_masks[i]
+        adjacent = 0
+        while reach:
+            low = reach & -reach
+            reach ^= low
+            adjacent |= 1 << cycle_of[low.bit_length() - 1]
+        quotient.append(adjacent & ~(1 << c))
+
+    for v in range(len(cycles)):
+        if sizes[v] > max_size or (sizes[v] == 1 and not neighbor_masks[cycles[v][0]]):
+            continue
+        larger = ~((2 << v) - 1)
+        # (node mask, size, extension set, cycles in the union and their neighbors)
+        stack = [(masks[v], sizes[v], quotient[v] & larger, quotient[v] | 1 << v)]
+        while stack:
+            nodes, size, extension, closed = stack.pop()
+            yield nodes, size
+            while extension:
+                low = extension & -extension
+                extension ^= low
+                w = low.bit_length() - 1
+                if size + sizes[w] > max_size:
+                    continue
+                stack.append((nodes | masks[w], size + sizes[w],
+                              extension | (quotient[w] & ~closed & larger), closed | quotient[w]))
+
+def orbit_upper_bound_by_size(G, max_size=None, stats=None):
+    """
+    Upper bound, by size, on the number of species of G: the number of
+    connected subcomplexes up to the symmetries of the whole assembly
+    (Aut(G)-orbits), counted without materializing them. This is a
+    feasibility bound, not a species count.
+
+    By Burnside's lemma the number of orbits of connected node subsets under
+    the typed automorphism group Aut(G) is the average, over g in Aut(G), of
+    the number of connected subsets fixed by g. A subset is fixed by g when it
+    is a union of cycles of g, so the fixed subsets of g are counted on the
+    much smaller quotient graph of its cycles; only the identity term visits
+    every connected subset, and only as a bitmask.
+
+    Two subcomplexes in one orbit are always isomorphic, but isomorphic
+    subcomplexes need not be related by a symmetry of the whole assembly, so
+    the count is an upper bound on the number of species returned by
+    `get_unique_fully_connected_subgraphs`. It is exact for e.g. ring_8 and
+    octahedral_cage, but not for tetrahedral_cage (129 orbits, 100 species)
+    or for assemblies without symmetry; `count_species_by_size` gives the
+    exact number. Isolated nodes are not counted, as in the enumeration.
+
+    Parameters
+    ----------
+    G : networkx.Graph
+        Assembly graph with "type" node and edge attributes.
+    max_size : int, optional
+        Largest subcomplex size to count.
+    stats : ode_gen.stats.EnumerationStats, optional
+        Receives the counters automorphisms and connected_subsets (the
+        identity term), and the phase timings automorphisms and counting.
+
+    Returns
+    -------
+    dict
+        Number of orbits (>= number of species) for each size, in increasing
+        order of size.
+    """
+    max_size = len(G) if max_size is None else min(max_size, len(G))
+    neighbor_masks = _neighbor_masks(G)
+
+    start = perf_counter()
+    automorphisms = typed_automorphisms(G)
+    automorphism_time = perf_counter() - start
+
+    start = perf_counter()
+    totals = Counter()
+    for g, permutation in enumerate(automorphisms):
+        cycles = _cycles(permutation)
+        if g == 0:
+            # identity: every connected subset is fixed
+            fixed = Counter(size for _, size in _connected_unions(neighbor_masks, cycles, max_size))
+            if stats is not None:
+                stats.count("connected_subsets", sum(fixed.values()))
+        else:
+            # fixed subsets are the unions of cycles that are connected in G
+            fixed = Counter(size for nodes, size in _connected_unions(neighbor_masks, cycles, max_size)
+                            if _is_connected_mask(nodes, neighbor_masks))
+        totals.update(fixed)
+
+    orbits = {}
+    for size in sorted(totals):
+        count, remainder = divmod(totals[size], len(automorphisms))
+        assert remainder == 0, "Burnside sum not divisible by the group order."
+        orbits[size] = count
+    if stats is not None:
+        stats.count("automorphisms", len(automorphisms))
+        stats.add_time("automorphisms", automorphism_time)
+        stats.add_time("counting", perf_counter() - start)
+    return orbits
+
+def count_species_by_size(G, max_size=None, stats=None):
+    """
+    Count the species of G (connected subcomplexes up to typed isomorphism),
+    by size, without materializing them.
+
+    Connected subsets are enumerated as bitmasks with ESU and streamed, per
+    size, through `ode_gen.complexes.wl.BatchedWL`; only a `CompactHashSet`
+    of the hashes of each size is kept. The counts equal the sizes of the
+    levels of `iter_species_by_level` (and of the output of
+    `get_unique_fully_connected_subgraphs`), at a memory cost of 21 to 43 bytes
+    per species. The cost is still linear in the number of connected subsets,
+    since every one of them is hashed; when that is infeasible,
+    `orbit_upper_bound_by_size` (an upper bound, fast when G is very
+    symmetric) and `ode_gen.complexes.sampling.estimate_species_counts` bound
+    the count instead.
+
+    Parameters
+    ----------
+    G : networkx.Graph
+        Assembly graph with "type" node and edge attributes.
+    max_size : int, optional
+        Largest species size to count.
+    stats : ode_gen.stats.EnumerationStats, optional
+        Receives the counters connected_subsets and hash_computations, and
+        the phase timings counting and hashing.
+
+    Returns
+    -------
+    dict
+        Number of species for each size, in increasing order of size.
+
+    Examples
+    --------
+    >>> count_species_by_size(get_example("ring_8"))  # doctest: +SKIP
+    {1: 1, 2: 1, 3: 1, 4: 1, 5: 1, 6: 1, 7: 1, 8: 1}
+    """
+    max_size = len(G) if max_size is None else min(max_size, len(G))
+    neighbor_masks = _neighbor_masks(G)
+    hasher = BatchedWL(G)
+    seen = {}
+    pending = {}
+    n_subsets = 0
+    hashing_time = 0.0
+
+    def flush(size):
+        nonlocal hashing_time
+        t0 = perf_counter()
+        subsets = [_bit_indices(mask) for mask in pending.pop(size)]
+        seen.setdefault(size, CompactHashSet()).update(hasher.hash_index_subsets(subsets))
+        hashing_time += perf_counter() - t0
+
+    start = perf_counter()
+    for nodes, size in _connected_unions(neighbor_masks, [[i] for i in range(len(G))], max_size):
+        n_subsets += 1
+        batch = pending.setdefault(size, [])
+        batch.append(nodes)
+        if len(batch) == WL_BATCH_SIZE:
+            flush(size)
+    for size in list(pending):
+        flush(size)
+
+    if stats is not None:
+        stats.count("connected_subsets", n_subsets)
+        stats.count("hash_computations", n_subsets)
+        stats.add_time("hashing", hashing_time)
+        stats.add_time("counting", perf_counter() - start)
+    return {size: len(seen[size]) for size in sorted(seen)}
+
+def count_species(G, max_size=None, stats=None):
+    """Number of species of G (see `count_species_by_size`)."""
+    return sum(count_species_by_size(G, max_size, stats).values())
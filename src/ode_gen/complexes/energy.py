@@ -0,0 +1,97 @@
+import numpy as np
+
+from ode_gen.complexes.wl import WL_BATCH_SIZE
+
+def edge_energies(G, energies):
+    """
+    Energy of every edge of G from a table keyed by edge type, in the order
+    of `G.edges()`.
+
+    Raises
+    ------
+    ValueError
+        If the table has no energy for the type of some edge.
+    """
+    values = []
+    for u, v, edge_type in G.edges(data="type"):
+        if edge_type not in energies:
+            raise ValueError(f"No energy for edge type {edge_type!r} of edge ({u!r}, {v!r}).")
+        values.append(energies[edge_type])
+    return np.array(values, dtype=float)
+
+class SubsetEnergies:
+    """
+    Binding energies of many induced subgraphs of one parent graph at once:
+    the energy of a subgraph is the sum of the energies of its edges (bonds),
+    looked up by edge type, so that with negative interface energies lower is
+    more stable. A batch of node subsets is evaluated as a (subsets x edges)
+    boolean matrix product with the edge energies.
+
+    Parameters
+    ----------
+    G : networkx.Graph
+        Parent graph with "type" edge attributes.
+    energies : dict
+        Energy of each edge type, e.g. {"hex": -6.0, "tri": -4.0, "di": -2.0}.
+
+    Examples
+    --------
+    >>> model = SubsetEnergies(graph_5l93(), {"hex": -6.0, "tri": -4.0, "di": -2.0})  # doctest: +SKIP
+    >>> model.of_index_subsets([(0, 1), (0, 1, 7)])  # doctest: +SKIP
+    array([ -6., -12.])
+    """
+
+    def __init__(self, G, energies):
+        self.nodes = list(G)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        edges = [(self.index[u], self.index[v]) for u, v in G.edges()]
+        self._src = np.array([u for u, _ in edges], dtype=np.int64)
+        self._dst = np.array([v for _, v in edges], dtype=np.int64)
+        self._values = edge_energies(G, energies)
+
+    def of_index_subsets(self, subsets):
+        """Energies of the subgraphs induced by subsets of node indices (positions in `self.nodes`)."""
+        member = np.zeros((len(subsets), len(self.nodes)), dtype=bool)
+        for row, subset in enumerate(subsets):
+            member[row, list(subset)] = True
+        return (member[:, self._src] & member[:, self._dst]) @ self._values
+
+    def of_subsets(self, subsets):
+        """Energies of the subgraphs induced by subsets of nodes."""
+        index = self.index
+        return self.of_index_subsets([[index[node] for node in subset] for subset in subsets])
+
+def species_energies(species, energies, G=None):
+    """
+    Binding energies of a list of species (sums of their typed bond energies)
+    as an array, computed in one vectorized reduction over all their edges.
+
+    If the species are induced subgraphs of an assembly G (as returned by
+    `get_unique_fully_connected_subgraphs` or `iter_species_by_level`), pass
+    G to evaluate them from their node sets with `SubsetEnergies`, which
+    avoids iterating over the edges of each subgraph view.
+
+    Raises
+    ------
+    ValueError
+        If the table has no energy for the type of some edge.
+    """
+    if G is not None:
+        model = SubsetEnergies(G, energies)
+        if not species:
+            return np.zeros(0)
+        return np.concatenate([model.of_subsets(species[first:first + WL_BATCH_SIZE])
+                               for first in range(0, len(species), WL_BATCH_SIZE)])
+
+    types = {edge_type: code for code, edge_type in enumerate(energies)}
+    owners = []
+    codes = []
+    for s, H in enumerate(species):
+        for u, v, edge_type in H.edges(data="type"):
+            if edge_type not in types:
+                raise ValueError(f"No energy for edge type {edge_type!r} of edge ({u!r}, {v!r}).")
+            owners.append(s)
+            codes.append(types[edge_type])
+    values = np.array(list(energies.values()), dtype=float)
+    return np.bincount(np.array(owners, dtype=np.int64), weights=values[np.array(codes, dtype=np.int64)],
+                       minlength=len(species))
@@ -1,4 +1,9 @@
+import random
+from functools import partial
+from itertools import combinations
+
 import networkx as nx
+import numpy as np
 
 def graph_5l93():
     G = nx.Graph()
@@ -34,6 +39,215 @@ def graph_asymmetry_4mer():
     ])
     return G
 
+################################
+# Synthetic assemblies
+################################
+
+def graph_ring(n, node_type="A", edge_type="ring"):
+    """
+    Homomeric ring of n >= 3 subunits, with positions on a regular polygon of unit side.
+    """
+    if n < 3:
+        raise ValueError(f"A ring needs at least 3 subunits, got {n}.")
+    G = nx.cycle_graph(n)
+    radius = 0.5 / np.sin(np.pi / n)
+    for i in G.nodes:
+        angle = 2 * np.pi * i / n
+        G.nodes[i]["type"] = node_type
+        G.nodes[i]["pos"] = _position((radius * np.cos(angle), radius * np.sin(angle), 0.0))
+    nx.set_edge_attributes(G, edge_type, "type")
+    return G
+
+def _position(vector):
+    return tuple(float(x) for x in vector)
+
+def _hex_distance(q, r):
+    return max(abs(q), abs(r), abs(q + r))
+
+def graph_hexamer_lattice(rings=0, partners=True):
+    """
+    Patch of a hexamer-of-trimers lattice (e.g. an immature Gag lattice).
+
+    Hexamers sit on a triangular lattice. Each of the six subunits of a hexamer
+    forms a 'hex' interface with its two ring neighbours, a 'tri' interface with
+    the subunits of the two adjacent hexamers that point into the same lattice
+    triangle, and a 'di' interface across the lattice edge to the adjacent
+    hexamer.
+
+    Parameters
+    ----------
+    rings : int
+        Complete hexamers are those within this hexagonal distance of the
+        origin (0 → 1 hexamer, 1 → 7 hexamers, 2 → 19 hexamers, ...).
+    partners : bool
+        Also include the subunits of surrounding hexamers that share a trimer
+        with a complete hexamer. With rings=0 this gives the 18-mer of `graph_5l93`.
+
+    Returns
+    -------
+    networkx.Graph
+        Nodes are labelled 0..N-1 with 'type' and planar 'pos' attributes.
+    """
+    # axial lattice directions, direction d at angle 60°·d
+    directions = [(1, 0), (0, 1), (-1, 1), (-1, 0), (0, -1), (1, -1)]
+
+    def center(q, r):
+        return np.array([q + 0.5 * r, np.sqrt(3) / 2 * r, 0.0])
+
+    # subunit (q, r, j) of hexamer (q, r) points at 60°·j + 30°, into the lattice
+    # triangle spanned by the neighbours in directions j and j + 1
+    def triangle(q, r, j):
+        dq1, dr1 = directions[j]
+        dq2, dr2 = directions[(j + 1) % 6]
+        return [(q, r, j), (q + dq1, r + dr1, (j + 2) % 6), (q + dq2, r + dr2, (j + 4) % 6)]
+
+    def dimer_partner(q, r, j):
+        dq, dr = directions[j]
+        return (q + dq, r + dr, (j + 3) % 6)
+
+    core = [(q, r) for q in range(-rings, rings + 1) for r in range(-rings, rings + 1)
+            if _hex_distance(q, r) <= rings]
+
+    subunits = {(q, r, j) for q, r in core for j in range(6)}
+    if partners:
+        subunits |= {member for q, r in core for j in range(6) for member in triangle(q, r, j)}
+
+    edges = {}
+    for q, r, j in subunits:
+        s = (q, r, j)
+        if (q, r) in core:
+            edges[frozenset((s, (q, r, (j + 1) % 6)))] = "hex"
+        for member in triangle(q, r, j)[1:]:
+            edges[frozenset((s, member))] = "tri"
+        edges[frozenset((s, dimer_partner(q, r, j)))] = "di"
+
+    # core hexamers first, in a deterministic order
+    ordered = sorted(subunits, key=lambda s: ((s[0], s[1]) not in core, _hex_distance(s[0], s[1]), s))
+    labels = {s: i for i, s in enumerate(ordered)}
+
+    G = nx.Graph()
+    for s in ordered:
+        q, r, j = s
+        angle = np.pi / 3 * j + np.pi / 6
+        pos = center(q, r) + 0.3 * np.array([np.cos(angle), np.sin(angle), 0.0])
+        G.add_node(labels[s], type="A", pos=_position(pos))
+    for edge, edge_type in edges.items():
+        u, v = tuple(edge)
+        if u in labels and v in labels:
+            G.add_edge(labels[u], labels[v], type=edge_type)
+    return G
+
+_POLYHEDRA = {
+    "tetrahedron": np.array([[1, 1, 1], [1, -1, -1], [-1, 1, -1], [-1, -1, 1]], dtype=float),
+    "octahedron": np.vstack([np.identity(3), -np.identity(3)]),
+    "icosahedron": np.array([
+        p for s1 in (1, -1) for s2 in (1, -1)
+        for p in [(0, s1, s2 * (1 + np.sqrt(5)) / 2),
+                  (s1, s2 * (1 + np.sqrt(5)) / 2, 0),
+                  (s2 * (1 + np.sqrt(5)) / 2, 0, s1)]
+    ], dtype=float),
+}
+
+def _polyhedron_faces(vertices):
+    """Triangular faces of a deltahedron as sorted vertex index triples."""
+    distances = np.linalg.norm(vertices[:, None] - vertices[None], axis=-1)
+    edge_length = np.min(distances[distances > 1e-9])
+    adjacent = np.abs(distances - edge_length) < 1e-6
+    n = len(vertices)
+    return [(a, b, c) for a in range(n) for b in range(a + 1, n) for c in range(b + 1, n)
+            if adjacent[a, b] and adjacent[b, c] and adjacent[a, c]]
+
+def graph_cage(kind="icosahedron", subunits_per_face=1):
+    """
+    Closed cage with tetrahedral, octahedral or icosahedral symmetry.
+
+    Subunits sit on the triangular faces of the polyhedron.
+
+    Parameters
+    ----------
+    kind : str
+        'tetrahedron', 'octahedron' or 'icosahedron'.
+    subunits_per_face : int
+        1: one subunit per face (4, 8 or 20 subunits) bound to the subunits of
+        adjacent faces by 'face' interfaces.
+        3: three subunits per face (12, 24 or 60 subunits; 60 is a T=1 capsid),
+        one in each corner, forming a 'tri' interface within the face and a
+        'vertex' interface with the corner subunits of the adjacent faces
+        around the same vertex (rings of 3, 4 or 5).
+
+    Returns
+    -------
+    networkx.Graph
+        Nodes are labelled 0..N-1 with 'type' and 'pos' attributes.
+    """
+    if kind not in _POLYHEDRA:
+        raise ValueError(f"Unknown cage: {kind}. Available: {list(_POLYHEDRA)}")
+    if subunits_per_face not in (1, 3):
+        raise ValueError("subunits_per_face must be 1 or 3.")
+
+    vertices = _POLYHEDRA[kind]
+    vertices = vertices / np.linalg.norm(vertices[0])
+    faces = _polyhedron_faces(vertices)
+
+    G = nx.Graph()
+    if subunits_per_face == 1:
+        for f, face in enumerate(faces):
+            G.add_node(f, type="A", pos=_position(vertices[list(face)].mean(axis=0)))
+        for f1, f2 in combinations(range(len(faces)), 2):
+            if len(set(faces[f1]) & set(faces[f2])) == 2:
+                G.add_edge(f1, f2, type="face")
+        return G
+
+    labels = {}
+    for f, face in enumerate(faces):
+        face_center = vertices[list(face)].mean(axis=0)
+        for v in face:
+            labels[(f, v)] = len(labels)
+            pos = face_center + 0.5 * (vertices[v] - face_center)
+            G.add_node(labels[(f, v)], type="A", pos=_position(pos))
+        for v1, v2 in combinations(face, 2):
+            G.add_edge(labels[(f, v1)], labels[(f, v2)], type="tri")
+    for f1, f2 in combinations(range(len(faces)), 2):
+        shared = set(faces[f1]) & set(faces[f2])
+        if len(shared) == 2:
+            for v in shared:
+                G.add_edge(labels[(f1, v)], labels[(f2, v)], type="vertex")
+    return G
+
+def graph_random(n, seed=0, extra_edges=None, node_types=2, edge_types=2):
+    """
+    Random connected typed graph: a random spanning tree plus extra random edges.
+
+    Parameters
+    ----------
+    n : int
+        Number of subunits.
+    seed : int
+        Seed of the random generator; equal arguments give equal graphs.
+    extra_edges : int, optional
+        Edges added on top of the spanning tree (default n // 2).
+    node_types, edge_types : int
+        Number of distinct node ('A', 'B', ...) and edge ('e0', 'e1', ...) types.
+
+    Returns
+    -------
+    networkx.Graph
+    """
+    rng = random.Random(seed)
+    if extra_edges is None:
+        extra_edges = n // 2
+
+    G = nx.Graph()
+    for i in range(n):
+        G.add_node(i, type=chr(ord("A") + rng.randrange(node_types)))
+    for i in range(1, n):
+        G.add_edge(i, rng.randrange(i), type=f"e{rng.randrange(edge_types)}")
+
+    candidates = [(u, v) for u, v in combinations(range(n), 2) if not G.has_edge(u, v)]
+    for u, v in rng.sample(candidates, min(extra_edges, len(candidates))):
+        G.add_edge(u, v, type=f"e{rng.randrange(edge_types)}")
+    return G
+
 ################################
 # Graph Registry
 ################################
@@ -42,12 +256,38 @@ graph_registry = {
     "5l93": graph_5l93,
     "8y7s": graph_8y7s,
     "asymmetry_4mer": graph_asymmetry_4mer,
+    "ring_8": partial(graph_ring, 8),
+    "tetrahedral_cage": partial(graph_cage, "tetrahedron", 3),
+    "octahedral_cage": partial(graph_cage, "octahedron", 1),
+    "icosahedral_cage": partial(graph_cage, "icosahedron", 1),
+    "random_12": partial(graph_random, 12, 0),
+}
+
+# Parameterized generators for scaling studies, used as "<family>:<arg>,<arg>,..."
+# e.g. "ring:12", "hexamer_lattice:1", "cage:icosahedron,3" or "random:16,3".
+scaling_families = {
+    "ring": graph_ring,
+    "hexamer_lattice": graph_hexamer_lattice,
+    "cage": graph_cage,
+    "random": graph_random,
 }
 
+def _parse_argument(arg):
+    try:
+        return int(arg)
+    except ValueError:
+        return arg
+
 def get_example(name: str):
     """
-    Get example with a key
+    Get example with a key, either a registry name or "<family>:<args>"
+    for one of the scaling families
     """
+    if ":" in name:
+        family, args = name.split(":", 1)
+        if family not in scaling_families:
+            raise ValueError(f"Unknown scaling family: {family}. Available: {list(scaling_families)}")
+        return scaling_families[family](*[_parse_argument(a) for a in args.split(",") if a])
     try:
         return graph_registry[name]()
     except KeyError:
@@ -59,4 +299,5 @@ def show_available_examples(do_print = True):
     """
     if do_print:
         print("Available examples:", list(graph_registry.keys()))
+        print("Scaling families:", list(scaling_families.keys()))
     return(list(graph_registry.keys()))
@@ -0,0 +1,214 @@
+from collections import Counter
+from weakref import WeakKeyDictionary
+
+_invariants = WeakKeyDictionary()
+_MISSING = object()
+
+class TypedInvariants:
+    """
+    Isomorphism invariants of a graph with "type" node and edge attributes,
+    and the data the matcher of `typed_isomorphism` needs.
+
+    Attributes
+    ----------
+    nodes : list
+        Nodes of the graph, in its node order; nodes are referred to by their
+        index in this list.
+    adjacency : list of dict
+        For every node, its neighbors' indices mapped to the edge types.
+    types : list
+        Type of every node.
+    composition : Counter
+        Node type histogram.
+    edge_histogram : Counter
+        Edge type histogram.
+    degree_histogram : Counter
+        Histogram of the node colors after one refinement round, i.e. of
+        (node type, multiset of (edge type, neighbor type)): the typed degree
+        sequence.
+    colors : list of int
+        Stable colors of the nodes under typed color refinement (1-WL). The
+        colors are hashes of the refinement history, so they are comparable
+        across graphs: an isomorphism maps every node to a node of the same
+        color. Different types may share a color (hash collisions), so the
+        colors only prune the search; types are compared exactly.
+    color_histogram : Counter
+        Histogram of the stable colors.
+    """
+
+    __slots__ = ("nodes", "adjacency", "types", "n_edges", "composition", "edge_histogram",
+                 "degree_histogram", "rounds", "colors", "color_histogram", "__weakref__")
+
+    def __init__(self, G):
+        self.nodes = list(G)
+        index = {node: i for i, node in enumerate(self.nodes)}
+        self.types = [t for _, t in G.nodes(data="type")]
+        self.adjacency = [{} for _ in self.nodes]
+        for u, v, t in G.edges(data="type"):
+            i, j = index[u], index[v]
+            self.adjacency[i][j] = t
+            self.adjacency[j][i] = t
+        self.n_edges = G.number_of_edges()
+        self.composition = Counter(self.types)
+        self.edge_histogram = Counter(t for _, _, t in G.edges(data="type"))
+
+        # round 0: node type; round 1: type-degree; then refine until stable
+        colors = [hash(t) for t in self.types]
+        n_classes = len(set(colors))
+        self.rounds = 0
+        while True:
+            refined = [hash((colors[i], tuple(sorted(hash((hash(t), colors[j])) for j, t in neighbors.items()))))
+                       for i, neighbors in enumerate(self.adjacency)]
+            self.rounds += 1
+            if self.rounds == 1:
+                self.degree_histogram = Counter(refined)
+            n_refined = len(set(refined))
+            colors = refined
+            if n_refined == n_classes:
+                break
+            n_classes = n_refined
+        self.colors = colors
+        self.color_histogram = Counter(colors)
+
+    def signature(self):
+        """Everything `typed_isomorphism` compares before matching, cheapest first."""
+        return (len(self.nodes), self.n_edges, self.composition, self.edge_histogram,
+                self.degree_histogram, self.rounds, self.color_histogram)
+
+def typed_invariants(G):
+    """
+    `TypedInvariants` of G, cached per graph object (weakly, so the cache does
+    not keep graphs alive). Graphs must not be modified after their first
+    use; the cached entry is recomputed if the node or edge count changed.
+    """
+    invariants = _invariants.get(G)
+    if invariants is None or len(invariants.nodes) != len(G) or invariants.n_edges != G.number_of_edges():
+        invariants = _invariants[G] = TypedInvariants(G)
+    return invariants
+
+def _match_order(invariants):
+    """
+    Order in which the matcher maps the nodes: each connected component is
+    entered at a node of its rarest color and then grown along edges,
+    preferring rare colors, so that every later node has a mapped neighbor
+    that restricts its candidates.
+    """
+    counts = invariants.color_histogram
+    colors = invariants.colors
+    adjacency = invariants.adjacency
+    order = []
+    placed = [False] * len(colors)
+    for root in sorted(range(len(colors)), key=lambda i: (counts[colors[i]], i)):
+        if placed[root]:
+            continue
+        placed[root] = True
+        order.append(root)
+        frontier = {root}
+        while frontier:
+            candidates = {j for i in frontier for j in adjacency[i] if not placed[j]}
+            frontier = set()
+            for j in sorted(candidates, key=lambda j: (counts[colors[j]], j)):
+                placed[j] = True
+                order.append(j)
+                frontier.add(j)
+    return order
+
+def typed_isomorphism(G1, G2, stats=None):
+    """
+    A type-preserving isomorphism from G1 to G2, as a dict of nodes, or None.
+
+    Nodes and edges must match by their "type" attribute, as with
+    `GraphMatcher(G1, G2, node_match=..., edge_match=...)` on types. The
+    graphs are first compared by cached invariants (node, edge and
+    type-degree histograms, then stable color-refinement classes); only if
+    all agree does a backtracking search run, in which every node may only be
+    mapped to nodes of its color class that are adjacent, with the same edge
+    types, to the images of its already mapped neighbors.
+
+    An optional `ode_gen.stats.EnumerationStats` collects the counters
+    invariant_rejections and isomorphism_backtracks (mappings undone).
+    """
+    inv1, inv2 = typed_invariants(G1), typed_invariants(G2)
+    if inv1.signature() != inv2.signature():
+        if stats is not None:
+            stats.count("invariant_rejections")
+        return None
+    if not inv1.nodes:
+        return {}
+
+    adj1, adj2 = inv1.adjacency, inv2.adjacency
+    types1, types2 = inv1.types, inv2.types
+    colors1, colors2 = inv1.colors, inv2.colors
+    by_color = {}
+    for j, c in enumerate(colors2):
+        by_color.setdefault(c, []).append(j)
+    order = _match_order(inv1)
+    # for every node after the first of its component: an earlier mapped neighbor
+    anchors = []
+    position = {i: k for k, i in enumerate(order)}
+    for k, i in enumerate(order):
+        earlier = [j for j in adj1[i] if position[j] < k]
+        anchors.append(min(earlier, key=position.get) if earlier else None)
+
+    mapping = [-1] * len(order)
+    used = [False] * len(order)
+    n_backtracks = 0
+
+    def feasible(i, j):
+        # i and j have equal types (colors are hashes and may collide), every
+        # mapped neighbor of i maps to a neighbor of j over the same edge
+        # type, and j has no other mapped neighbors
+        if types1[i] != types2[j]:
+            return False
+        n_mapped = 0
+        for k, t in adj1[i].items():
+            image = mapping[k]
+            if image >= 0:
+                if adj2[j].get(image, _MISSING) != t:
+                    return False
+                n_mapped += 1
+        return n_mapped == sum(1 for image in adj2[j] if used[image])
+
+    # depth-first search over the nodes in match order, without recursion
+    candidates = [None] * len(order)
+    positions = [0] * len(order)
+    k = 0
+    while 0 <= k < len(order):
+        i = order[k]
+        if candidates[k] is None:
+            anchor = anchors[k]
+            if anchor is None:
+                candidates[k] = by_color[colors1[i]]
+            else:
+                candidates[k] = [j for j in adj2[mapping[anchor]] if colors2[j] == colors1[i]]
+            positions[k] = 0
+        else:
+            # returning from a dead end: undo the mapping of this node
+            used[mapping[i]] = False
+            mapping[i] = -1
+            n_backtracks += 1
+        options = candidates[k]
+        while positions[k] < len(options):
+            j = options[positions[k]]
+            positions[k] += 1
+            if not used[j] and feasible(i, j):
+                mapping[i] = j
+                used[j] = True
+                break
+        if mapping[i] >= 0:
+            k += 1
+        else:
+            candidates[k] = None
+            k -= 1
+
+    if stats is not None:
+        stats.count("isomorphism_backtracks", n_backtracks)
+    if k < 0:
+        return None
+    nodes2 = inv2.nodes
+    return {node: nodes2[mapping[i]] for i, node in enumerate(inv1.nodes)}
+
+def is_typed_isomorphic(G1, G2, stats=None):
+    """Whether G1 and G2 are isomorphic with matching node and edge types (see `typed_isomorphism`)."""
+    return typed_isomorphism(G1, G2, stats) is not None
+
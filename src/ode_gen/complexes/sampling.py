@@ -0,0 +1,193 @@
+from collections import namedtuple
+from math import sqrt
+from statistics import NormalDist
+from time import perf_counter
+import random
+
+from ode_gen.complexes.counting import _neighbor_masks, typed_automorphisms
+from ode_gen.complexes.subcomplexes import _bit_indices
+from ode_gen.complexes.wl import BatchedWL, WL_BATCH_SIZE
+from ode_gen.hashset import popcount
+
+class SizeEstimate(namedtuple("SizeEstimate", "size subsets subsets_error orbits orbits_error observed_species")):
+    """
+    Sampled estimates for the connected subcomplexes of one size.
+
+    Attributes
+    ----------
+    size : int
+        Number of nodes.
+    subsets : float
+        Estimated number of connected induced subsets of this size.
+    subsets_error : float
+        Half-width of the confidence interval of `subsets`.
+    orbits : float
+        Estimated number of subcomplexes up to the symmetries of the assembly,
+        an upper bound on the number of species (see
+        `ode_gen.complexes.counting.orbit_upper_bound_by_size`).
+    orbits_error : float
+        Half-width of the confidence interval of `orbits`.
+    observed_species : int
+        Number of distinct WL hashes among the sampled subsets, a lower bound
+        on the number of species.
+    """
+    __slots__ = ()
+
+    @property
+    def subsets_interval(self):
+        return self.subsets - self.subsets_error, self.subsets + self.subsets_error
+
+    @property
+    def orbits_interval(self):
+        return self.orbits - self.orbits_error, self.orbits + self.orbits_error
+
+def _stabilizer_size(mask, automorphisms):
+    """Number of automorphisms that map the nodes of a mask onto themselves."""
+    nodes = _bit_indices(mask)
+    return sum(1 for permutation in automorphisms if all(mask >> permutation[i] & 1 for i in nodes))
+
+def sample_connected_subsets(G, n_samples, max_size=None, seed=None):
+    """
+    Random root-to-leaf walks down the ESU tree of the connected induced
+    subsets of G (the tree behind `ode_gen.complexes.counting`, in which every
+    connected subset is one node).
+
+    Each walk starts at a uniformly chosen non-isolated node and repeatedly
+    moves to a uniformly chosen child, i.e. adds one node of the current
+    extension set, until it reaches a leaf or `max_size`. The probability of
+    reaching each subset on the walk is known, so with the inverse
+    probabilities as weights (Knuth's estimator) sums over the visited subsets
+    are unbiased estimates of sums over all connected subsets.
+
+    Yields
+    ------
+    list of (int, int)
+        For each walk, the (node mask over G's node order, weight) of the
+        subsets visited, one per size from 1 on.
+    """
+    rng = seed if isinstance(seed, random.Random) else random.Random(seed)
+    neighbor_masks = _neighbor_masks(G)
+    n = len(G)
+    max_size = n if max_size is None else min(max_size, n)
+    roots = [v for v in range(n) if neighbor_masks[v]]
+    if not roots or max_size < 1:
+        return
+
+    for _ in range(n_samples):
+        v = rng.choice(roots)
+        larger = ~((2 << v) - 1)
+        nodes, extension, closed = 1 << v, neighbor_masks[v] & larger, neighbor_masks[v] | 1 << v
+        weight = len(roots)
+        walk = [(nodes, weight)]
+        while extension and len(walk) < max_size:
+            # the j-th child adds the j-th extension node and keeps the later ones
+            choices = _bit_indices(extension)
+            j = rng.randrange(len(choices))
+            w = choices[j]
+            weight *= len(choices)
+            extension &= ~((2 << w) - 1)
+            extension |= neighbor_masks[w] & ~closed & larger
+            closed |= neighbor_masks[w]
+            nodes |= 1 << w
+            walk.append((nodes, weight))
+        yield walk
+
+def estimate_species_counts(G, n_samples=1000, max_size=None, confidence=0.95, seed=None, stats=None):
+    """
+    Estimate, by size, the number of connected subcomplexes of G and of
+    subcomplexes up to symmetry, for assemblies too large to enumerate.
+
+    Subsets are drawn with `sample_connected_subsets`. Weighting a subset by
+    its inverse sampling probability estimates the number of connected
+    subsets; weighting it in addition by 1 / |orbit| = |Stab| / |Aut(G)|
+    estimates the number of orbits under the typed automorphisms of G, which
+    is exact where `orbit_upper_bound_by_size` is exact and otherwise an upper
+    bound on the number of species. The sampled subsets are hashed with
+    `BatchedWL`; the number of distinct hashes bounds the number of species
+    from below. Confidence intervals use the normal approximation of the mean
+    of the per-walk estimates.
+
+    Parameters
+    ----------
+    G : networkx.Graph
+        Assembly graph with "type" node and edge attributes.
+    n_samples : int
+        Number of walks.
+    max_size : int, optional
+        Largest subcomplex size to estimate.
+    confidence : float
+        Confidence level of the intervals.
+    seed : int or random.Random, optional
+        Seed or generator of the walks.
+    stats : ode_gen.stats.EnumerationStats, optional
+        Receives the counters automorphisms, sampled_subsets and
+        hash_computations, and the phase timings automorphisms, sampling and
+        hashing.
+
+    Returns
+    -------
+    dict
+        `SizeEstimate` for each size reached by some walk, in increasing order.
+
+    Examples
+    --------
+    >>> G = graph_cage("icosahedron", 3)  # doctest: +SKIP
+    >>> for size, estimate in estimate_species_counts(G, n_samples=2000, max_size=12, seed=0).items():  # doctest: +SKIP
+    ...     print(size, round(estimate.orbits), "+/-", round(estimate.orbits_error), estimate.observed_species)
+    """
+    start = perf_counter()
+    automorphisms = typed_automorphisms(G)
+    automorphism_time = perf_counter() - start
+
+    start = perf_counter()
+    group_order = len(automorphisms)
+    sums = {}
+    sampled = {}
+    n_sampled = 0
+    for walk in sample_connected_subsets(G, n_samples, max_size, seed):
+        for nodes, weight in walk:
+            size = popcount(nodes)
+            orbit_weight = weight * _stabilizer_size(nodes, automorphisms) / group_order
+            totals = sums.setdefault(size, [0.0, 0.0, 0.0, 0.0])
+            totals[0] += weight
+            totals[1] += weight * weight
+            totals[2] += orbit_weight
+            totals[3] += orbit_weight * orbit_weight
+            sampled.setdefault(size, []).append(nodes)
+            n_sampled += 1
+    sampling_time = perf_counter() - start
+
+    start = perf_counter()
+    hasher = BatchedWL(G)
+    observed = {}
+    for size, masks in sampled.items():
+        masks = list(set(masks))
+        hashes = set()
+        for first in range(0, len(masks), WL_BATCH_SIZE):
+            hashes.update(hasher.hash_index_subsets([_bit_indices(mask) for mask in masks[first:first + WL_BATCH_SIZE]]))
+        observed[size] = len(hashes)
+    hashing_time = perf_counter() - start
+
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+
+    def mean_and_error(total, total_squares):
+        # walks that stop before a size contribute 0 to it
+        mean = total / n_samples
+        variance = max(total_squares / n_samples - mean * mean, 0.0)
+        error = z * sqrt(variance / (n_samples - 1)) if n_samples > 1 else float("inf")
+        return mean, error
+
+    estimates = {}
+    for size in sorted(sums):
+        subsets, subsets_error = mean_and_error(*sums[size][:2])
+        orbits, orbits_error = mean_and_error(*sums[size][2:])
+        estimates[size] = SizeEstimate(size, subsets, subsets_error, orbits, orbits_error, observed[size])
+
+    if stats is not None:
+        stats.count("automorphisms", group_order)
+        stats.count("sampled_subsets", n_sampled)
+        stats.count("hash_computations", sum(len(set(masks)) for masks in sampled.values()))
+        stats.add_time("automorphisms", automorphism_time)
+        stats.add_time("sampling", sampling_time)
+        stats.add_time("hashing", hashing_time)
+    return estimates
@@ -1,8 +1,12 @@
 import networkx as nx
-from itertools import combinations, chain
+import numpy as np
+from time import perf_counter
+from itertools import combinations, chain, islice
+from math import comb
 from networkx.algorithms.graph_hashing import weisfeiler_lehman_graph_hash
 from networkx.algorithms.components import connected_components
-from matplotlib import pyplot as plt
+from ode_gen.complexes.wl import BatchedWL, WL_BATCH_SIZE
+from ode_gen.hashset import CompactHashSet
 
 def powerset_connected_nodes(nodes):
     """Generate all non-empty subsets of nodes, up to len(nodes)"""
@@ -10,37 +14,281 @@ def powerset_connected_nodes(nodes):
     for r in range(1, len(nodes) + 1):
         yield from combinations(nodes, r)
 
-def get_unique_fully_connected_subgraphs(G):
-    seen_hashes = set()
+def canonical_hash(H):
+    """Typed WL hash of a species, independent of its node labels."""
+    H_relabel = nx.convert_node_labels_to_integers(H)
+    return weisfeiler_lehman_graph_hash(H_relabel, node_attr="type", edge_attr="type")
+
+def get_unique_fully_connected_subgraphs(G, stats=None, progress=None, checkpoint=None, checkpoint_interval=300.0):
+    """
+    Enumerate the unique connected induced subgraphs (species) of G.
+
+    Candidate subsets are checked for connectivity one by one and the
+    connected ones are hashed in batches with `ode_gen.complexes.wl.BatchedWL`.
+
+    If an `ode_gen.stats.EnumerationStats` is passed as `stats`, it receives the
+    counters subsets_examined, connectivity_checks, connectivity_rejections,
+    hash_computations, hash_cache_hits and species, and the phase timings
+    connectivity and hashing.
+
+    `progress` is an optional callback receiving `ode_gen.progress.ProgressUpdate`
+    records; each size level r of a connected component has C(n, r) subsets.
+
+    With a `checkpoint` path, the enumeration frontier (component, size level,
+    subset index), the seen hashes (a `CompactHashSet` of 128-bit digests) and
+    the species found so far are saved to that file at most every
+    `checkpoint_interval` seconds and on completion.
+    If the file already exists, the enumeration resumes from it and returns
+    the same species as an uninterrupted run. Counters and progress only cover
+    the work done after resuming.
+    """
+    seen_hashes = CompactHashSet()
     unique_subgraphs = []
+    timed = stats is not None
+    n_examined = n_checks = n_rejected = n_hashed = 0
+    t_connectivity = t_hashing = 0.0
 
     full_degrees = dict(G.degree())  # cache full graph degrees
 
-    for component_nodes in connected_components(G):
-        for node_subset in powerset_connected_nodes(component_nodes):
-            #H = G.subgraph(node_subset).copy() <- Avoid copy graph, 20% speed up
-            H = G.subgraph(node_subset)
-
-            if len(H) == 1:
-                # Allow size-1 subgraphs only if connected in G
-                node = node_subset[0]
-                if full_degrees[node] == 0:
-                    continue
-            else:
-                # Require every node in subgraph to have degree >= 1 in H
-                if not nx.is_connected(H):
-                    continue
-
-            # Use canonical hash for deduplication
-            H_relabel = nx.convert_node_labels_to_integers(H)
-            wl_hash = weisfeiler_lehman_graph_hash(H_relabel, node_attr="type", edge_attr="type")
-
-            if wl_hash not in seen_hashes:
-                seen_hashes.add(wl_hash)
-                unique_subgraphs.append(H)
+    tracker = None
+    if progress is not None:
+        from ode_gen.progress import ProgressTracker
+        tracker = ProgressTracker(progress, "species")
+
+    checkpointer = None
+    resume = (0, 1, 0)  # (component, r, subset index) of the first subset to examine
+    if checkpoint is not None:
+        from ode_gen.checkpoint import Checkpointer, graph_fingerprint
+        checkpointer = Checkpointer(checkpoint, "species", graph_fingerprint([G]), checkpoint_interval)
+        state = checkpointer.load()
+        if state is not None:
+            seen_hashes = state["seen_hashes"]
+            unique_subgraphs = [G.subgraph(nodes) for nodes in state["results"]]
+            if state["position"] is None:
+                return unique_subgraphs
+            resume = state["position"]
+    n_resumed = len(unique_subgraphs)
+
+    def save(position):
+        checkpointer.save(position=position, seen_hashes=seen_hashes,
+                          results=[tuple(H) for H in unique_subgraphs])
+
+    hasher = BatchedWL(G)
+    for c, component in enumerate(connected_components(G)):
+        if c < resume[0]:
+            continue
+        # node order of G, so that subset indices are stable across processes
+        component_nodes = [node for node in G if node in component]
+        for r in range(1, len(component_nodes) + 1):
+            first = 0
+            if (c, r) < resume[:2]:
+                continue
+            if (c, r) == resume[:2]:
+                first = resume[2]
+
+            if tracker is not None:
+                tracker.start_level(r, comb(len(component_nodes), r), first)
+            subsets = combinations(component_nodes, r)
+            if first:
+                subsets = islice(subsets, first, None)
+
+            # subsets are filtered one by one and hashed in batches
+            index = first
+            while True:
+                chunk = list(islice(subsets, WL_BATCH_SIZE))
+                if not chunk:
+                    break
+                if checkpointer is not None and checkpointer.due():
+                    save((c, r, index))
+                index += len(chunk)
+                n_examined += len(chunk)
+                if tracker is not None:
+                    tracker.advance(len(chunk))
+
+                if timed:
+                    t0 = perf_counter()
+                connected_subsets = []
+                for node_subset in chunk:
+                    if r == 1:
+                        # Allow size-1 subgraphs only if connected in G
+                        if full_degrees[node_subset[0]] == 0:
+                            continue
+                    else:
+                        # Require every node in subgraph to have degree >= 1 in H
+                        n_checks += 1
+                        #H = G.subgraph(node_subset).copy() <- Avoid copy graph, 20% speed up
+                        if not nx.is_connected(G.subgraph(node_subset)):
+                            continue
+                    connected_subsets.append(node_subset)
+                n_rejected += len(chunk) - len(connected_subsets)
+                if timed:
+                    t_connectivity += perf_counter() - t0
+                    t0 = perf_counter()
+
+                # Use the typed WL hash for deduplication
+                hashes = hasher.hash_subsets(connected_subsets)
+                n_hashed += len(hashes)
+                if timed:
+                    t_hashing += perf_counter() - t0
+
+                for node_subset, new in zip(connected_subsets, seen_hashes.add_many(hashes)):
+                    if new:
+                        unique_subgraphs.append(G.subgraph(node_subset))
+
+    if checkpointer is not None:
+        save(None)
+
+    if stats is not None:
+        stats.count("subsets_examined", n_examined)
+        stats.count("connectivity_checks", n_checks)
+        stats.count("connectivity_rejections", n_rejected)
+        stats.count("hash_computations", n_hashed)
+        stats.count("hash_cache_hits", n_hashed - (len(unique_subgraphs) - n_resumed))
+        stats.count("species", len(unique_subgraphs))
+        stats.add_time("connectivity", t_connectivity)
+        stats.add_time("hashing", t_hashing)
 
     return unique_subgraphs
 
+def _bit_indices(mask):
+    """Positions of the set bits of a mask, in increasing order."""
+    indices = []
+    while mask:
+        low = mask & -mask
+        indices.append(low.bit_length() - 1)
+        mask ^= low
+    return indices
+
+def iter_species_by_level(G, max_size=None, stats=None, energies=None, energy_window=None):
+    """
+    Generate the unique connected induced subgraphs (species) of G size by
+    size, yielding each completed level.
+
+    Level k is grown from all connected (k-1)-node subsets (not only from the
+    species representatives, which would miss species whose smaller
+    subgraphs sit differently in G) by adding one neighboring node. Subsets
+    are bitmasks over the nodes of G, so connectivity holds by construction
+    and no connectivity checks are needed. Each level is hashed in batches
+    with `ode_gen.complexes.wl.BatchedWL` and deduplicated on its own.
+
+    Within a level, species come in the order of the connected components and,
+    inside a component, in the order of `itertools.combinations`, so for a
+    connected G the concatenated levels equal the output of
+    `get_unique_fully_connected_subgraphs`.
+
+    With an energy table and `energy_window`, the binding energies of all
+    connected subsets of a level are computed in batches with
+    `ode_gen.complexes.energy.SubsetEnergies`, and only the subsets within
+    `energy_window` of the most stable one of that size are kept: the others
+    are neither returned nor grown further, so only the low-energy part of
+    the species space is generated. The pruning is a heuristic (a larger
+    stable species reachable only through pruned subsets is not generated);
+    an infinite window gives the full enumeration.
+
+    Parameters
+    ----------
+    G : networkx.Graph
+        Assembly graph with "type" node and edge attributes.
+    max_size : int, optional
+        Largest species size to generate.
+    stats : ode_gen.stats.EnumerationStats, optional
+        Receives the counters subsets_examined (connected subsets grown),
+        hash_computations, hash_cache_hits, species and energy_pruned, and
+        the phase timings growth, energy and hashing.
+    energies : dict, optional
+        Energy of each edge type (negative for favorable interfaces).
+    energy_window : float, optional
+        Energy above the most stable subset of the same size up to which
+        subsets are kept; requires `energies`.
+
+    Yields
+    ------
+    tuple of (int, list of networkx.Graph)
+        The size k and the species of that size.
+
+    Examples
+    --------
+    >>> species = []
+    >>> for size, level in iter_species_by_level(G, max_size=6):  # doctest: +SKIP
+    ...     species.extend(level)
+    ...     reactions = [r for H in level for r in compute_reactions_for_species(H)]
+    """
+    nodes = list(G)
+    index = {node: i for i, node in enumerate(nodes)}
+    neighbor_masks = [0] * len(nodes)
+    for u, v in G.edges():
+        neighbor_masks[index[u]] |= 1 << index[v]
+        neighbor_masks[index[v]] |= 1 << index[u]
+    component_of = {}
+    for c, component in enumerate(connected_components(G)):
+        for node in component:
+            component_of[index[node]] = c
+
+    hasher = BatchedWL(G)
+    max_size = len(nodes) if max_size is None else min(max_size, len(nodes))
+    if (energies is None) != (energy_window is None):
+        raise ValueError("energies and energy_window must be given together.")
+    if energies is not None:
+        from ode_gen.complexes.energy import SubsetEnergies
+        energy_model = SubsetEnergies(G, energies)
+
+    # connected subsets of the current size, mapped to the mask of their neighbors
+    level = {1 << i: neighbor_masks[i] for i in range(len(nodes)) if neighbor_masks[i]}
+    size = 1
+    while level and size <= max_size:
+        start = perf_counter()
+        subsets = sorted((_bit_indices(mask) for mask in level), key=lambda ids: (component_of[ids[0]], ids))
+        growth_time = perf_counter() - start
+        n_subsets = len(subsets)
+
+        if energies is not None:
+            start = perf_counter()
+            subset_energies = np.concatenate([energy_model.of_index_subsets(subsets[first:first + WL_BATCH_SIZE])
+                                              for first in range(0, len(subsets), WL_BATCH_SIZE)])
+            keep = subset_energies <= subset_energies.min() + energy_window
+            if not keep.all():
+                subsets = [ids for ids, kept in zip(subsets, keep) if kept]
+                kept_masks = (sum(1 << i for i in ids) for ids in subsets)
+                level = {mask: level[mask] for mask in kept_masks}
+            if stats is not None:
+                stats.count("energy_pruned", n_subsets - len(subsets))
+                stats.add_time("energy", perf_counter() - start)
+
+        start = perf_counter()
+        seen_hashes = CompactHashSet()
+        species = []
+        for first in range(0, len(subsets), WL_BATCH_SIZE):
+            chunk = subsets[first:first + WL_BATCH_SIZE]
+            for ids, new in zip(chunk, seen_hashes.add_many(hasher.hash_index_subsets(chunk))):
+                if new:
+                    species.append(G.subgraph([nodes[i] for i in ids]))
+        hashing_time = perf_counter() - start
+
+        if stats is not None:
+            stats.count("subsets_examined", n_subsets)
+            stats.count("hash_computations", len(subsets))
+            stats.count("hash_cache_hits", len(subsets) - len(species))
+            stats.count("species", len(species))
+            stats.add_time("hashing", hashing_time)
+        yield size, species
+
+        if size == max_size:
+            break
+        start = perf_counter()
+        next_level = {}
+        for mask, neighbors in level.items():
+            frontier = neighbors & ~mask
+            while frontier:
+                low = frontier & -frontier
+                frontier ^= low
+                grown = mask | low
+                if grown not in next_level:
+                    next_level[grown] = neighbors | neighbor_masks[low.bit_length() - 1]
+        level = next_level
+        size += 1
+        if stats is not None:
+            stats.add_time("growth", growth_time + perf_counter() - start)
+
 def all_nonempty_proper_subsets(s):
     """All non-empty subsets of s that are not equal to s itself."""
     s = list(s)
@@ -0,0 +1,179 @@
+from hashlib import blake2b
+
+import numpy as np
+
+WL_ITERATIONS = 3
+WL_BATCH_SIZE = 4096
+
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+_LABEL_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+_SALT_A = np.uint64(0x243F6A8885A308D3)
+_SALT_B = np.uint64(0x13198A2E03707344)
+
+_type_codes = {}
+
+def _type_code(value):
+    """64-bit code of a node or edge type, independent of the process and of the graph."""
+    code = _type_codes.get(value)
+    if code is None:
+        digest = blake2b(repr(value).encode(), digest_size=8).digest()
+        code = _type_codes[value] = int.from_bytes(digest, "little")
+    return code
+
+def _mix(x):
+    """splitmix64 finalizer, elementwise on uint64 arrays (wrapping arithmetic)."""
+    x = x ^ (x >> np.uint64(30))
+    x = x * _MIX1
+    x = x ^ (x >> np.uint64(27))
+    x = x * _MIX2
+    return x ^ (x >> np.uint64(31))
+
+class BatchedWL:
+    """
+    Typed Weisfeiler-Lehman hashing of many induced subgraphs of one parent
+    graph at once.
+
+    Node and edge types are interned to 64-bit codes, and the color refinement
+    runs on (subsets x nodes) integer label arrays: every iteration, each node
+    of a subset combines its label with the multiset (a wrapping sum of mixed
+    values) of its in-subset neighbors' labels tagged with the edge types. The
+    hash of a subgraph is a 128-bit digest of the multiset of labels of all
+    iterations, like `networkx.weisfeiler_lehman_graph_hash` with
+    node_attr="type", edge_attr="type" and the same number of iterations. The
+    hashes depend only on the typed structure of the subgraph, so they are
+    comparable across parent graphs and runs.
+
+    Parameters
+    ----------
+    G : networkx.Graph
+        Parent graph with "type" node and edge attributes.
+    iterations : int
+        Number of refinement iterations.
+
+    Examples
+    --------
+    >>> wl = BatchedWL(G)  # doctest: +SKIP
+    >>> wl.hash_subsets([(0, 1), (1, 2), (0, 1, 2)])  # doctest: +SKIP
+    """
+
+    def __init__(self, G, iterations=WL_ITERATIONS):
+        self.iterations = iterations
+        self.nodes = list(G)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        with np.errstate(over="ignore"):
+            node_codes = np.array([_type_code(t) for _, t in G.nodes(data="type")], dtype=np.uint64)
+            self._initial = _mix(node_codes)
+
+            src, dst, edge_codes = [], [], []
+            for u, v, t in G.edges(data="type"):
+                i, j, code = self.index[u], self.index[v], _type_code(t)
+                src += [i, j]
+                dst += [j, i]
+                edge_codes += [code, code]
+            # directed edges sorted by destination, for the per-node reduction
+            order = np.argsort(np.array(dst, dtype=np.int64), kind="stable")
+            self._src = np.array(src, dtype=np.int64)[order]
+            self._dst = np.array(dst, dtype=np.int64)[order]
+            self._edge_id = order // 2
+            self._edge_salt = _mix(np.array(edge_codes, dtype=np.uint64)[order] ^ _SALT_B)
+        self._targets, self._starts = np.unique(self._dst, return_index=True)
+
+    def _membership(self, subsets):
+        """Boolean (B, n) membership matrix of subsets of node indices."""
+        member = np.zeros((len(subsets), len(self.nodes)), dtype=bool)
+        sizes = {len(subset) for subset in subsets}
+        if len(sizes) == 1:
+            columns = np.array(subsets, dtype=np.int64).reshape(len(subsets), -1)
+            member[np.arange(len(subsets))[:, None], columns] = True
+        else:
+            for row, subset in enumerate(subsets):
+                member[row, list(subset)] = True
+        return member
+
+    def hash_index_subsets(self, subsets):
+        """
+        Hashes of the subgraphs induced by subsets of node indices (positions in `self.nodes`).
+
+        Returns
+        -------
+        list of int
+            128-bit hashes, in the order of `subsets`.
+        """
+        if len(subsets) == 0:
+            return []
+        return self._hash_membership(self._membership(subsets))
+
+    def hash_splits(self, subsets):
+        """
+        Hashes of the subgraphs induced by subsets of node indices and by their
+        complements in the parent graph, computed in a single batch.
+
+        Returns
+        -------
+        tuple of (list of int, list of int)
+        """
+        if len(subsets) == 0:
+            return [], []
+        member = self._membership(subsets)
+        hashes = self._hash_membership(np.concatenate([member, ~member]))
+        return hashes[:len(subsets)], hashes[len(subsets):]
+
+    def hash_edge_removals(self, edges, subsets=None):
+        """
+        Hashes of the parent graph, or of the subgraphs induced by subsets of
+        node indices, with one edge removed per row, computed in a single
+        batch. `edges` holds the index of the removed edge of each row (its
+        position in the order of `G.edges()`). The node sets are unchanged, so
+        the hashes are comparable to those of graphs on the same nodes, e.g.
+        `wl_hash` of a species.
+
+        Returns
+        -------
+        list of int
+        """
+        if len(edges) == 0:
+            return []
+        removed = np.asarray(edges, dtype=np.int64)
+        if subsets is None:
+            member = np.ones((len(removed), len(self.nodes)), dtype=bool)
+        else:
+            member = self._membership(subsets)
+        return self._hash_membership(member, active=self._edge_id[None, :] != removed[:, None])
+
+    def _hash_membership(self, member, active=None):
+        """
+        128-bit hashes of the subgraphs given by the rows of a (B, n) membership
+        matrix, optionally restricted to the directed edges in `active`.
+        """
+        with np.errstate(over="ignore"):
+            labels = np.where(member, self._initial, np.uint64(0))
+            in_subgraph = member[:, self._src] & member[:, self._dst]
+            active = in_subgraph if active is None else in_subgraph & active
+            digest_a = np.zeros(len(member), dtype=np.uint64)
+            digest_b = np.zeros(len(member), dtype=np.uint64)
+
+            for iteration in range(self.iterations):
+                aggregate = np.zeros_like(labels)
+                if len(self._src):
+                    messages = np.where(active, _mix(labels[:, self._src] ^ self._edge_salt), np.uint64(0))
+                    aggregate[:, self._targets] = np.add.reduceat(messages, self._starts, axis=1)
+                labels = np.where(member, _mix(labels * _LABEL_MULTIPLIER + aggregate), np.uint64(0))
+
+                salt = np.uint64(iteration + 1)
+                digest_a += np.where(member, _mix(labels ^ _SALT_A ^ salt), np.uint64(0)).sum(axis=1, dtype=np.uint64)
+                digest_b += np.where(member, _mix(labels ^ _SALT_B ^ salt), np.uint64(0)).sum(axis=1, dtype=np.uint64)
+
+            sizes = member.sum(axis=1).astype(np.uint64)
+            digest_a = _mix(digest_a ^ sizes)
+            digest_b = _mix(digest_b + sizes * _LABEL_MULTIPLIER)
+        return [a | b << 64 for a, b in zip(digest_a.tolist(), digest_b.tolist())]
+
+    def hash_subsets(self, subsets):
+        """Hashes of the subgraphs induced by subsets of nodes; see `hash_index_subsets`."""
+        index = self.index
+        return self.hash_index_subsets([[index[node] for node in subset] for subset in subsets])
+
+def wl_hash(G, iterations=WL_ITERATIONS):
+    """128-bit typed WL hash of a whole graph, consistent with `BatchedWL`."""
+    return BatchedWL(G, iterations).hash_index_subsets([range(len(G))])[0]
@@ -0,0 +1,323 @@
+from array import array
+from hashlib import blake2b
+
+import numpy as np
+
+_MASK64 = (1 << 64) - 1
+_MASK128 = (1 << 128) - 1
+
+def digest_to_int(hex_digest):
+    """Integer value of a hexadecimal digest, e.g. a 128-bit WL graph hash."""
+    return int(hex_digest, 16)
+
+def popcount(mask):
+    """Number of set bits of a non-negative integer (`int.bit_count` needs Python 3.10)."""
+    return bin(mask).count("1")
+
+def pair_key(hash1, hash2, bits=128):
+    """
+    Fixed-width key of an unordered pair of 128-bit integer hashes, used for
+    the (part1, part2) hash pairs of a split.
+    """
+    if hash2 < hash1:
+        hash1, hash2 = hash2, hash1
+    data = hash1.to_bytes(16, "little") + hash2.to_bytes(16, "little")
+    return int.from_bytes(blake2b(data, digest_size=bits // 8).digest(), "little")
+
+class CompactHashSet:
+    """
+    Set of fixed-width (64- or 128-bit) integer hashes stored in flat unsigned
+    64-bit arrays with open addressing and linear probing.
+
+    A slot is one 64-bit lane per 64 bits of key, and an all-zero slot marks
+    an empty one (the all-zero key itself is kept as a flag). The table
+    doubles when it would become more than 3/4 full, so the load factor stays
+    between 3/8 (right after a grow) and 3/4: an entry costs 21 to 43 bytes
+    for 128-bit keys (about 31 on average over set sizes) and 11 to 21 bytes
+    for 64-bit keys, compared to 78 to 86 bytes for a 128-bit int in a Python
+    set and well over 100 for a hex digest string. Keys wider than `bits` are
+    truncated to their low `bits` bits.
+
+    `add_many` inserts a whole batch (e.g. the hashes of one `BatchedWL`
+    batch) with vectorized probing rounds over NumPy views of the table; the
+    few keys left on long probe chains, and single `add` calls, are probed in
+    Python. Growing, `from_array` and unpickling also insert vectorized.
+
+    Parameters
+    ----------
+    bits : int
+        Key width, 64 or 128.
+    capacity : int
+        Initial number of slots (rounded up to a power of two).
+
+    Examples
+    --------
+    >>> seen = CompactHashSet()
+    >>> seen.add(digest_to_int("8d5f0c6a4b1e2f3a9c7d6e5f4a3b2c1d"))
+    True
+    >>> seen.add(digest_to_int("8d5f0c6a4b1e2f3a9c7d6e5f4a3b2c1d"))
+    False
+    >>> seen.add_many([1, 2, 1])
+    [True, True, False]
+    >>> len(seen)
+    3
+    """
+    __slots__ = ("bits", "_lo", "_hi", "_mask", "_size", "_has_zero")
+
+    # slots looked at per vectorized probing round, and the number of keys
+    # left in a batch below which probing continues in Python
+    _PROBE_WINDOW = 4
+    _SCALAR_TAIL = 32
+
+    def __init__(self, bits=128, capacity=1024):
+        if bits not in (64, 128):
+            raise ValueError(f"bits must be 64 or 128, got {bits}.")
+        self.bits = bits
+        self._has_zero = False
+        self._allocate(1 << max(3, (capacity - 1).bit_length()))
+
+    def _allocate(self, capacity):
+        self._lo = array("Q", bytes(8 * capacity))
+        self._hi = array("Q", bytes(8 * capacity)) if self.bits == 128 else None
+        self._mask = capacity - 1
+        self._size = 0
+
+    def _probe(self, lo, hi):
+        """Slot holding the (nonzero) key, or the empty slot where it would be inserted."""
+        lows, highs, mask = self._lo, self._hi, self._mask
+        slot = lo & mask
+        if highs is None:
+            while lows[slot] and lows[slot] != lo:
+                slot = (slot + 1) & mask
+            return slot
+        while True:
+            slot_lo, slot_hi = lows[slot], highs[slot]
+            if (slot_lo == lo and slot_hi == hi) or not (slot_lo or slot_hi):
+                return slot
+            slot = (slot + 1) & mask
+
+    def _split(self, key):
+        return key & _MASK64, (key >> 64) & _MASK64 if self.bits == 128 else 0
+
+    def _occupied_at(self, slot):
+        return bool(self._lo[slot] or (self._hi is not None and self._hi[slot]))
+
+    def __contains__(self, key):
+        lo, hi = self._split(key)
+        if not (lo or hi):
+            return self._has_zero
+        return self._occupied_at(self._probe(lo, hi))
+
+    def add(self, key):
+        """Insert a key; return True if it was not present yet."""
+        lo, hi = self._split(key)
+        if not (lo or hi):
+            was_present, self._has_zero = self._has_zero, True
+            return not was_present
+        slot = self._probe(lo, hi)
+        if self._occupied_at(slot):
+            return False
+
+        if 4 * (self._size + 1) > 3 * len(self._lo):
+            self._grow(self._size + 1)
+            slot = self._probe(lo, hi)
+        self._lo[slot] = lo
+        if self._hi is not None:
+            self._hi[slot] = hi
+        self._size += 1
+        return True
+
+    def add_many(self, keys):
+        """
+        Insert a batch of keys; return for each whether it was not present
+        yet (nor earlier in the batch), like repeated `add` calls.
+        """
+        if self.bits == 64:
+            lows = np.fromiter((key & _MASK64 for key in keys), dtype=np.uint64)
+            return self._insert(lows, None).tolist()
+        packed = b"".join([(key & _MASK128).to_bytes(16, "little") for key in keys])
+        lanes = np.frombuffer(packed, dtype=np.uint64).reshape(-1, 2)
+        return self._insert(lanes[:, 0], lanes[:, 1]).tolist()
+
+    def _insert(self, lows, highs):
+        """Vectorized `add_many` on key lanes; returns the boolean array of new keys."""
+        new = np.zeros(len(lows), dtype=bool)
+        if not len(lows):
+            return new
+        # only the first occurrence of a key in the batch can be new; a stable
+        # sort on the low lane makes equal keys adjacent unless distinct keys
+        # share it, which needs the (slower) sort on both lanes
+        order = np.argsort(lows, kind="stable")
+        repeat = lows[order[1:]] == lows[order[:-1]]
+        if highs is not None and (highs[order[1:]][repeat] != highs[order[:-1]][repeat]).any():
+            rows = np.stack([lows, highs], axis=1).view(np.dtype((np.void, 16))).ravel()
+            _, first = np.unique(rows, return_index=True)
+        else:
+            first = order[np.concatenate(([True], ~repeat))]
+        lows = lows[first]
+        highs = None if highs is None else highs[first]
+        zero = lows == 0 if highs is None else (lows == 0) & (highs == 0)
+        if zero.any():
+            new[first[zero]] = not self._has_zero
+            self._has_zero = True
+            first, lows = first[~zero], lows[~zero]
+            highs = None if highs is None else highs[~zero]
+
+        # room for the whole batch, so the table cannot fill up while probing
+        if 4 * (self._size + len(lows)) > 3 * len(self._lo):
+            self._grow(self._size + len(lows))
+
+        inserted = np.zeros(len(lows), dtype=bool)
+        table_lo = np.frombuffer(self._lo, dtype=np.uint64)
+        table_hi = None if highs is None else np.frombuffer(self._hi, dtype=np.uint64)
+        mask = np.uint64(self._mask)
+        steps = np.arange(self._PROBE_WINDOW, dtype=np.uint64)
+        active = np.arange(len(lows))
+        slots = lows & mask
+        while len(active) > self._SCALAR_TAIL:
+            # look at the next _PROBE_WINDOW slots of every key for the first
+            # one that holds the key or is empty
+            key_lo = lows[active]
+            window = (slots[:, None] + steps) & mask
+            window_lo = table_lo[window]
+            empty = window_lo == 0
+            found = window_lo == key_lo[:, None]
+            if highs is not None:
+                key_hi = highs[active]
+                window_hi = table_hi[window]
+                empty &= window_hi == 0
+                found &= window_hi == key_hi[:, None]
+            stop = empty | found
+            rows = np.arange(len(active))
+            column = stop.argmax(axis=1)
+            hit = stop[rows, column]
+            slots = np.where(hit, window[rows, column], (slots + np.uint64(self._PROBE_WINDOW)) & mask)
+            found = hit & found[rows, column]
+
+            # keys reaching the same empty slot all write it; the (distinct)
+            # key that reads back claimed it, the others probe on next round
+            candidates = np.flatnonzero(hit & ~found)
+            table_lo[slots[candidates]] = key_lo[candidates]
+            claimed = table_lo[slots[candidates]] == key_lo[candidates]
+            if highs is not None:
+                table_hi[slots[candidates]] = key_hi[candidates]
+                claimed &= table_hi[slots[candidates]] == key_hi[candidates]
+            claims = candidates[claimed]
+            inserted[active[claims]] = True
+
+            stay = ~found
+            stay[claims] = False
+            active, slots = active[stay], slots[stay]
+        self._size += int(inserted.sum())
+        del table_lo, table_hi
+
+        for i in active.tolist():
+            lo = int(lows[i])
+            hi = 0 if highs is None else int(highs[i])
+            slot = self._probe(lo, hi)
+            if not self._occupied_at(slot):
+                self._lo[slot] = lo
+                if self._hi is not None:
+                    self._hi[slot] = hi
+                self._size += 1
+                inserted[i] = True
+
+        new[first] = inserted
+        return new
+
+    def update(self, keys):
+        """Insert keys, like `add_many` without the result."""
+        self.add_many(keys)
+
+    def _grow(self, n_keys):
+        """Reallocate with room for n_keys at a load factor of at most 3/4."""
+        lows, highs = self._occupied()
+        capacity = len(self._lo)
+        while 4 * n_keys > 3 * capacity:
+            capacity *= 2
+        self._allocate(capacity)
+        self._fill(lows, highs)
+
+    def _fill(self, lows, highs):
+        """
+        Insert distinct keys into an empty table. Sorted by home slot, linear
+        probing puts key i at i + max over k <= i of (home[k] - k), so only the
+        keys that would run past the last slot are probed one by one.
+        """
+        zero = lows == 0 if highs is None else (lows == 0) & (highs == 0)
+        if zero.any():
+            self._has_zero = True
+            lows = lows[~zero]
+            highs = None if highs is None else highs[~zero]
+        home = (lows & np.uint64(self._mask)).astype(np.int64)
+        order = np.argsort(home, kind="stable")
+        steps = np.arange(len(order))
+        slots = steps + np.maximum.accumulate(home[order] - steps) if len(order) else steps
+        fits = slots <= self._mask
+        np.frombuffer(self._lo, dtype=np.uint64)[slots[fits]] = lows[order[fits]]
+        if highs is not None:
+            np.frombuffer(self._hi, dtype=np.uint64)[slots[fits]] = highs[order[fits]]
+        self._size = int(fits.sum())
+        for i in order[~fits].tolist():
+            lo = int(lows[i])
+            hi = 0 if highs is None else int(highs[i])
+            slot = self._probe(lo, hi)
+            self._lo[slot] = lo
+            if highs is not None:
+                self._hi[slot] = hi
+            self._size += 1
+
+    def _occupied(self):
+        """Lane arrays of the keys stored in the table (without the zero key), in slot order."""
+        lows = np.frombuffer(self._lo, dtype=np.uint64)
+        if self._hi is None:
+            return lows[lows != 0].copy(), None
+        highs = np.frombuffer(self._hi, dtype=np.uint64)
+        used = (lows != 0) | (highs != 0)
+        return lows[used].copy(), highs[used].copy()
+
+    def __len__(self):
+        return self._size + self._has_zero
+
+    def __iter__(self):
+        lows, highs = self._occupied()
+        keys = lows.tolist() if highs is None else [lo | hi << 64 for lo, hi in zip(lows.tolist(), highs.tolist())]
+        if self._has_zero:
+            keys.append(0)
+        return iter(keys)
+
+    @property
+    def nbytes(self):
+        """Memory held by the table arrays, in bytes."""
+        lanes = 1 if self._hi is None else 2
+        return len(self._lo) * 8 * lanes
+
+    def to_array(self):
+        """Stored keys as a NumPy array of shape (n, bits // 64) of uint64 (low lane first)."""
+        lows, highs = self._occupied()
+        lanes = [lows] if highs is None else [lows, highs]
+        if self._has_zero:
+            lanes = [np.append(lane, np.uint64(0)) for lane in lanes]
+        return np.stack(lanes, axis=1)
+
+    @classmethod
+    def from_array(cls, keys):
+        """Build a set from the output of `to_array`."""
+        keys = np.asarray(keys, dtype=np.uint64).reshape(len(keys), -1)
+        hashset = cls(bits=64 * keys.shape[1], capacity=(4 * len(keys)) // 3 + 1)
+        hashset._fill(keys[:, 0].copy(), keys[:, 1].copy() if keys.shape[1] == 2 else None)
+        return hashset
+
+    def __getstate__(self):
+        # pickle the compacted keys rather than the partly empty table
+        return self.bits, self.to_array()
+
+    def __setstate__(self, state):
+        bits, keys = state
+        self.bits = bits
+        self._has_zero = False
+        self._allocate(1 << max(3, ((4 * len(keys)) // 3).bit_length()))
+        self._fill(keys[:, 0].copy(), keys[:, 1].copy() if bits == 128 else None)
+
+    def __repr__(self):
+        return f"CompactHashSet(bits={self.bits}, size={len(self)}, capacity={len(self._lo)})"
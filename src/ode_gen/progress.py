@@ -0,0 +1,84 @@
+import sys
+from collections import namedtuple
+from time import perf_counter
+
+class ProgressUpdate(namedtuple("ProgressUpdate", ["stage", "level", "done", "total", "elapsed"])):
+    """
+    Progress of one size level of an enumeration stage, as passed to the
+    `progress=` callbacks of the enumeration and reaction functions.
+
+    Attributes
+    ----------
+    stage : str
+        'species', 'dimer_reactions' or 'transformations'.
+    level : int or None
+        Subset size (species) or species size (dimer reactions) being processed.
+    done, total : int
+        Work units completed and known combinatorial total of the level.
+    elapsed : float
+        Seconds since the level started.
+    """
+    __slots__ = ()
+
+    @property
+    def fraction(self):
+        return self.done / self.total if self.total else 1.0
+
+    @property
+    def rate(self):
+        """Work units per second."""
+        return self.done / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def eta(self):
+        """Estimated seconds until the level is complete, or None before any throughput is known."""
+        rate = self.rate
+        return (self.total - self.done) / rate if rate > 0 else None
+
+class ProgressTracker:
+    """
+    Turns per-unit advances into throttled `ProgressUpdate` callbacks.
+
+    The callback is invoked every `every` units and once when a level is
+    complete, so the cost per unit is an addition and a comparison.
+    """
+
+    def __init__(self, callback, stage, every=1000):
+        self.callback = callback
+        self.stage = stage
+        self.every = every
+        self.level = None
+        self.total = 0
+        self.done = 0
+        self._next = every
+        self._start = perf_counter()
+
+    def start_level(self, level, total, done=0):
+        """Start (or, with `done` > 0, resume) a level of `total` units."""
+        self.level = level
+        self.total = total
+        self.done = done
+        self._next = min(done + self.every, total)
+        self._start = perf_counter()
+
+    def advance(self, n=1):
+        self.done += n
+        if self.done >= self._next:
+            self._next = min(self.done + self.every, self.total) if self.done < self.total else float("inf")
+            self.callback(ProgressUpdate(self.stage, self.level, self.done, self.total,
+                                         perf_counter() - self._start))
+
+def format_duration(seconds):
+    if seconds is None:
+        return "?"
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{hours}h{minutes:02d}m" if hours else f"{minutes}m{seconds:02d}s"
+
+def print_progress(update, file=None):
+    """Default progress callback: one status line per update on stderr."""
+    file = sys.stderr if file is None else file
+    print(f"{update.stage} level {update.level}: {update.done}/{update.total} "
+          f"({100 * update.fraction:.1f}%) {update.rate:.0f}/s ETA {format_duration(update.eta)}",
+          file=file, flush=True)
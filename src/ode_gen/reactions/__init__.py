@@ -1,7 +1,39 @@
-from .dimer import find_all_dimer_reactions
-from .transformation import find_all_transformable_subgraph_pairs
+from importlib import import_module
+
+# Submodules are imported on first attribute access so that `import ode_gen.reactions`
+# does not pull in NetworkX before the reaction generators are actually used.
+_LAZY_ATTRIBUTES = {
+    "find_all_dimer_reactions": ".dimer",
+    "find_all_transformable_subgraph_pairs": ".transformation",
+    "find_cyclization_transformations": ".transformation",
+    "DimerReaction": ".records",
+    "Transformation": ".records",
+    "LumpedReaction": ".records",
+    "ReactionNetwork": ".network",
+    "GillespieSimulator": ".ssa",
+    "lump_reactions": ".lumping",
+    "find_all_lumped_dimer_reactions": ".lumping",
+}
 
 __all__ = [
     "find_all_dimer_reactions",
     "find_all_transformable_subgraph_pairs",
-]
\ No newline at end of file
+    "find_cyclization_transformations",
+    "DimerReaction",
+    "Transformation",
+    "LumpedReaction",
+    "ReactionNetwork",
+    "GillespieSimulator",
+    "lump_reactions",
+    "find_all_lumped_dimer_reactions",
+]
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
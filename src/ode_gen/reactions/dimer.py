@@ -1,8 +1,13 @@
 import networkx as nx
 from networkx.algorithms.graph_hashing import weisfeiler_lehman_graph_hash
-from itertools import combinations
-from multiprocessing import Pool, cpu_count
-import time
+from functools import partial
+from itertools import combinations, islice, repeat
+from math import comb
+from time import perf_counter
+from ode_gen.complexes.wl import BatchedWL, WL_BATCH_SIZE, wl_hash
+from ode_gen.hashset import CompactHashSet, pair_key, popcount
+from ode_gen.reactions.records import DimerReaction
+from ode_gen.stats import EnumerationStats
 
 def is_connected(G, nodes):
     """Check if nodes induce a connected subgraph in G."""
@@ -12,39 +17,260 @@ def typed_wl_hash(Gsub):
     """Get WL graph hash using node and edge types."""
     return weisfeiler_lehman_graph_hash(Gsub, node_attr="type", edge_attr="type")
 
-def all_unique_induced_splits(G):
-    """Yield all unique ways to split G into two connected, typed-isomorphic-aware induced subgraphs."""
+def split_work_units(n, max_broken_bonds=None):
+    """
+    Number of candidates examined by `all_unique_induced_splits` for a
+    species with n nodes, or, with `max_broken_bonds`, with n edges.
+    """
+    max_r = n // 2 if max_broken_bonds is None else min(max_broken_bonds, n)
+    return sum(comb(n, r) for r in range(1, max_r + 1))
+
+class SplitCursor:
+    """
+    Resumable position of `all_unique_induced_splits`: the size r and index of
+    the next candidate subset (of nodes, or of cut edges with
+    `max_broken_bonds`) and the keys of the splits already yielded, as a
+    `CompactHashSet` of 128-bit keys of the sorted (part1, part2) hash pairs.
+    `hook`, if set, is called before each candidate once the position is updated.
+    """
+    __slots__ = ("r", "index", "seen", "hook")
+
+    def __init__(self, r=1, index=0, seen=None, hook=None):
+        self.r = r
+        self.index = index
+        self.seen = CompactHashSet() if seen is None else seen
+        self.hook = hook
+
+    def work_done(self, n, max_broken_bonds=None):
+        """Candidates examined before this position, as counted by `split_work_units`."""
+        max_r = n // 2 if max_broken_bonds is None else min(max_broken_bonds, n)
+        return sum(comb(n, k) for k in range(1, min(self.r, max_r + 1))) + self.index
+
+def edge_table(G):
+    """Edges of G as (u, v, type) in iteration order; bit e of a cut mask refers to edge e."""
+    return list(G.edges(data="type"))
+
+def incident_edge_masks(G):
+    """Bitmask over `edge_table(G)` of the edges incident to each node."""
+    masks = dict.fromkeys(G, 0)
+    for e, (u, v) in enumerate(G.edges()):
+        masks[u] |= 1 << e
+        masks[v] |= 1 << e
+    return masks
+
+def edges_from_mask(edges, mask, part1):
+    """Decode a cut mask into (u, v, type) edges, oriented from part1 to the other part."""
+    cut_edges = []
+    while mask:
+        low = mask & -mask
+        u, v, edge_type = edges[low.bit_length() - 1]
+        cut_edges.append((u, v, edge_type) if u in part1 else (v, u, edge_type))
+        mask ^= low
+    return cut_edges
+
+def _low_cut_parts(nodes, edges, neighbor_masks, edge_subsets):
+    """
+    The splits among the removals of edge subsets: (A indices, A, B, cut mask)
+    for every subset F whose removal leaves exactly two components A and B
+    with F the whole cut between them, and the number of connectivity checks.
+    A is the smaller part, or the one with the first node on ties.
+    """
+    n = len(nodes)
+    full = (1 << n) - 1
+    parts = []
+    n_checks = 0
+    for edge_subset in edge_subsets:
+        masks = neighbor_masks[:]
+        for e in edge_subset:
+            u, v = edges[e]
+            masks[u] &= ~(1 << v)
+            masks[v] &= ~(1 << u)
+        component = _component_mask(masks, 1, full)
+        n_checks += 1
+        if component == full:
+            continue
+        rest = full ^ component
+        n_checks += 1
+        if _component_mask(masks, rest & -rest, rest) != rest:
+            continue
+        # every removed edge must join the two parts, otherwise F is not a minimal cut
+        if any((component >> u & 1) == (component >> v & 1) for u, v in (edges[e] for e in edge_subset)):
+            continue
+        a_mask = component if 2 * popcount(component) <= n else rest
+        if 2 * popcount(a_mask) == n:
+            a_mask = component
+        a_indices = tuple(i for i in range(n) if a_mask >> i & 1)
+        cut_mask = 0
+        for e in edge_subset:
+            cut_mask |= 1 << e
+        parts.append((a_indices, {nodes[i] for i in a_indices},
+                      {nodes[i] for i in range(n) if not a_mask >> i & 1}, cut_mask))
+    return parts, n_checks
+
+def _component_mask(neighbor_masks, start, within):
+    """Bitmask of the nodes reachable from the `start` bit inside `within`."""
+    reached = frontier = start
+    while frontier:
+        low = frontier & -frontier
+        frontier ^= low
+        new = neighbor_masks[low.bit_length() - 1] & within & ~reached
+        reached |= new
+        frontier |= new
+    return reached
+
+def all_unique_induced_splits(G, stats=None, tracker=None, cursor=None, details=False, unique=True,
+                              max_broken_bonds=None):
+    """
+    Yield all unique ways to split G into two connected, typed-isomorphic-aware induced subgraphs.
+
+    An optional `ode_gen.stats.EnumerationStats` receives the counters
+    split_subsets_examined (candidate node or edge subsets),
+    split_connectivity_checks, split_connectivity_rejections,
+    split_hash_computations, split_cache_hits and splits, and the phase timings
+    split_connectivity and split_hashing. An optional
+    `ode_gen.progress.ProgressTracker` is advanced by the candidate splits of
+    each batch; both parts of the connected candidates are hashed in batches
+    with `ode_gen.complexes.wl.BatchedWL`. An optional `SplitCursor` is kept
+    up to date and, if it is not at its start, the enumeration resumes from
+    it. With `details`, the 128-bit hashes of both parts and the cut-edge mask
+    are yielded as well, as
+    (A, B, hash_A, hash_B, cut_mask). The mask is the XOR of the incident-edge
+    masks of the nodes of A (edges inside A cancel), over `edge_table(G)`.
+    With `unique=False`, isomorphic splits are not filtered out and every
+    split into two connected parts is yielded exactly once (interface
+    multiplicities, see `ode_gen.reactions.lumping`).
+
+    With `max_broken_bonds=k`, only splits that break at most k bonds are
+    enumerated, by removing every set F of at most k edges (in order of size)
+    and keeping the removals that leave two connected parts joined by exactly
+    the edges of F. This examines sum(C(m, j), j <= k) edge subsets for m
+    edges instead of the node subsets of all sizes up to n / 2; the cursor
+    then counts cut sizes and edge subsets.
+    """
     nodes = list(G.nodes)
     n = len(nodes)
-    seen = set()
-    
-    for r in range(1, n // 2 + 1):
-        for A in combinations(nodes, r):
-            A = set(A)
-            B = set(nodes) - A
+    all_indices = set(range(n))
+    hasher = BatchedWL(G)
+    incident = incident_edge_masks(G) if details and max_broken_bonds is None else None
+    if cursor is None:
+        cursor = SplitCursor()
+    if max_broken_bonds is not None:
+        index = {node: i for i, node in enumerate(nodes)}
+        edges = [(index[u], index[v]) for u, v in G.edges()]
+        neighbor_masks = [0] * n
+        for u, v in edges:
+            neighbor_masks[u] |= 1 << v
+            neighbor_masks[v] |= 1 << u
+        sizes = range(cursor.r, min(max_broken_bonds, len(edges)) + 1)
+        pool = range(len(edges))
+    else:
+        sizes = range(cursor.r, n // 2 + 1)
+        pool = range(n)
+    seen = cursor.seen
+    hook = cursor.hook
+    timed = stats is not None
+    n_examined = n_checks = n_rejected = n_hashed = n_hits = n_yielded = 0
+    t_connectivity = t_hashing = 0.0
 
-            if not is_connected(G, A) or not is_connected(G, B):
-                continue
+    try:
+        for r in sizes:
+            first = cursor.index if r == cursor.r else 0
+            subsets = combinations(pool, r)
+            if first:
+                subsets = islice(subsets, first, None)
 
-            h1 = typed_wl_hash(G.subgraph(A))
-            h2 = typed_wl_hash(G.subgraph(B))
-            key = tuple(sorted((h1, h2)))
+            # candidates are filtered one by one and both parts hashed in batches;
+            # the cursor only moves between batches, once their splits are consumed
+            index = first
+            while True:
+                chunk = list(islice(subsets, WL_BATCH_SIZE))
+                if not chunk:
+                    break
+                cursor.r, cursor.index = r, index
+                if hook is not None:
+                    hook()
+                index += len(chunk)
+                n_examined += len(chunk)
+                if tracker is not None:
+                    tracker.advance(len(chunk))
 
-            if key in seen:
-                continue
-            seen.add(key)
-            yield A, B
+                if timed:
+                    t0 = perf_counter()
+                if max_broken_bonds is not None:
+                    parts, checks = _low_cut_parts(nodes, edges, neighbor_masks, chunk)
+                    n_checks += checks
+                else:
+                    parts = []
+                    for a_indices in chunk:
+                        if not unique and 2 * r == n and a_indices[0] != 0:
+                            # equal halves: each split is also met as its complement
+                            continue
+                        A = {nodes[i] for i in a_indices}
+                        n_checks += 1
+                        if not is_connected(G, A):
+                            continue
+                        B = {nodes[i] for i in all_indices.difference(a_indices)}
+                        n_checks += 1
+                        if not is_connected(G, B):
+                            continue
+                        parts.append((a_indices, A, B, None))
+                n_rejected += len(chunk) - len(parts)
+                if timed:
+                    t_connectivity += perf_counter() - t0
+                    t0 = perf_counter()
 
-def deduplicate_species(species):
-    """Filter out isomorphic species using WL hash."""
+                hashes_a, hashes_b = hasher.hash_splits([part[0] for part in parts])
+                n_hashed += 2 * len(parts)
+                if timed:
+                    t_hashing += perf_counter() - t0
+
+                if unique:
+                    new_pairs = seen.add_many([pair_key(h1, h2) for h1, h2 in zip(hashes_a, hashes_b)])
+                else:
+                    new_pairs = repeat(True)
+                for (_, A, B, cut_mask), h1, h2, is_new in zip(parts, hashes_a, hashes_b, new_pairs):
+                    if not is_new:
+                        n_hits += 1
+                        continue
+                    n_yielded += 1
+                    if details:
+                        if cut_mask is None:
+                            cut_mask = 0
+                            for node in A:
+                                cut_mask ^= incident[node]
+                        yield A, B, h1, h2, cut_mask
+                    else:
+                        yield A, B
+    finally:
+        if stats is not None:
+            stats.count("split_subsets_examined", n_examined)
+            stats.count("split_connectivity_checks", n_checks)
+            stats.count("split_connectivity_rejections", n_rejected)
+            stats.count("split_hash_computations", n_hashed)
+            stats.count("split_cache_hits", n_hits)
+            stats.count("splits", n_yielded)
+            stats.add_time("split_connectivity", t_connectivity)
+            stats.add_time("split_hashing", t_hashing)
+
+def _deduplicate_species_with_hashes(species, stats=None):
+    """Unique species together with their (`BatchedWL`-consistent) WL hashes."""
     seen_hashes = set()
     unique_species = []
+    unique_hashes = []
     for sp in species:
-        h = typed_wl_hash(sp)
+        h = wl_hash(sp)
         if h not in seen_hashes:
             seen_hashes.add(h)
             unique_species.append(sp)
-    return unique_species
+            unique_hashes.append(h)
+    if stats is not None:
+        stats.count("dedupe_hash_computations", len(species))
+        stats.count("dedupe_cache_hits", len(species) - len(unique_species))
+    return unique_species, unique_hashes
+
+def deduplicate_species(species, stats=None):
+    """Filter out isomorphic species using WL hash."""
+    return _deduplicate_species_with_hashes(species, stats)[0]
 
 def get_broken_edges(G, part1, part2):
     """Return edges between part1 and part2, with type attributes."""
@@ -86,23 +312,163 @@ def find_single_bond_transformations(species):
                     transformations.append((G1, G2))
     return transformations
 
-def compute_reactions_for_species(specie):
-    """Compute reactions (split pairs) for a single species."""
+def compute_reactions_for_species(specie, stats=None, tracker=None, cursor=None, max_broken_bonds=None):
+    """
+    Compute reactions (split pairs) for a single species, as `DimerReaction`
+    records on the one-element species list [specie] (reactant indices are None).
+    """
+    species = [specie]
+    splits = all_unique_induced_splits(specie, stats, tracker, cursor, details=True, max_broken_bonds=max_broken_bonds)
+    return [DimerReaction(species, 0, None, None, part1, part2, cut_mask)
+            for part1, part2, _, _, cut_mask in splits]
+
+def _compute_splits(specie, with_stats=False, max_broken_bonds=None):
+    """
+    Pool worker: the splits of one species, and the stats of their enumeration
+    if requested. The species itself is not sent back; the parent pairs the
+    splits with its own species object.
+    """
+    stats = EnumerationStats() if with_stats else None
+    splits = [(tuple(A), tuple(B), h1, h2, cut_mask)
+              for A, B, h1, h2, cut_mask in all_unique_induced_splits(
+                  specie, stats, details=True, max_broken_bonds=max_broken_bonds)]
+    return splits, stats
+
+def find_all_dimer_reactions(species, use_multiprocessing=False, stats=None, progress=None,
+                             checkpoint=None, checkpoint_interval=300.0, max_broken_bonds=None):
+    """
+    Compute all reactions across a list of species with optional multiprocessing.
+
+    Reactions are returned as `DimerReaction` records on the deduplicated
+    species list, which all records share; the reactant indices are found from
+    the WL hashes of the parts. Records still unpack as (part1, part2, specie).
+
+    An optional `ode_gen.stats.EnumerationStats` collects the counters of
+    `deduplicate_species` and `all_unique_induced_splits` (aggregated over the
+    pool workers) and the phase timings deduplicate and splits.
+
+    `progress` is an optional callback receiving `ode_gen.progress.ProgressUpdate`
+    records. A level groups the species of one size, and its total is the
+    number of candidate splits of those species (`split_work_units`). Without
+    multiprocessing, progress advances per candidate split; with the pool it
+    advances as each species is completed, and callbacks run in the parent.
+
+    With a `checkpoint` path, the index of the current species, the split
+    enumeration cursor inside it and the reactions found so far (as species
+    indices and node tuples) are saved to that file at most every `checkpoint_interval` seconds
+    and on completion; with the pool, saves happen between species. If the
+    file already exists, the computation resumes from it and returns the same
+    reactions as an uninterrupted run.
+
+    With `max_broken_bonds=k`, only reactions that break (or form) at most k
+    bonds are returned, and the splits are enumerated from the cut edges (see
+    `all_unique_induced_splits`); the progress totals then count edge subsets.
+    """
+    checkpointer = None
+    state = None
+    if checkpoint is not None:
+        from ode_gen.checkpoint import Checkpointer, graph_fingerprint
+        fingerprint = graph_fingerprint(species)
+        if max_broken_bonds is not None:
+            fingerprint += f"/max_broken_bonds={max_broken_bonds}"
+        checkpointer = Checkpointer(checkpoint, "dimer_reactions", fingerprint, checkpoint_interval)
+        state = checkpointer.load()
+
+    start = perf_counter()
+    species, species_hashes = _deduplicate_species_with_hashes(species, stats)
+    index_by_hash = {h: i for i, h in enumerate(species_hashes)}
+    if stats is not None:
+        stats.add_time("deduplicate", perf_counter() - start)
+        start = perf_counter()
+
     reactions = []
-    for part1, part2 in all_unique_induced_splits(specie):
-        reactions.append((part1, part2, specie))
-    return reactions
+    first_species = 0
+    resumed_cursor = None
+    if state is not None:
+        reactions = [DimerReaction(species, *row) for row in state["reactions"]]
+        first_species = state["species_index"]
+        if state["split"] is not None:
+            resumed_cursor = SplitCursor(*state["split"])
 
-def find_all_dimer_reactions(species, use_multiprocessing=False):
-    """Compute all reactions across a list of species with optional multiprocessing."""
-    species = deduplicate_species(species)
+    def save(species_index, cursor=None):
+        checkpointer.save(
+            species_index=species_index,
+            split=None if cursor is None else (cursor.r, cursor.index, cursor.seen),
+            reactions=[(r.product, r.reactant1, r.reactant2, r.part1, r.part2, r.cut_mask) for r in reactions],
+        )
+
+    def record(i, part1, part2, hash1, hash2, cut_mask):
+        return DimerReaction(species, i, index_by_hash.get(hash1), index_by_hash.get(hash2),
+                             part1, part2, cut_mask)
+
+    def candidate_pool(specie):
+        # candidates are node subsets, or edge subsets with max_broken_bonds
+        return len(specie) if max_broken_bonds is None else specie.number_of_edges()
+
+    def work_units(specie):
+        return split_work_units(candidate_pool(specie), max_broken_bonds)
+
+    tracker = None
+    if progress is not None:
+        from ode_gen.progress import ProgressTracker
+        tracker = ProgressTracker(progress, "dimer_reactions")
+        level_totals, level_done = {}, {}
+        for i, specie in enumerate(species):
+            units = work_units(specie)
+            level_totals[len(specie)] = level_totals.get(len(specie), 0) + units
+            if i < first_species:
+                level_done[len(specie)] = level_done.get(len(specie), 0) + units
+        if resumed_cursor is not None:
+            size = len(species[first_species])
+            level_done[size] = level_done.get(size, 0) + resumed_cursor.work_done(
+                candidate_pool(species[first_species]), max_broken_bonds)
+
+    def start_level(specie):
+        if tracker is not None and tracker.level != len(specie):
+            # species of one size are usually contiguous; otherwise the level is resumed
+            if tracker.level is not None:
+                level_done[tracker.level] = tracker.done
+            tracker.start_level(len(specie), level_totals[len(specie)], level_done.get(len(specie), 0))
+
+    def compute_serially(i, cursor=None):
+        specie = species[i]
+        start_level(specie)
+        if checkpointer is not None:
+            cursor = cursor or SplitCursor()
+            cursor.hook = lambda: checkpointer.due() and save(i, cursor)
+        # appended as they are found, so a checkpoint includes the splits already yielded
+        for split in all_unique_induced_splits(specie, stats, tracker, cursor, details=True,
+                                               max_broken_bonds=max_broken_bonds):
+            reactions.append(record(i, *split))
+
+    if resumed_cursor is not None:
+        compute_serially(first_species, resumed_cursor)
+        first_species += 1
 
     if use_multiprocessing:
+        from multiprocessing import Pool, cpu_count
+
+        remaining = species[first_species:]
         with Pool(cpu_count()) as pool:
-            results = pool.map(compute_reactions_for_species, species)
-        reactions = [r for group in results for r in group]
+            worker = partial(_compute_splits, with_stats=stats is not None, max_broken_bonds=max_broken_bonds)
+            chunksize = max(1, len(remaining) // (4 * cpu_count()))
+            for i, (splits, worker_stats) in enumerate(pool.imap(worker, remaining, chunksize), first_species):
+                if stats is not None:
+                    stats.merge(worker_stats)
+                reactions.extend(record(i, *split) for split in splits)
+                start_level(species[i])
+                if tracker is not None:
+                    tracker.advance(work_units(species[i]))
+                if checkpointer is not None and checkpointer.due():
+                    save(i + 1)
     else:
-        reactions = []
-        for specie in species:
-            reactions.extend(compute_reactions_for_species(specie))
-    return reactions
\ No newline at end of file
+        for i in range(first_species, len(species)):
+            compute_serially(i)
+
+    if checkpointer is not None:
+        save(len(species))
+
+    if stats is not None:
+        stats.add_time("splits", perf_counter() - start)
+        stats.count("reactions", len(reactions))
+    return reactions
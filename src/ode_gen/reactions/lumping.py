@@ -0,0 +1,132 @@
+"""
+Lumping of dimer reactions that are equivalent up to the interface broken.
+
+`find_all_dimer_reactions` already keeps a single split per product and
+unordered reactant pair, so on its output `lump_reactions` is one to one
+(`reduction_ratio` 1.0, e.g. on 5l93) and cannot make the ODE system smaller;
+it only attaches the broken bond types. The reduction is relative to the
+enumeration of all splits: `find_all_lumped_dimer_reactions` streams every
+split through `lump_reactions`, giving the same number of reactions as
+`find_all_dimer_reactions` but with multiplicities (the number of
+equivalent interfaces, i.e. statistical factors of the rate constants)
+instead of materializing one reaction per split.
+"""
+from time import perf_counter
+from ode_gen.complexes.wl import wl_hash
+from ode_gen.reactions.dimer import (
+    _deduplicate_species_with_hashes, all_unique_induced_splits, edge_table, split_work_units)
+from ode_gen.reactions.records import DimerReaction, LumpedReaction
+
+def _species_id(reaction, index, part):
+    """Canonical ID of a reactant: its species index, or the WL hash of the part if it has none."""
+    if index is not None:
+        return (0, index)
+    return (1, wl_hash(reaction.product_graph.subgraph(part)))
+
+def lump_reactions(reactions, stats=None):
+    """
+    Group dimer reactions by (product, unordered reactant pair, multiset of
+    broken bond types) into `LumpedReaction` records, one per group, in the
+    order of their first reaction.
+
+    Reactants are identified by their species index; reactions whose part
+    has no index (e.g. from `compute_reactions_for_species`) use the WL hash
+    of the part instead. Bond types come from the cut masks, or from
+    `get_broken_edges` for records without one. The reduction is
+    `reduction_ratio(lumped)`.
+
+    The records of `find_all_dimer_reactions` hold a single split per product
+    and reactant pair, so they lump one to one; the interface multiplicities
+    come from lumping all splits, see `find_all_lumped_dimer_reactions`.
+
+    An optional `ode_gen.stats.EnumerationStats` receives the counters
+    lumping_reactions_in and lumped_reactions, and the phase timing lumping
+    (which includes producing the reactions if they are streamed).
+    """
+    start = perf_counter()
+    groups = {}
+    tables = {}
+    n_in = 0
+    for reaction in reactions:
+        n_in += 1
+        if reaction.cut_mask is None:
+            bond_types = [edge_type for _, _, edge_type in reaction.broken_edges()]
+        else:
+            key = (id(reaction.species), reaction.product)
+            if key not in tables:
+                tables[key] = [edge_type for _, _, edge_type in edge_table(reaction.product_graph)]
+            edge_types, mask = tables[key], reaction.cut_mask
+            bond_types = []
+            while mask:
+                low = mask & -mask
+                bond_types.append(edge_types[low.bit_length() - 1])
+                mask ^= low
+        bond_types = tuple(sorted(bond_types, key=repr))
+
+        reactants = sorted((_species_id(reaction, reaction.reactant1, reaction.part1),
+                            _species_id(reaction, reaction.reactant2, reaction.part2)))
+        key = (id(reaction.species), reaction.product, *reactants, bond_types)
+        lumped = groups.get(key)
+        if lumped is None:
+            groups[key] = LumpedReaction(reaction, bond_types)
+        else:
+            lumped.multiplicity += 1
+
+    lumped = list(groups.values())
+    if stats is not None:
+        stats.count("lumping_reactions_in", n_in)
+        stats.count("lumped_reactions", len(lumped))
+        stats.add_time("lumping", perf_counter() - start)
+    return lumped
+
+def reduction_ratio(lumped):
+    """
+    Fraction of the input reactions that remain after lumping, i.e. lumped
+    reactions per input reaction: below 1 when reactions were merged, 1.0 if
+    nothing was lumped or for no reactions.
+    """
+    if not lumped:
+        return 1.0
+    return len(lumped) / sum(reaction.multiplicity for reaction in lumped)
+
+def find_all_lumped_dimer_reactions(species, stats=None, progress=None, max_broken_bonds=None):
+    """
+    Enumerate every split of every species into two connected parts (not
+    only one per pair of isomorphic parts, unlike `find_all_dimer_reactions`)
+    and lump them with `lump_reactions`. The multiplicity of a lumped reaction
+    is then the number of equivalent interfaces whose breaking gives the
+    reactants.
+
+    Splits are streamed into the lumping, so memory grows with the number of
+    lumped reactions only. Records refer to the deduplicated species list.
+
+    An optional `ode_gen.stats.EnumerationStats` collects the counters of
+    `deduplicate_species`, `all_unique_induced_splits` and `lump_reactions`.
+    `progress` is an optional callback receiving
+    `ode_gen.progress.ProgressUpdate` records, over the candidate splits of
+    all species (a single level, None). `max_broken_bonds` restricts the
+    splits as in `find_all_dimer_reactions`.
+
+    Examples
+    --------
+    >>> lumped = find_all_lumped_dimer_reactions(species)  # doctest: +SKIP
+    >>> print(len(lumped), reduction_ratio(lumped))  # doctest: +SKIP
+    """
+    species, species_hashes = _deduplicate_species_with_hashes(species, stats)
+    index_by_hash = {h: i for i, h in enumerate(species_hashes)}
+
+    tracker = None
+    if progress is not None:
+        from ode_gen.progress import ProgressTracker
+        tracker = ProgressTracker(progress, "lumped_dimer_reactions")
+        pools = (len(specie) if max_broken_bonds is None else specie.number_of_edges() for specie in species)
+        tracker.start_level(None, sum(split_work_units(pool, max_broken_bonds) for pool in pools))
+
+    def all_splits():
+        for i, specie in enumerate(species):
+            for part1, part2, h1, h2, cut_mask in all_unique_induced_splits(
+                    specie, stats, tracker, details=True, unique=False, max_broken_bonds=max_broken_bonds):
+                yield DimerReaction(species, i, index_by_hash.get(h1), index_by_hash.get(h2),
+                                    part1, part2, cut_mask)
+
+    return lump_reactions(all_splits(), stats)
@@ -0,0 +1,174 @@
+from array import array
+
+import numpy as np
+
+# reaction kinds
+ASSOCIATION = 0      # reactant1 + reactant2 -> product
+DISSOCIATION = 1     # product -> reactant1 + reactant2
+TRANSFORMATION = 2   # source -> target (bonds formed or broken within a species)
+
+KIND_NAMES = {ASSOCIATION: "association", DISSOCIATION: "dissociation", TRANSFORMATION: "transformation"}
+
+def _csr(rows, cols, n_rows, unique=False):
+    """CSR (indptr, indices) of the (row, col) pairs, keeping the input order within a row."""
+    rows = np.frombuffer(rows, dtype=np.int64) if len(rows) else np.zeros(0, dtype=np.int64)
+    cols = np.frombuffer(cols, dtype=np.int64) if len(cols) else np.zeros(0, dtype=np.int64)
+    if unique and len(rows):
+        # first occurrence of every (row, col) pair, in input order
+        _, first = np.unique(rows * (cols.max() + 1) + cols, return_index=True)
+        first.sort()
+        rows, cols = rows[first], cols[first]
+
+    order = np.argsort(rows, kind="stable")
+    indptr = np.zeros(n_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n_rows), out=indptr[1:])
+    return indptr, cols[order]
+
+class ReactionNetwork:
+    """
+    Species and reactions indexed with CSR adjacency arrays in both
+    directions: reaction -> consumed / produced species (with stoichiometric
+    multiplicity, e.g. A + A -> A2 consumes A twice) and species -> producing /
+    consuming reactions (each reaction listed once). All lookups are array
+    slices.
+
+    Build it with `ReactionNetwork.from_reactions` from the records returned by
+    `find_all_dimer_reactions` (and optionally `find_all_transformable_subgraph_pairs`),
+    or from any iterable of such records.
+
+    Attributes
+    ----------
+    species : list of networkx.Graph
+        Species list the indices refer to (shared with the records).
+    kinds : ndarray of int8
+        ASSOCIATION, DISSOCIATION or TRANSFORMATION for each reaction.
+    records : list
+        Record each reaction was built from.
+
+    Examples
+    --------
+    >>> network = ReactionNetwork.from_reactions(find_all_dimer_reactions(species), reversible=True)  # doctest: +SKIP
+    >>> for k in network.producing(s):  # doctest: +SKIP
+    ...     print(network.kind_name(k), network.consumed(k))
+    """
+
+    def __init__(self, species, kinds, records, consumed, produced):
+        n_species = len(species)
+        n_reactions = len(kinds)
+        self.species = species
+        self.kinds = np.frombuffer(kinds, dtype=np.int8) if n_reactions else np.zeros(0, dtype=np.int8)
+        self.records = records
+
+        (consumed_rxn, consumed_sp), (produced_rxn, produced_sp) = consumed, produced
+        self.consumed_indptr, self.consumed_indices = _csr(consumed_rxn, consumed_sp, n_reactions)
+        self.produced_indptr, self.produced_indices = _csr(produced_rxn, produced_sp, n_reactions)
+        self.consuming_indptr, self.consuming_indices = _csr(consumed_sp, consumed_rxn, n_species, unique=True)
+        self.producing_indptr, self.producing_indices = _csr(produced_sp, produced_rxn, n_species, unique=True)
+
+    @classmethod
+    def from_reactions(cls, reactions, transformations=(), species=None, reversible=False):
+        """
+        Build a network from a stream of reaction records in a single pass.
+
+        Parameters
+        ----------
+        reactions : iterable of DimerReaction
+            Each gives the association reactant1 + reactant2 -> product.
+        transformations : iterable of Transformation
+            Each gives source -> target, in the direction it was found.
+        species : list of networkx.Graph, optional
+            Species list; by default that of the first record. Records built on
+            another list are mapped onto it by identity of the species graphs.
+        reversible : bool
+            Also add the reverse of every reaction (dissociation, and target -> source).
+
+        Raises
+        ------
+        ValueError
+            If a reaction involves a species that is not in the species list.
+        """
+        kinds = array("b")
+        records = []
+        consumed = (array("q"), array("q"))
+        produced = (array("q"), array("q"))
+        index_maps = {}
+
+        def add(kind, record, inputs, outputs):
+            k = len(records)
+            kinds.append(kind)
+            records.append(record)
+            for s in inputs:
+                consumed[0].append(k)
+                consumed[1].append(s)
+            for s in outputs:
+                produced[0].append(k)
+                produced[1].append(s)
+
+        def mapper(record_species):
+            # indices of records built on another species list are translated by identity
+            if record_species is species:
+                return None
+            key = id(record_species)
+            if key not in index_maps:
+                position = {id(H): i for i, H in enumerate(species)}
+                index_maps[key] = [position.get(id(H)) for H in record_species]
+            return index_maps[key]
+
+        def translate(record, *indices):
+            mapping = mapper(record.species)
+            if mapping is not None:
+                indices = [None if i is None else mapping[i] for i in indices]
+            if any(i is None for i in indices):
+                raise ValueError(f"{record!r} involves a species that is not in the species list.")
+            return indices
+
+        for reaction in reactions:
+            if species is None:
+                species = reaction.species
+            product, reactant1, reactant2 = translate(reaction, reaction.product, reaction.reactant1, reaction.reactant2)
+            add(ASSOCIATION, reaction, (reactant1, reactant2), (product,))
+            if reversible:
+                add(DISSOCIATION, reaction, (product,), (reactant1, reactant2))
+
+        for transformation in transformations:
+            if species is None:
+                species = transformation.species
+            source, target = translate(transformation, transformation.source, transformation.target)
+            add(TRANSFORMATION, transformation, (source,), (target,))
+            if reversible:
+                add(TRANSFORMATION, transformation, (target,), (source,))
+
+        return cls([] if species is None else species, kinds, records, consumed, produced)
+
+    @property
+    def n_species(self):
+        return len(self.species)
+
+    @property
+    def n_reactions(self):
+        return len(self.kinds)
+
+    def __len__(self):
+        return self.n_reactions
+
+    def consumed(self, reaction):
+        """Species consumed by a reaction, with multiplicity."""
+        return self.consumed_indices[self.consumed_indptr[reaction]:self.consumed_indptr[reaction + 1]]
+
+    def produced(self, reaction):
+        """Species produced by a reaction, with multiplicity."""
+        return self.produced_indices[self.produced_indptr[reaction]:self.produced_indptr[reaction + 1]]
+
+    def producing(self, species):
+        """Reactions that produce a species."""
+        return self.producing_indices[self.producing_indptr[species]:self.producing_indptr[species + 1]]
+
+    def consuming(self, species):
+        """Reactions that consume a species."""
+        return self.consuming_indices[self.consuming_indptr[species]:self.consuming_indptr[species + 1]]
+
+    def kind_name(self, reaction):
+        return KIND_NAMES[int(self.kinds[reaction])]
+
+    def __repr__(self):
+        return f"ReactionNetwork(n_species={self.n_species}, n_reactions={self.n_reactions})"
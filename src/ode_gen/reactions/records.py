@@ -0,0 +1,202 @@
+from ode_gen.hashset import popcount
+
+class DimerReaction:
+    """
+    A dimer reaction: the product species splits into the two reactant
+    species induced by `part1` and `part2` (or forms from them).
+
+    Records refer to species by their index in a species list shared by all
+    records of one `find_all_dimer_reactions` call, and keep the parts as node
+    tuples; NetworkX graphs are only materialized on request. For backward
+    compatibility a record unpacks like the former `(part1, part2, specie)`
+    tuples, with the parts as sets.
+
+    Attributes
+    ----------
+    species : list of networkx.Graph
+        Shared species list the indices refer to.
+    product : int
+        Index of the product species.
+    reactant1, reactant2 : int or None
+        Indices of the species isomorphic to part1 and part2, or None if the
+        species list does not contain them.
+    part1, part2 : tuple
+        Nodes of the two parts (nodes of the assembly graph).
+    cut_mask : int or None
+        Bitmask of the bonds broken by the split over the product's
+        `dimer.edge_table`, as emitted by the split enumeration.
+    """
+    __slots__ = ("species", "product", "reactant1", "reactant2", "part1", "part2", "cut_mask")
+
+    def __init__(self, species, product, reactant1, reactant2, part1, part2, cut_mask=None):
+        self.species = species
+        self.product = product
+        self.reactant1 = reactant1
+        self.reactant2 = reactant2
+        self.part1 = tuple(part1)
+        self.part2 = tuple(part2)
+        self.cut_mask = cut_mask
+
+    @property
+    def product_graph(self):
+        return self.species[self.product]
+
+    @property
+    def reactants(self):
+        return self.reactant1, self.reactant2
+
+    def part_graphs(self):
+        """Induced subgraph views of the two parts."""
+        product = self.product_graph
+        return product.subgraph(self.part1), product.subgraph(self.part2)
+
+    @property
+    def n_broken_bonds(self):
+        if self.cut_mask is None:
+            return len(self.broken_edges())
+        return popcount(self.cut_mask)
+
+    def broken_edges(self):
+        """Edges between the two parts as (u, v, type), with u in part1."""
+        from ode_gen.reactions.dimer import edge_table, edges_from_mask, get_broken_edges
+
+        if self.cut_mask is None:
+            return get_broken_edges(self.product_graph, self.part1, set(self.part2))
+        return edges_from_mask(edge_table(self.product_graph), self.cut_mask, set(self.part1))
+
+    def __iter__(self):
+        yield set(self.part1)
+        yield set(self.part2)
+        yield self.species[self.product]
+
+    def __getitem__(self, index):
+        # index the fields directly, so that r[2] does not build the part sets
+        if isinstance(index, slice):
+            return tuple(self)[index]
+        if index < 0:
+            index += 3
+        if index == 0:
+            return set(self.part1)
+        if index == 1:
+            return set(self.part2)
+        if index == 2:
+            return self.species[self.product]
+        raise IndexError("DimerReaction index out of range")
+
+    def __len__(self):
+        return 3
+
+    def __repr__(self):
+        return (f"DimerReaction(product={self.product}, reactants=({self.reactant1}, {self.reactant2}), "
+                f"part1={self.part1}, part2={self.part2}, cut_mask={self.cut_mask})")
+
+class Transformation:
+    """
+    A transformation between two species that differ only by formed or broken
+    bonds.
+
+    Like `DimerReaction`, records refer to species by their index in a shared
+    species list and unpack like the former `(G1, G2, direction, edges)` tuples.
+
+    Attributes
+    ----------
+    species : list of networkx.Graph
+        Shared species list the indices refer to.
+    source, target : int
+        Indices of the species transformed from and into.
+    direction : str
+        'added' if bonds are formed going from source to target, 'removed' if
+        they are broken.
+    edges : tuple
+        Changed bonds as (u, v, type) on the type-relabeled graphs.
+    """
+    __slots__ = ("species", "source", "target", "direction", "edges")
+
+    def __init__(self, species, source, target, direction, edges):
+        self.species = species
+        self.source = source
+        self.target = target
+        self.direction = direction
+        self.edges = tuple(edges)
+
+    @property
+    def source_graph(self):
+        return self.species[self.source]
+
+    @property
+    def target_graph(self):
+        return self.species[self.target]
+
+    def __iter__(self):
+        yield self.species[self.source]
+        yield self.species[self.target]
+        yield self.direction
+        yield list(self.edges)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(self)[index]
+        if index < 0:
+            index += 4
+        if index == 0:
+            return self.species[self.source]
+        if index == 1:
+            return self.species[self.target]
+        if index == 2:
+            return self.direction
+        if index == 3:
+            return list(self.edges)
+        raise IndexError("Transformation index out of range")
+
+    def __len__(self):
+        return 4
+
+    def __repr__(self):
+        return (f"Transformation(source={self.source}, target={self.target}, "
+                f"direction={self.direction!r}, edges={self.edges})")
+
+class LumpedReaction:
+    """
+    A group of dimer reactions with the same product, the same reactant
+    species and the same multiset of broken bond types, which differ only in
+    the (equivalent) interface that breaks. In an ODE system the group is a
+    single reaction whose rate constant is `multiplicity` times that of one
+    interface.
+
+    Attributes
+    ----------
+    species : list of networkx.Graph
+        Shared species list the indices refer to.
+    product : int
+        Index of the product species.
+    reactant1, reactant2 : int or None
+        Indices of the reactant species, as in `representative`.
+    bond_types : tuple
+        Types of the broken bonds, sorted.
+    multiplicity : int
+        Number of lumped reactions.
+    representative : DimerReaction
+        First reaction of the group.
+    """
+    __slots__ = ("species", "product", "reactant1", "reactant2", "bond_types", "multiplicity", "representative")
+
+    def __init__(self, representative, bond_types, multiplicity=1):
+        self.species = representative.species
+        self.product = representative.product
+        self.reactant1 = representative.reactant1
+        self.reactant2 = representative.reactant2
+        self.bond_types = tuple(bond_types)
+        self.multiplicity = multiplicity
+        self.representative = representative
+
+    @property
+    def product_graph(self):
+        return self.species[self.product]
+
+    @property
+    def reactants(self):
+        return self.reactant1, self.reactant2
+
+    def __repr__(self):
+        return (f"LumpedReaction(product={self.product}, reactants=({self.reactant1}, {self.reactant2}), "
+                f"bond_types={self.bond_types}, multiplicity={self.multiplicity})")
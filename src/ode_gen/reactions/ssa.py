@@ -0,0 +1,226 @@
+import numpy as np
+from time import perf_counter
+
+class GillespieSimulator:
+    """
+    Exact stochastic simulation (Gillespie's direct method) of a
+    `ReactionNetwork` with mass-action kinetics.
+
+    Propensities are kept in a binary sum tree over the reactions, so drawing
+    the next reaction and updating a propensity cost O(log R) for R
+    reactions. After an event only the reactions that consume a species whose
+    count changed are recomputed; this dependency graph is read directly from
+    the network's species -> consuming reactions CSR arrays. The cost of an
+    event is therefore independent of the size of the network except for the
+    logarithmic tree depth (and of course the number of dependent reactions).
+
+    The propensity of a reaction with stochastic rate constant c is c * x_A
+    for A -> ..., c * x_A * x_B for A + B -> ... and c * x_A * (x_A - 1) / 2
+    for A + A -> ..., where x are the current copy numbers. Converting
+    deterministic rate constants to stochastic ones (volume scaling) is up to
+    the caller.
+
+    Parameters
+    ----------
+    network : ReactionNetwork
+        Network to simulate; reactions may consume one or two species.
+    rate_constants : float or array-like
+        Stochastic rate constant of every reaction, or one for all of them.
+        For networks of `LumpedReaction` records, multiply by the
+        multiplicities.
+    counts : array-like of int
+        Initial copy number of every species.
+    seed : int or numpy.random.Generator, optional
+        Seed or generator of the random numbers.
+
+    Attributes
+    ----------
+    time : float
+        Current simulation time.
+    counts : ndarray of int64
+        Current copy numbers (updated in place).
+    n_events : int
+        Number of reactions fired so far.
+
+    Examples
+    --------
+    >>> network = ReactionNetwork.from_reactions(find_all_dimer_reactions(species), reversible=True)  # doctest: +SKIP
+    >>> k = np.where(network.kinds == ASSOCIATION, 1e-3, 1e-2)  # doctest: +SKIP
+    >>> sim = GillespieSimulator(network, k, initial_counts, seed=0)  # doctest: +SKIP
+    >>> samples = sim.run(t_end=100.0, sample_times=np.linspace(0, 100, 101))  # doctest: +SKIP
+    """
+
+    def __init__(self, network, rate_constants, counts, seed=None):
+        n_reactions = network.n_reactions
+        self.network = network
+        self.rng = np.random.default_rng(seed)
+        self.time = 0.0
+        self.n_events = 0
+        self.counts = np.array(counts, dtype=np.int64)
+        if self.counts.shape != (network.n_species,):
+            raise ValueError(f"Expected {network.n_species} species counts, got shape {self.counts.shape}.")
+        self.rate_constants = np.broadcast_to(np.asarray(rate_constants, dtype=float), (n_reactions,)).copy()
+
+        n_consumed = np.diff(network.consumed_indptr)
+        if np.any((n_consumed < 1) | (n_consumed > 2)):
+            raise ValueError("Every reaction must consume one or two species.")
+        first = network.consumed_indptr[:-1]
+        second = np.minimum(first + 1, max(len(network.consumed_indices) - 1, 0))
+        self._reactant1 = network.consumed_indices[first]
+        self._reactant2 = np.where(n_consumed == 2, network.consumed_indices[second], -1)
+        self._homodimer = self._reactant1 == self._reactant2
+
+        # leaves of the sum tree start at `_offset`; node i sums nodes 2i and 2i + 1
+        self._offset = 1 << max(0, (n_reactions - 1).bit_length())
+        self._tree = np.zeros(2 * self._offset)
+        self._update(np.arange(n_reactions))
+
+    def _propensities(self, reactions):
+        """Mass-action propensities of an array of reactions at the current counts."""
+        x = self.counts
+        r2 = self._reactant2[reactions]
+        homodimer = self._homodimer[reactions]
+        second = np.where(r2 >= 0, (x[r2] - homodimer) / (1.0 + homodimer), 1.0)
+        return self.rate_constants[reactions] * x[self._reactant1[reactions]] * second
+
+    def _update(self, reactions):
+        """Recompute the propensities of reactions and the sums above them."""
+        if len(reactions) == 0:
+            return
+        tree = self._tree
+        nodes = reactions + self._offset
+        tree[nodes] = self._propensities(reactions)
+        # repeated parents are assigned the same sum, so no deduplication is needed;
+        # levels where many nodes change are recomputed whole, with strided slices
+        level = self._offset >> 1
+        nodes >>= 1
+        while level >= 1:
+            if 8 * len(nodes) >= level:
+                while level >= 1:
+                    tree[level:2 * level] = tree[2 * level:4 * level:2] + tree[2 * level + 1:4 * level:2]
+                    level >>= 1
+                break
+            tree[nodes] = tree[2 * nodes] + tree[2 * nodes + 1]
+            nodes >>= 1
+            level >>= 1
+
+    @property
+    def total_propensity(self):
+        return float(self._tree[1])
+
+    @property
+    def propensities(self):
+        """Current propensity of every reaction (a view, do not modify)."""
+        return self._tree[self._offset:self._offset + self.network.n_reactions]
+
+    def _select(self, target):
+        """Reaction whose cumulative propensity interval contains `target`."""
+        tree = self._tree
+        offset = self._offset
+        node = 1
+        while node < offset:
+            left = tree[2 * node]
+            if target < left:
+                node = 2 * node
+            else:
+                target -= left
+                node = 2 * node + 1
+        if tree[node] > 0.0:
+            return node - offset
+        # rounding left the descent on a leaf that cannot fire (e.g. past the
+        # upper end of the last nonzero interval): take the closest earlier
+        # reaction with nonzero propensity, or else the first later one
+        propensities = self.propensities
+        earlier = np.flatnonzero(propensities[:node - offset + 1] > 0.0)
+        if len(earlier):
+            return int(earlier[-1])
+        return int(np.flatnonzero(propensities > 0.0)[0])
+
+    def fire(self, reaction):
+        """
+        Apply a reaction to the counts and update the dependent propensities;
+        return the number of propensities recomputed.
+        """
+        network = self.network
+        consumed = network.consumed(reaction)
+        produced = network.produced(reaction)
+        counts = self.counts
+        for s in consumed:
+            counts[s] -= 1
+        for s in produced:
+            counts[s] += 1
+        dependents = np.concatenate([network.consuming(s) for s in np.union1d(consumed, produced)])
+        self._update(dependents)
+        self.n_events += 1
+        return len(dependents)
+
+    def step(self):
+        """
+        Advance to the next event.
+
+        Returns
+        -------
+        int or None
+            The reaction fired, or None if no reaction can fire anymore.
+        """
+        total = self._tree[1]
+        if total <= 0.0:
+            return None
+        self.time += self.rng.exponential(1.0 / total)
+        reaction = self._select(self.rng.random() * total)
+        self.fire(reaction)
+        return reaction
+
+    def run(self, t_end=np.inf, max_events=None, sample_times=(), stats=None):
+        """
+        Simulate until `t_end`, until `max_events` more events have fired, or
+        until no reaction can fire.
+
+        Parameters
+        ----------
+        t_end : float
+            Final time; the event that would cross it is not fired (but the
+            time is set to `t_end`).
+        max_events : int, optional
+            Maximum number of events to fire.
+        sample_times : array-like of float
+            Increasing times at which to record the counts.
+        stats : ode_gen.stats.EnumerationStats, optional
+            Receives the counters ssa_events and ssa_propensity_updates and the
+            phase timing ssa.
+
+        Returns
+        -------
+        ndarray of shape (len(sample_times), n_species)
+            Counts at the sample times (the counts in force at each of them);
+            sample times beyond the end of the simulation get the final counts.
+        """
+        start = perf_counter()
+        sample_times = np.asarray(sample_times, dtype=float)
+        samples = np.empty((len(sample_times), len(self.counts)), dtype=np.int64)
+        next_sample = np.searchsorted(sample_times, self.time, side="left")
+        samples[:next_sample] = self.counts
+        first_event = self.n_events
+        n_updates = 0
+        rng = self.rng
+
+        while max_events is None or self.n_events - first_event < max_events:
+            total = self._tree[1]
+            if total <= 0.0:
+                break
+            t_next = self.time + rng.exponential(1.0 / total)
+            while next_sample < len(sample_times) and sample_times[next_sample] < min(t_next, t_end):
+                samples[next_sample] = self.counts
+                next_sample += 1
+            if t_next > t_end:
+                self.time = t_end
+                break
+            self.time = t_next
+            n_updates += self.fire(self._select(rng.random() * total))
+
+        samples[next_sample:] = self.counts
+        if stats is not None:
+            stats.count("ssa_events", self.n_events - first_event)
+            stats.count("ssa_propensity_updates", n_updates)
+            stats.add_time("ssa", perf_counter() - start)
+        return samples
@@ -3,8 +3,10 @@
 import networkx as nx
 from collections import defaultdict
 from itertools import combinations
-from networkx.algorithms.isomorphism import GraphMatcher
+from math import comb
+from time import perf_counter
 from ode_gen.complexes.subcomplexes import get_unique_fully_connected_subgraphs
+from ode_gen.reactions.records import Transformation
 
 # Match functions
 # We define that two graphs are isomorphic if there exists some one-on-one mapping
@@ -15,9 +17,19 @@ def node_match(n1, n2):
 def edge_match(e1, e2):
     return e1["type"] == e2["type"]
 
-def are_type_isomorphic(G1, G2):
-    gm = GraphMatcher(G1, G2, node_match=node_match, edge_match=edge_match)
-    return gm.is_isomorphic()
+def are_type_isomorphic(G1, G2, stats=None):
+    """
+    Same result as `GraphMatcher(G1, G2, node_match=node_match,
+    edge_match=edge_match).is_isomorphic()`, computed with
+    `ode_gen.complexes.isomorphism.is_typed_isomorphic`: graphs that differ in
+    their cached invariants are rejected without matching, and the matching
+    only tries nodes of equal refined color.
+    """
+    from ode_gen.complexes.isomorphism import is_typed_isomorphic
+
+    if stats is not None:
+        stats.count("isomorphism_calls")
+    return is_typed_isomorphic(G1, G2, stats)
 
 # Canonical relabeling that preserves type attributes
 def relabel_graph_by_type(G):
@@ -37,12 +49,15 @@ def relabel_graph_by_type(G):
     return G_relabel
 
 # Main transformation logic
-def is_transformable_by_forming_or_breaking_canonically(G1, G2):
+def is_transformable_by_forming_or_breaking_canonically(G1, G2, stats=None):
     # Relabel both graphs canonically by type
-    G1c = relabel_graph_by_type(G1)
-    G2c = relabel_graph_by_type(G2)
+    return _transformation_between(relabel_graph_by_type(G1), relabel_graph_by_type(G2), stats)
 
+def _transformation_between(G1c, G2c, stats=None):
+    """`is_transformable_by_forming_or_breaking_canonically` on graphs already relabeled by type."""
     if sorted([d["type"] for _, d in G1c.nodes(data=True)]) != sorted([d["type"] for _, d in G2c.nodes(data=True)]):
+        if stats is not None:
+            stats.count("composition_rejections")
         return False, None, None
 
     def edge_set(G):
@@ -57,7 +72,7 @@ def is_transformable_by_forming_or_breaking_canonically(G1, G2):
         G1_aug = G1c.copy()
         for u, v, t in edges_added:
             G1_aug.add_edge(u, v, type=t)
-        if are_type_isomorphic(G1_aug, G2c):
+        if are_type_isomorphic(G1_aug, G2c, stats):
             return True, "added", edges_added
 
     # Try G1 -> G2 by removing edges
@@ -67,33 +82,196 @@ def is_transformable_by_forming_or_breaking_canonically(G1, G2):
         for u, v, t in edges_removed:
             if G1_red.has_edge(u, v) and G1_red[u][v].get("type") == t:
                 G1_red.remove_edge(u, v)
-        if are_type_isomorphic(G1_red, G2c):
+        if are_type_isomorphic(G1_red, G2c, stats):
             return True, "removed", edges_removed
 
     return False, None, None
 
-def find_all_transformable_subgraph_pairs(G, subgraphs = None):
+def find_all_transformable_subgraph_pairs(G, subgraphs = None, stats = None, progress = None):
     """
     This function calls `molecule_gen.get_unique_fully_connected_subgraphs` to
     get all the subgraphs first and the use the function
     `is_transformable_by_forming_or_breaking_canonically` above to check 
     for the pairs.
+
+    The pairs are returned as `Transformation` records on the (shared) list of
+    subgraphs; they still unpack as (G1, G2, direction, edges).
+
+    An optional `ode_gen.stats.EnumerationStats` collects the counters
+    pairs_compared, composition_rejections, isomorphism_calls and
+    transformations, and the phase timing transformations.
+
+    `progress` is an optional callback receiving `ode_gen.progress.ProgressUpdate`
+    records over the C(m, 2) pairs of the m subgraphs (a single level, None).
     """
     # get all subgraphs if subgraphs is not given
     if subgraphs is None:
-        subgraphs = get_unique_fully_connected_subgraphs(G)
+        subgraphs = get_unique_fully_connected_subgraphs(G, stats=stats)
+    start = perf_counter()
+
+    tracker = None
+    if progress is not None:
+        from ode_gen.progress import ProgressTracker
+        tracker = ProgressTracker(progress, "transformations")
+        tracker.start_level(None, comb(len(subgraphs), 2))
 
     # iterate over all non-repeated unordered pairs of subgraphs and
     # get transformable pairs
     transformable_pairs = []
-    for G1, G2 in combinations(subgraphs, 2):
+    subgraphs = list(subgraphs)
+    # relabel every subgraph once, so its isomorphism invariants are cached across pairs
+    relabeled = [relabel_graph_by_type(H) for H in subgraphs]
+    for (i, G1), (j, G2) in combinations(enumerate(relabeled), 2):
+        if tracker is not None:
+            tracker.advance()
         is_transformable, direction, list_of_edges_changed =\
-            is_transformable_by_forming_or_breaking_canonically(G1, G2)
+            _transformation_between(G1, G2, stats)
         if is_transformable:
-            transformable_pairs.append((G1, G2, direction, list_of_edges_changed))
-    
+            transformable_pairs.append(Transformation(subgraphs, i, j, direction, list_of_edges_changed))
+
+    if stats is not None:
+        n = len(subgraphs)
+        stats.count("pairs_compared", n * (n - 1) // 2)
+        stats.count("transformations", len(transformable_pairs))
+        stats.add_time("transformations", perf_counter() - start)
+
     return transformable_pairs
 
+def _type_labels(H):
+    """Node labels of `relabel_graph_by_type` (type + running count per type) for the nodes of H."""
+    type_counts = defaultdict(int)
+    labels = {}
+    for n, t in H.nodes(data="type"):
+        labels[n] = f"{t}{type_counts[t]}"
+        type_counts[t] += 1
+    return labels
+
+def _is_bridge(u, v, mask, neighbor_masks):
+    """Whether removing the edge (u, v) disconnects the nodes of `mask` (given as a bitmask)."""
+    reached = frontier = 1 << u
+    while frontier:
+        low = frontier & -frontier
+        frontier ^= low
+        i = low.bit_length() - 1
+        neighbors = neighbor_masks[i] & mask
+        if i == u:
+            neighbors &= ~(1 << v)
+        elif i == v:
+            neighbors &= ~(1 << u)
+        new = neighbors & ~reached
+        reached |= new
+        frontier |= new
+    return not reached >> v & 1
+
+def find_cyclization_transformations(G, subgraphs=None, stats=None, progress=None):
+    """
+    Generate the ring-closing / ring-opening transformations between species
+    directly: for every species and every non-bridge edge, the species with
+    that bond broken (still connected, on the same nodes) is looked up by its
+    WL hash among the species. Bridges are found with bitmask reachability,
+    and the species and all their one-bond-broken forms are hashed in batches
+    with `ode_gen.complexes.wl.BatchedWL` on G (see `hash_edge_removals`), so
+    the cost is linear in species x edges instead of quadratic in the
+    number of species as for `find_all_transformable_subgraph_pairs`.
+
+    The subgraphs must be induced subgraphs of G, as returned by
+    `get_unique_fully_connected_subgraphs`. Each pair of species is reported
+    once, as a `Transformation` on the (shared) list of subgraphs with source
+    index < target index, like the pairs of
+    `find_all_transformable_subgraph_pairs`: 'removed' if the source is the
+    closed form, 'added' if it is the open one. The changed bond is given as
+    (u, v, type) with the type-relabeled node names (`relabel_graph_by_type`)
+    of the closed form. Broken bonds whose result is not in the list (e.g. not
+    an induced subgraph of G) give no transformation.
+
+    An optional `ode_gen.stats.EnumerationStats` collects the counters
+    non_bridge_edges, cyclization_hash_computations, missing_open_forms and
+    transformations, and the phase timing cyclizations. `progress` is an
+    optional callback receiving `ode_gen.progress.ProgressUpdate` records over
+    the species (a single level, None).
+    """
+    from ode_gen.complexes.wl import BatchedWL, WL_BATCH_SIZE
+
+    if subgraphs is None:
+        subgraphs = get_unique_fully_connected_subgraphs(G, stats=stats)
+    start = perf_counter()
+    subgraphs = list(subgraphs)
+
+    tracker = None
+    if progress is not None:
+        from ode_gen.progress import ProgressTracker
+        tracker = ProgressTracker(progress, "cyclizations")
+        tracker.start_level(None, len(subgraphs))
+
+    hasher = BatchedWL(G)
+    index = hasher.index
+    edges = list(G.edges(data="type"))
+    edge_ids = {}
+    neighbor_masks = [0] * len(index)
+    for e, (u, v, _) in enumerate(edges):
+        i, j = index[u], index[v]
+        edge_ids[i, j] = edge_ids[j, i] = e
+        neighbor_masks[i] |= 1 << j
+        neighbor_masks[j] |= 1 << i
+
+    subsets = [[index[node] for node in H] for H in subgraphs]
+    index_by_hash = {}
+    for first in range(0, len(subsets), WL_BATCH_SIZE):
+        for i, h in enumerate(hasher.hash_index_subsets(subsets[first:first + WL_BATCH_SIZE]), first):
+            index_by_hash.setdefault(h, i)
+
+    # (species, removed edge) rows for all non-bridge edges, hashed in batches
+    rows = []
+    for i, ids in enumerate(subsets):
+        mask = 0
+        for u in ids:
+            mask |= 1 << u
+        for u in ids:
+            later = neighbor_masks[u] & mask & ~((2 << u) - 1)
+            while later:
+                low = later & -later
+                later ^= low
+                v = low.bit_length() - 1
+                if not _is_bridge(u, v, mask, neighbor_masks):
+                    rows.append((i, edge_ids[u, v]))
+
+    transformations = []
+    seen = set()
+    n_missing = 0
+    labels = {}
+    done = 0
+    for first in range(0, len(rows), WL_BATCH_SIZE):
+        batch = rows[first:first + WL_BATCH_SIZE]
+        hashes = hasher.hash_edge_removals([e for _, e in batch], [subsets[i] for i, _ in batch])
+        for (i, e), h in zip(batch, hashes):
+            if tracker is not None and i >= done:
+                tracker.advance(i + 1 - done)
+                done = i + 1
+            j = index_by_hash.get(h)
+            if j is None:
+                n_missing += 1
+                continue
+            pair = (min(i, j), max(i, j))
+            if pair in seen:
+                continue
+            seen.add(pair)
+            if i not in labels:
+                labels[i] = _type_labels(subgraphs[i])
+            u, v, t = edges[e]
+            u, v = sorted((labels[i][u], labels[i][v]))
+            direction = "removed" if i < j else "added"
+            transformations.append(Transformation(subgraphs, pair[0], pair[1], direction, [(u, v, t)]))
+    if tracker is not None and done < len(subgraphs):
+        tracker.advance(len(subgraphs) - done)
+
+    if stats is not None:
+        stats.count("non_bridge_edges", len(rows))
+        stats.count("cyclization_hash_computations", len(rows) + len(subgraphs))
+        stats.count("missing_open_forms", n_missing)
+        stats.count("transformations", len(transformations))
+        stats.add_time("cyclizations", perf_counter() - start)
+    return transformations
+
 if __name__ == "__main__":
     # Example graph
     G = nx.Graph()
@@ -0,0 +1,57 @@
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from time import perf_counter
+
+class EnumerationStats:
+    """
+    Counters and per-phase durations recorded by the enumeration and reaction
+    functions when an instance is passed as their `stats=` argument.
+
+    Without a `stats` object the functions only keep a few local integer
+    counters, so instrumentation costs nothing unless requested. Instances are
+    picklable, and stats collected in pool workers are merged into the caller's
+    instance.
+
+    Examples
+    --------
+    >>> stats = EnumerationStats()
+    >>> species = get_unique_fully_connected_subgraphs(G, stats=stats)  # doctest: +SKIP
+    >>> stats.counters["hash_computations"], stats.timings["hashing"]  # doctest: +SKIP
+    """
+
+    def __init__(self):
+        self.counters = Counter()
+        self.timings = defaultdict(float)
+
+    def count(self, key, n=1):
+        """Increase a counter."""
+        self.counters[key] += n
+
+    def add_time(self, phase, seconds):
+        """Add a duration (in seconds) to a phase."""
+        self.timings[phase] += seconds
+
+    @contextmanager
+    def phase(self, name):
+        """Time the enclosed block as a phase."""
+        start = perf_counter()
+        try:
+            yield self
+        finally:
+            self.timings[name] += perf_counter() - start
+
+    def merge(self, other):
+        """Add the counters and durations of another instance (e.g. from a pool worker)."""
+        self.counters.update(other.counters)
+        for phase, seconds in other.timings.items():
+            self.timings[phase] += seconds
+        return self
+
+    def as_dict(self):
+        """Plain-dict view, e.g. for JSON reports."""
+        return {"counters": dict(self.counters), "timings": dict(self.timings)}
+
+    def __repr__(self):
+        counters = ", ".join(f"{k}={v}" for k, v in sorted(self.counters.items()))
+        timings = ", ".join(f"{k}={v:.4f}s" for k, v in sorted(self.timings.items()))
+        return f"EnumerationStats(counters: {counters}; timings: {timings})"
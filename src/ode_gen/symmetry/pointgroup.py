@@ -28,9 +28,21 @@ THE SOFTWARE.
 import numpy as np
 from ode_gen.symmetry import tensors
 from ode_gen.symmetry import utils
-from ode_gen.symmetry.rotations import Rotation, rotation_matrix
+from ode_gen.symmetry.rotations import (
+    rotation_matrix,
+    rotation_matrices,
+    get_group_operations,
+    get_rotation_axes,
+    orient_operations,
+)
 from ode_gen.symmetry.grid import get_cubed_sphere_grid_points
 
+# upper bound on the number of (operation, site, site) entries compared at once
+_CHECK_CHUNK_ENTRIES = 2 ** 21
+
+# number of grid axes tested per batch while scanning for spherical axes
+_SCAN_CHUNK_AXES = 256
+
 class PointGroup:
     """
     Point group main class. Note that we assume that center of mass is
@@ -49,6 +61,10 @@ class PointGroup:
         self._symbols = symbols
         self._cent_coord = np.array(positions)
 
+        # integer symbol labels of the sites, for batched comparisons
+        site_symbols = np.asarray(symbols)[:len(self._cent_coord)]
+        self._symbol_ids = np.unique(site_symbols, return_inverse=True)[1].ravel()
+
         self._ref_orientation = np.identity(3)
 
         # determine inertia tensor
@@ -61,6 +77,11 @@ class PointGroup:
         self._schoenflies_symbol = ''
         self._max_order = 1
 
+        # symmetry axes found during classification, kept in the current frame
+        self._main_axis = None
+        self._second_axis = None
+        self._proper_rotations = None
+
         eig_degeneracy = tensors.get_degeneracy(self._eigenvalues, self._tolerance_eig)
 
         # Linear groups
@@ -119,6 +140,32 @@ class PointGroup:
         """
         return self._rename_point_group(self._schoenflies_symbol)
 
+    def get_proper_rotations(self):
+        """
+        get all proper rotations of the configuration, including dihedral C2 axes
+        perpendicular to the main axis, and the permutation of sites each one induces
+
+        Candidate operations are checked in one batched comparison and the
+        matrices are refined from the matched sites, so they are exact for
+        exactly symmetric configurations. Linear configurations only report the
+        identity and, if present, a perpendicular C2.
+
+        :return: rotation matrices (K, 3, 3) in the frame of the standard coordinates
+                 and site permutations (K, N) with the identity first; operation k
+                 takes site i onto site permutations[k, i]
+        """
+        if self._proper_rotations is None:
+            self._proper_rotations = self._enumerate_proper_rotations()
+        return self._proper_rotations
+
+    def get_symmetry_number(self):
+        """
+        get the rotational symmetry number (order of the proper rotation subgroup)
+
+        :return: the rotational symmetry number
+        """
+        return len(self.get_proper_rotations()[0])
+
     def get_standard_coordinates(self):
         """
         get the coordinates centered in the center of mass and
@@ -151,6 +198,7 @@ class PointGroup:
         idx = np.argmin(self._eigenvalues)
         main_axis = self._eigenvectors[idx]
         p_axis = utils.get_perpendicular_vector(main_axis)
+        self._main_axis = main_axis
         self._set_orientation(main_axis, p_axis)
 
         # not considering reflection / inversion
@@ -160,13 +208,11 @@ class PointGroup:
 
         self._set_orientation(self._eigenvectors[2], self._eigenvectors[1])
 
-        n_axis_c2 = 0
-        main_axis = [1, 0, 0]
-        for axis in np.identity(3):
-            c2 = Rotation(axis, order=2)
-            if self._check_op(c2, tol_factor=0.0):
-                n_axis_c2 += 1
-                main_axis = axis
+        axes = np.identity(3)
+        found = self._check_ops(rotation_matrices(axes, np.pi), tol_factor=0.0)
+
+        n_axis_c2 = int(np.sum(found))
+        main_axis = axes[np.flatnonzero(found)[-1]] if n_axis_c2 else [1, 0, 0]
 
         self._max_order = 2
 
@@ -198,24 +244,27 @@ class PointGroup:
 
         main_axis = None
         while main_axis is None:
-            for axis in get_cubed_sphere_grid_points(self._tolerance_ang):
-                c5 = Rotation(axis, order=5)
-                c4 = Rotation(axis, order=4)
-                c3 = Rotation(axis, order=3)
-
-                if self._check_op(c5, tol_factor=utils.magic_formula(5)):
-                    self._schoenflies_symbol = "I"
-                    main_axis = axis
-                    self._max_order = 5
-                    break
-                elif self._check_op(c4, tol_factor=utils.magic_formula(4)):
-                    self._schoenflies_symbol = "O"
-                    main_axis = axis
-                    self._max_order = 4
+            # Scan the grid in batches: the first axis with a C5 or C4 decides
+            # the group, otherwise the last axis with a C3 gives T.
+            grid = np.array(list(get_cubed_sphere_grid_points(self._tolerance_ang)))
+            for start in range(0, len(grid), _SCAN_CHUNK_AXES):
+                axes = grid[start:start + _SCAN_CHUNK_AXES]
+                found = {order: self._check_ops(rotation_matrices(axes, 2 * np.pi / order),
+                                                tol_factor=utils.magic_formula(order))
+                         for order in (5, 4, 3)}
+
+                higher = np.flatnonzero(found[5] | found[4])
+                if len(higher) > 0:
+                    idx = higher[0]
+                    self._max_order = 5 if found[5][idx] else 4
+                    self._schoenflies_symbol = "I" if self._max_order == 5 else "O"
+                    main_axis = axes[idx]
                     break
-                elif self._check_op(c3, tol_factor=utils.magic_formula(3)):
+
+                c3 = np.flatnonzero(found[3])
+                if len(c3) > 0:
                     self._schoenflies_symbol = "T"
-                    main_axis = axis
+                    main_axis = axes[c3[-1]]
                     self._max_order = 3
 
             if main_axis is None:
@@ -223,6 +272,7 @@ class PointGroup:
                 self._tolerance_ang *= 1.01
 
         p_axis_base = utils.get_perpendicular_vector(main_axis)
+        self._main_axis = main_axis
 
         # I
         if self._schoenflies_symbol == 'I':
@@ -231,17 +281,13 @@ class PointGroup:
                 axis = np.dot(main_axis, r_matrix.T)
 
                 # set molecule orientation in I
-                for angle in np.arange(0, 2*np.pi / self._max_order+self._tolerance_ang, self._tolerance_ang):
-                    rot_matrix = rotation_matrix(main_axis, angle)
-
-                    c5_axis = np.dot(axis, rot_matrix.T)
-                    c5 = Rotation(c5_axis, order=5)
+                rot_matrix = self._scan_orientation(main_axis, axis, tol_factor=utils.magic_formula(5)*np.sqrt(2))
+                if rot_matrix is None:
+                    raise ValueError('Error orientation I group')
 
-                    if self._check_op(c5, tol_factor=utils.magic_formula(5)*np.sqrt(2)):
-                        t_axis = np.dot(main_axis, rotation_matrix(p_axis_base, np.pi/2).T)
-                        return np.dot(t_axis, rot_matrix.T)
-
-                raise ValueError('Error orientation I group')
+                self._second_axis = np.dot(axis, rot_matrix.T)
+                t_axis = np.dot(main_axis, rotation_matrix(p_axis_base, np.pi/2).T)
+                return np.dot(t_axis, rot_matrix.T)
 
             p_axis = determine_orientation_I(main_axis)
             self._set_orientation(main_axis, p_axis)
@@ -254,16 +300,12 @@ class PointGroup:
                 r_matrix = rotation_matrix(p_axis_base, np.pi/2)
                 axis = np.dot(main_axis, r_matrix.T)
 
-                for angle in np.arange(0, 2*np.pi / self._max_order+self._tolerance_ang, self._tolerance_ang):
-                    rot_matrix = rotation_matrix(main_axis, angle)
-
-                    c4_axis = np.dot(axis, rot_matrix.T)
-                    c4 = Rotation(c4_axis, order=4)
-
-                    if self._check_op(c4, tol_factor=utils.magic_formula(4)*np.sqrt(2)):
-                        return axis
+                rot_matrix = self._scan_orientation(main_axis, axis, tol_factor=utils.magic_formula(4)*np.sqrt(2))
+                if rot_matrix is None:
+                    raise ValueError('Error orientation O group')
 
-                raise ValueError('Error orientation O group')
+                self._second_axis = np.dot(axis, rot_matrix.T)
+                return axis
 
             p_axis = determine_orientation_O(main_axis)
             self._set_orientation(main_axis, p_axis)
@@ -276,17 +318,13 @@ class PointGroup:
                 r_matrix = rotation_matrix(p_axis_base, -np.arccos(-1/3))
                 axis = np.dot(main_axis, r_matrix.T)
 
-                for angle in np.arange(0, 2*np.pi / self._max_order + self._tolerance_ang, self._tolerance_ang):
-                    rot_matrix = rotation_matrix(main_axis, angle)
-
-                    c3_axis = np.dot(axis, rot_matrix.T)
-                    c3 = Rotation(c3_axis, order=3)
-
-                    if self._check_op(c3, tol_factor=utils.magic_formula(3)*np.sqrt(2)):
-                        t_axis = np.dot(main_axis, rotation_matrix(p_axis_base, np.pi/2).T)
-                        return np.dot(t_axis, rot_matrix.T)
+                rot_matrix = self._scan_orientation(main_axis, axis, tol_factor=utils.magic_formula(3)*np.sqrt(2))
+                if rot_matrix is None:
+                    raise ValueError('Error orientation T group')
 
-                raise ValueError('Error orientation T group')
+                self._second_axis = np.dot(axis, rot_matrix.T)
+                t_axis = np.dot(main_axis, rotation_matrix(p_axis_base, np.pi/2).T)
+                return np.dot(t_axis, rot_matrix.T)
             
             p_axis = determine_orientation_T(main_axis)
             self._set_orientation(main_axis, p_axis)
@@ -297,8 +335,124 @@ class PointGroup:
 
     def _cyclic(self, main_axis):
         self._schoenflies_symbol = "C{}".format(self._max_order)
+        self._main_axis = np.array(main_axis, dtype=float)
         return
 
+    def _enumerate_proper_rotations(self):
+        """
+        enumerate the proper rotations of the configuration
+
+        :return: rotation matrices (K, 3, 3) and site permutations (K, N)
+        """
+        n_sites = len(self._cent_coord)
+        refine = True
+
+        if self._schoenflies_symbol == 'Cinfv':
+            # rotations about the axis are continuous, only a perpendicular C2 is discrete
+            p_axis = utils.get_perpendicular_vector(self._main_axis)
+            candidates = np.concatenate([np.identity(3)[None], rotation_matrices(p_axis, np.pi)[None]])
+            refine = False
+        elif self._schoenflies_symbol in ('T', 'O', 'I'):
+            candidates = self._get_spherical_candidates()
+        elif self._main_axis is None:
+            candidates = np.identity(3)[None]
+        else:
+            candidates = np.concatenate([np.identity(3)[None], self._get_axial_candidates()])
+
+        found, permutations = self._match_ops(candidates)
+
+        # keep operations that permute the sites, once per permutation
+        bijective = np.all(np.sort(permutations, axis=1) == np.arange(n_sites), axis=1)
+        _, first = np.unique(permutations[found & bijective], axis=0, return_index=True)
+        keep = np.flatnonzero(found & bijective)[np.sort(first)]
+
+        matrices = candidates[keep]
+        permutations = permutations[keep]
+        if refine and len(keep) > 0:
+            matrices = utils.kabsch_rotations(self._cent_coord, self._cent_coord[permutations])
+
+        return matrices, permutations
+
+    def _get_axial_candidates(self):
+        """
+        candidate rotations of axial groups: the powers of the main rotation and
+        C2 axes perpendicular to the main axis
+
+        :return: candidate matrices, shape (K, 3, 3)
+        """
+        main_axis = self._main_axis / np.linalg.norm(self._main_axis)
+        steps = np.arange(1, max(self._max_order, 1))
+        powers = rotation_matrices(main_axis, 2 * np.pi * steps / max(self._max_order, 1))
+
+        # a C2 perpendicular to the main axis takes site i onto a site j with
+        # r_i + r_j along the C2 axis; when r_j = -r_i the axis is instead
+        # perpendicular to both r_i and the main axis
+        i, j = np.triu_indices(len(self._cent_coord))
+        same = self._symbol_ids[i] == self._symbol_ids[j]
+        sums = np.concatenate([
+            self._cent_coord[i[same]] + self._cent_coord[j[same]],
+            np.cross(main_axis, self._cent_coord),
+        ])
+        sums -= np.outer(np.dot(sums, main_axis), main_axis)
+
+        norms = np.linalg.norm(sums, axis=1)
+        scale = np.max(np.linalg.norm(self._cent_coord, axis=1), initial=0.0)
+        axes = sums[norms > 1e-6 * max(scale, 1.0)]
+        axes = axes / np.linalg.norm(axes, axis=1)[:, None]
+
+        # an axis and its opposite give the same C2
+        flip = np.take_along_axis(axes, np.argmax(np.abs(axes) > 1e-6, axis=1)[:, None], axis=1) < 0
+        axes = np.where(flip, -axes, axes)
+        axes = np.unique(np.round(axes, 6), axis=0)
+
+        if len(axes) == 0:
+            return powers
+        return np.concatenate([powers, rotation_matrices(axes, np.pi)])
+
+    def _get_spherical_candidates(self):
+        """
+        candidate rotations of spherical groups: the precomputed operation table
+        of the group, oriented along the refined main and second axes
+
+        :return: candidate matrices, shape (K, 3, 3)
+        """
+        order = self._max_order
+        tol_factor = utils.magic_formula(order)
+        main_axis = self._refine_axis(self._main_axis, order, tol_factor)
+        second_axis = self._refine_axis(self._second_axis, order, tol_factor * np.sqrt(2))
+
+        operations = get_group_operations(self._schoenflies_symbol)
+        reference_axes = get_rotation_axes(operations, order)
+        reference_main = reference_axes[0]
+
+        # pair the second axis with a reference axis at the same angle from the main one
+        cos_reference = np.dot(reference_axes, reference_main)
+        cos_target = np.dot(main_axis, second_axis)
+        candidates = np.flatnonzero(np.abs(cos_reference) < 1 - 1e-6)
+        reference_second = reference_axes[candidates[np.argmin(np.abs(cos_reference[candidates] - cos_target))]]
+
+        return orient_operations(operations, (reference_main, reference_second), (main_axis, second_axis))
+
+    def _refine_axis(self, axis, order, tol_factor):
+        """
+        refine an approximate rotation axis from the sites its rotation exchanges
+
+        :param axis: approximate axis
+        :param order: rotation order (≥ 3)
+        :param tol_factor: tolerance factor used to match the sites
+        :return: refined unit axis, or the normalized input if no match is found
+        """
+        axis = np.asarray(axis, dtype=float) / np.linalg.norm(axis)
+        found, permutations = self._match_ops(rotation_matrices(axis, 2 * np.pi / order)[None], tol_factor)
+        if not found[0] or len(set(permutations[0])) != len(permutations[0]):
+            return axis
+
+        rotation = utils.kabsch_rotations(self._cent_coord, self._cent_coord[permutations[0]])
+        refined = get_rotation_axes(rotation[None], order, tol=1e-2)
+        if len(refined) == 0:
+            return axis
+        return refined[0] if np.dot(refined[0], axis) > 0 else -refined[0]
+
     def _get_axis_rot_order(self, axis, n_max):
         """
         Get rotation order for a given axis
@@ -315,11 +469,34 @@ class PointGroup:
 
         n_max = np.min([max_rotation_order(self._tolerance_ang), n_max])
 
-        for i in range(n_max, 1, -1):
-            Cn = Rotation(axis, order=i)
-            if self._check_op(Cn):
-                return i
-        return 1
+        orders = np.arange(n_max, 1, -1)
+        if len(orders) == 0:
+            return 1
+
+        found = self._check_ops(rotation_matrices(axis, 2 * np.pi / orders))
+        if not np.any(found):
+            return 1
+        return int(orders[np.argmax(found)])
+
+    def _scan_orientation(self, main_axis, axis, tol_factor):
+        """
+        rotate axis about main_axis in steps of the angular tolerance and find the
+        first angle at which axis carries a rotation of order self._max_order
+
+        :param main_axis: axis to rotate about
+        :param axis: axis to be rotated
+        :param tol_factor: tolerance factor of the check
+        :return: rotation matrix about main_axis of the first match, or None
+        """
+        angles = np.arange(0, 2*np.pi / self._max_order + self._tolerance_ang, self._tolerance_ang)
+        rot_matrices = rotation_matrices(main_axis, angles)
+
+        scan_axes = np.einsum('kij,j->ki', rot_matrices, axis)
+        found = self._check_ops(rotation_matrices(scan_axes, 2 * np.pi / self._max_order), tol_factor=tol_factor)
+
+        if not np.any(found):
+            return None
+        return rot_matrices[np.argmax(found)]
 
     def _check_op(self, operation, print_data=False, tol_factor=1.0):
         """
@@ -328,34 +505,59 @@ class PointGroup:
         :param operation: operation orbject
         :return: True or False
         """
-        sym_matrix = operation.get_matrix()
+        found = bool(self._check_ops(operation.get_matrix()[None], tol_factor=tol_factor)[0])
+
+        if print_data and found:
+            print('Found!')
+        return found
+
+    def _check_ops(self, sym_matrices, tol_factor=1.0):
+        """
+        check which operations of a stack exist, in one batched comparison
+
+        :param sym_matrices: operation matrices, shape (K, 3, 3)
+        :param tol_factor: scaling factor of the angular tolerance
+        :return: boolean array of shape (K,)
+        """
+        return self._match_ops(sym_matrices, tol_factor=tol_factor)[0]
+
+    def _match_ops(self, sym_matrices, tol_factor=1.0):
+        """
+        match every transformed site to an equivalent site for a stack of operations
+
+        A transformed site matches a site of the same symbol when both its
+        angular and relative radial deviation are below the total tolerance.
+
+        :param sym_matrices: operation matrices, shape (K, 3, 3)
+        :param tol_factor: scaling factor of the angular tolerance
+        :return: boolean array (K,) of existing operations and integer array (K, N)
+                 with the closest matching site of each transformed site (-1 if none)
+        """
+        sym_matrices = np.asarray(sym_matrices, dtype=float)
+        n_sites = len(self._cent_coord)
+
         error_abs_rad = utils.absolute_error_to_angle(self._tolerance_eig, points=self._cent_coord)
+        tolerance_total = self._tolerance_ang * tol_factor + error_abs_rad
+        same_symbol = self._symbol_ids[:, None] == self._symbol_ids[None, :]
 
-        op_coordinates = np.dot(self._cent_coord, sym_matrix.T)
-        for idx, op_coord in enumerate(op_coordinates):
+        found = np.zeros(len(sym_matrices), dtype=bool)
+        permutations = np.full((len(sym_matrices), n_sites), -1, dtype=int)
 
-            difference_rad = utils.normalized_radius_difference(op_coord, self._cent_coord, self._tolerance_eig)
-            difference_ang = utils.angles_between_vector_and_vectors(op_coord, self._cent_coord, self._tolerance_eig)
+        chunk = max(1, _CHECK_CHUNK_ENTRIES // max(1, n_sites * n_sites))
+        for start in range(0, len(sym_matrices), chunk):
+            op_coordinates = np.matmul(self._cent_coord, np.swapaxes(sym_matrices[start:start + chunk], -1, -2))
 
-            def check_diff(diff, diff2):
-                for idx_2, (d1, d2) in enumerate(zip(diff, diff2)):
-                    if self._symbols[idx_2] != self._symbols[idx]:
-                        continue
-                    # d_r = np.linalg.norm([d1, d2])
-                    tolerance_total = self._tolerance_ang * tol_factor + error_abs_rad[idx_2]
-                    if d1 < tolerance_total and d2 < tolerance_total:
-                        return True
-                return False
+            difference_ang = utils.pairwise_angles(op_coordinates, self._cent_coord, self._tolerance_eig)
+            difference_rad = utils.pairwise_radius_difference(op_coordinates, self._cent_coord, self._tolerance_eig)
 
-            if not check_diff(difference_ang, difference_rad):
-                return False
+            match = (difference_ang < tolerance_total) & (difference_rad < tolerance_total) & same_symbol
+            matched = match.any(axis=-1)
 
-            if print_data:
-                print('Continue', idx)
+            score = np.where(match, difference_ang + difference_rad, np.inf)
+            permutations[start:start + chunk] = np.where(matched, np.argmin(score, axis=-1), -1)
+            found[start:start + chunk] = matched.all(axis=-1)
 
-        if print_data:
-            print('Found!')
-        return True
+        return found, permutations
 
     def _set_orientation(self, main_axis, p_axis):
         """
@@ -372,3 +574,9 @@ class PointGroup:
         orientation = np.array([main_axis, p_axis, np.cross(main_axis, p_axis)])
         self._cent_coord = np.dot(self._cent_coord, orientation.T)
         self._ref_orientation = np.dot(self._ref_orientation, orientation.T)
+
+        # keep the axes found so far in the new frame
+        if self._main_axis is not None:
+            self._main_axis = np.dot(orientation, self._main_axis)
+        if self._second_axis is not None:
+            self._second_axis = np.dot(orientation, self._second_axis)
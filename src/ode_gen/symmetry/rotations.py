@@ -25,8 +25,89 @@ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 THE SOFTWARE.
 """
+from functools import lru_cache
 import numpy as np
 
+def rotation_matrices(axes, angles, tol = 1e-8):
+    """
+    Compute a stack of 3D rotation matrices with Rodrigues' formula.
+
+        R = cos(θ) I + sin(θ) [u]ₓ + (1 - cos(θ)) u ⊗ u
+
+    Axes and angles are broadcast against each other, so K matrices can be
+    built at once from K axes and one angle, one axis and K angles, or K of each.
+
+    Parameters
+    ----------
+    axes : array-like of shape (..., 3)
+        Axes of rotation (will be normalized).
+    angles : float or array-like of shape (...)
+        Angles in radians.
+    tol : float
+        Threshold for nonzero checking of the vectors.
+
+    Returns
+    -------
+    ndarray of shape (..., 3, 3)
+        Rotation matrices.
+
+    Examples
+    --------
+    >>> rotation_matrices([0, 0, 1], np.pi / 2 * np.arange(4)).shape
+    (4, 3, 3)
+    """
+    axes = np.asarray(axes, dtype=float)
+    angles = np.asarray(angles, dtype=float)
+
+    norms = np.linalg.norm(axes, axis=-1)
+    assert np.all(norms > tol), "Axis must be a non-zero vector"
+
+    shape = np.broadcast_shapes(axes.shape[:-1], angles.shape)
+    u = np.broadcast_to(axes / norms[..., None], shape + (3,))
+    angles = np.broadcast_to(angles, shape)
+
+    cos_theta = np.cos(angles)[..., None, None]
+    sin_theta = np.sin(angles)[..., None, None]
+
+    x, y, z = u[..., 0], u[..., 1], u[..., 2]
+    zero = np.zeros(shape)
+    cross_matrix = np.stack([
+        np.stack([zero, -z, y], axis=-1),
+        np.stack([z, zero, -x], axis=-1),
+        np.stack([-y, x, zero], axis=-1),
+    ], axis=-2)
+
+    outer = u[..., :, None] * u[..., None, :]
+    return cos_theta * np.identity(3) + sin_theta * cross_matrix + (1 - cos_theta) * outer
+
+def improper_rotation_matrices(axes, angles, tol = 1e-8):
+    """
+    Compute a stack of improper rotation matrices (rotation followed by
+    reflection through the plane perpendicular to the axis).
+
+    Parameters
+    ----------
+    axes : array-like of shape (..., 3)
+        Axes of improper rotation (will be normalized).
+    angles : float or array-like of shape (...)
+        Angles in radians.
+    tol : float
+        Threshold for nonzero checking of the vectors.
+
+    Returns
+    -------
+    ndarray of shape (..., 3, 3)
+        Improper rotation matrices.
+    """
+    axes = np.asarray(axes, dtype=float)
+    rot_matrices = rotation_matrices(axes, angles, tol)
+
+    u = axes / np.linalg.norm(axes, axis=-1)[..., None]
+    refl_matrices = np.identity(3) - 2 * u[..., :, None] * u[..., None, :]
+
+    # reflection matrices are symmetric, so R · Sᵀ = R · S
+    return np.matmul(rot_matrices, refl_matrices)
+
 def rotation_matrix(axis, angle, tol = 1e-8):
     """
     Compute the 3D rotation matrix for a rotation around a given axis by a specified angle.
@@ -39,70 +120,213 @@ def rotation_matrix(axis, angle, tol = 1e-8):
     Returns:
     - 3x3 numpy array representing the rotation matrix
     """
-    axis = np.array(axis)
-    norm = np.linalg.norm(axis)
-    assert norm > tol, "Axis must be a non-zero vector"
-
-    axis = axis / norm  # Normalize the axis
-
-    cos_theta = np.cos(angle)
-    sin_theta = np.sin(angle)
-    one_minus_cos = 1 - cos_theta
-
-    x, y, z = axis
-
-    # Rodrigues' rotation formula
-    rot_matrix = np.array([
-        [x*x*one_minus_cos + cos_theta,     x*y*one_minus_cos - z*sin_theta, x*z*one_minus_cos + y*sin_theta],
-        [y*x*one_minus_cos + z*sin_theta,   y*y*one_minus_cos + cos_theta,   y*z*one_minus_cos - x*sin_theta],
-        [z*x*one_minus_cos - y*sin_theta,   z*y*one_minus_cos + x*sin_theta, z*z*one_minus_cos + cos_theta]
-    ])
-
-    return rot_matrix
+    return rotation_matrices(axis, angle, tol)
 
 class Rotation:
     """
     Represents a proper rotation (Cn) about a given axis.
 
+    The matrix is computed on first use and cached.
+
     Parameters:
     - axis: array-like, axis of rotation (will be normalized)
     - order: int, rotation order (n-fold symmetry → angle = 2π / n)
     """
+    __slots__ = ("_axis", "_order", "_matrix")
+
     def __init__(self, axis, order=1):
         self._axis = np.array(axis)
         self._order = order
+        self._matrix = None
 
     def get_matrix(self):
         """
         Return the rotation matrix corresponding to a rotation of 2π / order about the axis.
         """
-        angle = 2 * np.pi / self._order
-        return rotation_matrix(self._axis, angle)
+        if self._matrix is None:
+            angle = 2 * np.pi / self._order
+            self._matrix = rotation_matrix(self._axis, angle)
+        return self._matrix
 
 
 class ImproperRotation:
     """
     Represents an improper rotation (Sn), a combination of a proper rotation and a reflection.
 
+    The matrix is computed on first use and cached.
+
     Parameters:
     - axis: array-like, axis of improper rotation (will be normalized)
     - order: int, rotation order (n-fold → rotation of 2π / n followed by reflection)
     """
+    __slots__ = ("_axis", "_order", "_matrix")
+
     def __init__(self, axis, order=1):
         self._axis = np.array(axis)
         self._order = order
+        self._matrix = None
 
     def get_matrix(self):
         """
         Return the matrix representing the improper rotation: rotation followed by reflection.
         """
-        # Rotation matrix (Cn)
-        angle = 2 * np.pi / self._order
-        rot_matrix = rotation_matrix(self._axis, angle)
+        if self._matrix is None:
+            angle = 2 * np.pi / self._order
+            self._matrix = improper_rotation_matrices(self._axis, angle)
+        return self._matrix
+
+################################
+# Precomputed spherical groups
+################################
+
+_GOLDEN_RATIO = (1 + np.sqrt(5)) / 2
 
-        # Reflection matrix through a plane perpendicular to the axis
-        u = self._axis
-        refl_matrix = np.identity(3) - 2 * np.outer(u, u) / np.dot(u, u)
+# Generators in the reference orientation: C2 (T, I) or C4 (O) axes along
+# x, y and z, C3 axes along the body diagonals and, for I, a C5 axis
+# through the icosahedron vertex (0, 1, φ).
+_SPHERICAL_GENERATORS = {
+    "T": [([0, 0, 1], 2), ([1, 1, 1], 3)],
+    "O": [([0, 0, 1], 4), ([1, 1, 1], 3)],
+    "I": [([0, 1, _GOLDEN_RATIO], 5), ([1, 1, 1], 3)],
+}
 
-        # Improper rotation = rotation followed by reflection
-        return np.dot(rot_matrix, refl_matrix.T)
+_SPHERICAL_ORDERS = {"T": 12, "O": 24, "I": 60}
+
+def _generate_group(generators, decimals=6):
+    """
+    Close a set of generator matrices under multiplication.
+
+    Parameters
+    ----------
+    generators : list of ndarray of shape (3, 3)
+        Generator matrices.
+    decimals : int
+        Rounding used to identify equal matrices.
+
+    Returns
+    -------
+    ndarray of shape (K, 3, 3)
+        All group elements, starting with the identity.
+    """
+    def key(matrix):
+        return tuple(np.round(matrix, decimals).ravel())
+
+    elements = [np.identity(3)]
+    seen = {key(elements[0])}
+    frontier = list(elements)
+    while frontier:
+        new_elements = []
+        for element in frontier:
+            for generator in generators:
+                product = np.dot(generator, element)
+                k = key(product)
+                if k not in seen:
+                    seen.add(k)
+                    new_elements.append(product)
+        elements.extend(new_elements)
+        frontier = new_elements
+
+    return np.array(elements)
+
+@lru_cache(maxsize=None)
+def get_group_operations(symbol):
+    """
+    Return all proper rotations of a spherical point group (T, O or I) in its
+    reference orientation.
+
+    The tables are generated once and cached, so verifying a whole group is a
+    single batched check of the returned stack (see `orient_operations` to
+    move them into the frame of a configuration).
+
+    Parameters
+    ----------
+    symbol : str
+        Schoenflies symbol, one of 'T', 'O' or 'I'.
+
+    Returns
+    -------
+    ndarray of shape (K, 3, 3)
+        Read-only stack of rotation matrices, K = 12, 24 or 60. The identity is first.
+
+    Examples
+    --------
+    >>> get_group_operations('O').shape
+    (24, 3, 3)
+    """
+    try:
+        generators = _SPHERICAL_GENERATORS[symbol]
+    except KeyError:
+        raise ValueError(f"Unknown spherical group: {symbol}. Available: {list(_SPHERICAL_GENERATORS)}")
+
+    operations = _generate_group([rotation_matrix(axis, 2 * np.pi / order) for axis, order in generators])
+    assert len(operations) == _SPHERICAL_ORDERS[symbol], "Group closure failed"
+
+    operations.setflags(write=False)
+    return operations
+
+def get_rotation_axes(matrices, order, tol=1e-6):
+    """
+    Return the unit axes of the matrices in a stack that are rotations by 2π / order.
+
+    The sense of the axis follows the right-hand rule, so a rotation and its
+    inverse give opposite axes.
+
+    Parameters
+    ----------
+    matrices : ndarray of shape (K, 3, 3)
+        Proper rotation matrices.
+    order : int
+        Rotation order (≥ 3, where the axis follows from the antisymmetric part).
+    tol : float
+        Tolerance on the cosine of the rotation angle.
+
+    Returns
+    -------
+    ndarray of shape (M, 3)
+        Unit rotation axes.
+    """
+    assert order >= 3, "Axes of C2 rotations are not defined by the antisymmetric part"
+
+    matrices = np.asarray(matrices)
+    cos_theta = (np.trace(matrices, axis1=-2, axis2=-1) - 1) / 2
+    selected = matrices[np.abs(cos_theta - np.cos(2 * np.pi / order)) < tol]
+
+    axes = np.stack([
+        selected[:, 2, 1] - selected[:, 1, 2],
+        selected[:, 0, 2] - selected[:, 2, 0],
+        selected[:, 1, 0] - selected[:, 0, 1],
+    ], axis=-1)
+    return axes / np.linalg.norm(axes, axis=-1)[:, None]
+
+def _frame(main_axis, p_axis):
+    """Orthonormal frame (as columns) spanned by main_axis and p_axis."""
+    e1 = main_axis / np.linalg.norm(main_axis)
+    e2 = p_axis - np.dot(p_axis, e1) * e1
+    e2 = e2 / np.linalg.norm(e2)
+    return np.array([e1, e2, np.cross(e1, e2)]).T
+
+def orient_operations(operations, reference_axes, target_axes):
+    """
+    Move a stack of operations into another frame by conjugation, R · G · Rᵀ.
+
+    R is the rotation that takes the first reference axis onto the first target
+    axis and the plane of both reference axes onto the plane of both target axes.
+
+    Parameters
+    ----------
+    operations : ndarray of shape (K, 3, 3)
+        Operation matrices in the reference frame.
+    reference_axes : tuple of two array-like of shape (3,)
+        Non-parallel axes in the reference frame.
+    target_axes : tuple of two array-like of shape (3,)
+        The corresponding axes in the target frame.
+
+    Returns
+    -------
+    ndarray of shape (K, 3, 3)
+        Operation matrices in the target frame.
+    """
+    reference = _frame(*np.asarray(reference_axes, dtype=float))
+    target = _frame(*np.asarray(target_axes, dtype=float))
+    rotation = np.dot(target, reference.T)
+    return np.matmul(np.matmul(rotation, operations), rotation.T)
@@ -0,0 +1,150 @@
+import numpy as np
+from ode_gen.complexes.wl import wl_hash
+from ode_gen.symmetry.pointgroup import PointGroup
+
+def set_node_positions(G, positions, position_attr="pos"):
+    """
+    Attach 3D binding-site coordinates to the nodes of an assembly graph.
+
+    Parameters
+    ----------
+    G : networkx.Graph
+        Assembly graph, modified in place.
+    positions : dict
+        Mapping node -> array-like of shape (3,).
+    position_attr : str
+        Node attribute that stores the coordinates.
+
+    Returns
+    -------
+    networkx.Graph
+        The same graph, for chaining.
+    """
+    for node, pos in positions.items():
+        pos = tuple(float(x) for x in pos)
+        if len(pos) != 3:
+            raise ValueError(f"Position of node {node} must have 3 coordinates, got {len(pos)}.")
+        G.nodes[node][position_attr] = pos
+    return G
+
+def get_species_coordinates(H, position_attr="pos"):
+    """
+    Return the binding-site coordinates of a species centered at their centroid,
+    together with the node types used as site symbols.
+
+    Parameters
+    ----------
+    H : networkx.Graph
+        Species graph (e.g. a subgraph view of the assembly).
+    position_attr : str
+        Node attribute that stores the coordinates.
+
+    Returns
+    -------
+    tuple of (ndarray of shape (N, 3), list of str), or None
+        Centered coordinates and symbols in node order, or None if any node
+        has no position.
+    """
+    positions = []
+    symbols = []
+    for _, data in H.nodes(data=True):
+        pos = data.get(position_attr)
+        if pos is None:
+            return None
+        positions.append(pos)
+        symbols.append(data.get("type"))
+
+    coords = np.array(positions, dtype=float).reshape(-1, 3)
+    return coords - coords.mean(axis=0), symbols
+
+class SpeciesSymmetry:
+    """
+    Point groups of enumerated species, computed lazily and memoized by the
+    128-bit typed WL hash of each species (`ode_gen.complexes.wl.wl_hash`),
+    the identity under which `get_unique_fully_connected_subgraphs` and
+    `find_all_dimer_reactions` deduplicate species.
+
+    Species that map to the same hash (e.g. the many subsets of an assembly
+    that give the same subcomplex) are classified only once.
+
+    Parameters
+    ----------
+    position_attr : str
+        Node attribute that stores the 3D binding-site coordinates.
+    **pointgroup_kwargs
+        Tolerances passed on to `PointGroup`.
+
+    Examples
+    --------
+    >>> symmetry = SpeciesSymmetry()
+    >>> for H, pg in symmetry.point_groups(species):  # doctest: +SKIP
+    ...     print(list(H.nodes), pg.get_point_group(), pg.get_symmetry_number())
+    """
+
+    def __init__(self, position_attr="pos", **pointgroup_kwargs):
+        self._position_attr = position_attr
+        self._pointgroup_kwargs = pointgroup_kwargs
+        self._cache = {}
+        self.n_lookups = 0
+
+    def __len__(self):
+        return len(self._cache)
+
+    @property
+    def n_classified(self):
+        """Number of point groups actually computed."""
+        return len(self._cache)
+
+    def point_group(self, H, species_hash=None):
+        """
+        Get the point group of a species.
+
+        Parameters
+        ----------
+        H : networkx.Graph
+            Species graph whose nodes carry positions.
+        species_hash : int, optional
+            `wl_hash` of H (equal to its `BatchedWL` hash in the parent
+            assembly), if already known.
+
+        Returns
+        -------
+        PointGroup or None
+            The point group, or None if the species has no coordinates.
+        """
+        if species_hash is None:
+            species_hash = wl_hash(H)
+
+        self.n_lookups += 1
+        if species_hash not in self._cache:
+            site_data = get_species_coordinates(H, self._position_attr)
+            if site_data is None:
+                self._cache[species_hash] = None
+            else:
+                coords, symbols = site_data
+                self._cache[species_hash] = PointGroup(coords, symbols, **self._pointgroup_kwargs)
+
+        return self._cache[species_hash]
+
+    def point_groups(self, species):
+        """
+        Lazily classify a stream of species.
+
+        Parameters
+        ----------
+        species : iterable of networkx.Graph
+            Species graphs, e.g. from `get_unique_fully_connected_subgraphs`.
+
+        Yields
+        ------
+        tuple of (networkx.Graph, PointGroup or None)
+        """
+        for H in species:
+            yield H, self.point_group(H)
+
+    def symmetry_number(self, H, species_hash=None):
+        """
+        Get the rotational symmetry number of a species (1 without coordinates).
+        """
+        pg = self.point_group(H, species_hash)
+        return 1 if pg is None else pg.get_symmetry_number()
@@ -46,28 +46,37 @@ def get_inertia_tensor(coords, tol = 1e-12):
     distributed relative to an origin—typically the center of mass.
     Its eigenvalues and eigenvectors reveal rotational properties
     that are tightly linked to the object's symmetry group.
+
+    The sum is evaluated as a single array contraction, and any number of
+    leading batch dimensions is supported, so the tensors of many
+    configurations can be computed in one call. Configurations with fewer
+    sites can be padded with rows of zeros, which do not contribute.
     
     Parameters
     ----------
-    coords : ndarray of shape (N, 3)
+    coords : ndarray of shape (..., N, 3)
         Cartesian coordinates of the points (atoms), assumed centered at origin.
 
     Returns
     -------
-    inertia_tensor : ndarray of shape (3, 3)
+    inertia_tensor : ndarray of shape (..., 3, 3)
         Normalized inertia tensor (unitless, assumes equal mass per atom).
+
+    Examples
+    --------
+    >>> get_inertia_tensor(np.zeros((5, 4, 3))).shape
+    (5, 3, 3)
     """
-    coords = np.asarray(coords)
-    inertia_tensor = np.zeros((3, 3))
-    total_inertia = 0.0
+    coords = np.asarray(coords, dtype=float)
+
+    outer = np.einsum('...ni,...nj->...ij', coords, coords)
+    total_inertia = np.trace(outer, axis1=-2, axis2=-1)
 
-    for c in coords:
-        r2 = np.dot(c, c)
-        inertia_tensor += np.identity(3) * r2 - np.outer(c, c)
-        total_inertia += r2
+    inertia_tensor = total_inertia[..., None, None] * np.identity(3) - outer
 
-    if abs(total_inertia) > tol:
-        inertia_tensor /= total_inertia
+    # only normalize configurations with a non-vanishing total inertia
+    norm = np.where(np.abs(total_inertia) > tol, total_inertia, 1.0)
+    inertia_tensor /= norm[..., None, None]
 
     return inertia_tensor
 
@@ -76,13 +85,15 @@ def get_degeneracy(eigenvalues, tolerance=0.1):
     Estimate the degeneracy of eigenvalues within a specified tolerance.
 
     Degeneracy refers to the number of times the same (or nearly the same) eigenvalue appears.
-    This function scans through the list of eigenvalues and returns the maximum count of
-    eigenvalues that are equal within the given numerical tolerance.
+    This function compares all eigenvalues pairwise and returns, for the first eigenvalue
+    that has a close partner, the count of eigenvalues that are equal to it within the
+    given numerical tolerance.
 
     Parameters
     ----------
-    eigenvalues : list or array-like of float
+    eigenvalues : array-like of float, shape (..., k)
         A sequence of eigenvalues (typically from an inertia tensor or other symmetric matrix).
+        Leading dimensions are treated as a batch.
     
     tolerance : float, optional
         Numerical tolerance used to determine whether two eigenvalues are considered equal.
@@ -90,9 +101,10 @@ def get_degeneracy(eigenvalues, tolerance=0.1):
 
     Returns
     -------
-    int
+    int or ndarray of int
         The estimated degeneracy (i.e., how many eigenvalues are approximately equal).
         Returns 1 if no two eigenvalues are close enough to be considered degenerate.
+        For batched input an integer array of shape (...) is returned.
     
     Examples
     --------
@@ -101,12 +113,20 @@ def get_degeneracy(eigenvalues, tolerance=0.1):
 
     >>> get_degeneracy([1.0, 1.2, 1.4], tolerance=0.01)
     1
+
+    >>> get_degeneracy([[1.0, 1.0, 1.0], [1.0, 2.0, 3.0]])
+    array([3, 1])
     """
-    for ev1 in eigenvalues:
-        single_deg = 0
-        for ev2 in eigenvalues:
-            if abs(ev1 - ev2) < tolerance:
-                single_deg += 1
-        if single_deg > 1:
-            return single_deg
-    return 1
+    eigenvalues = np.asarray(eigenvalues, dtype=float)
+
+    close = np.abs(eigenvalues[..., :, None] - eigenvalues[..., None, :]) < tolerance
+    counts = close.sum(axis=-1)
+
+    degenerate = counts > 1
+    first = np.argmax(degenerate, axis=-1)
+    first_count = np.take_along_axis(counts, first[..., None], axis=-1)[..., 0]
+    degeneracy = np.where(degenerate.any(axis=-1), first_count, 1)
+
+    if degeneracy.ndim == 0:
+        return int(degeneracy)
+    return degeneracy
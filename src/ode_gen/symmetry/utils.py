@@ -208,17 +208,18 @@ def get_non_degenerated(eigenvalues, tolerance=0.1):
 
     Parameters
     ----------
-    eigenvalues : list or array-like of float
+    eigenvalues : array-like of float, shape (..., k)
         A list or array of eigenvalues (typically of an inertia tensor).
-        Expected to contain exactly 3 values.
+        Expected to contain exactly 3 values. Leading dimensions are treated as a batch.
 
     tolerance : float, optional
         Numerical tolerance for considering two eigenvalues as equal (degenerate). Default is 0.1.
 
     Returns
     -------
-    int
+    int or ndarray of int
         The index of the non-degenerate eigenvalue in the input list.
+        For batched input an integer array of shape (...) is returned.
 
     Raises
     ------
@@ -231,16 +232,115 @@ def get_non_degenerated(eigenvalues, tolerance=0.1):
     2
     >>> get_non_degenerated([2.0, 1.0, 2.0])
     1
+    >>> get_non_degenerated([[1.0, 1.0, 2.0], [3.0, 1.0, 1.0]])
+    array([2, 0])
     """
-    eigenvalues = list(eigenvalues)
-    n = len(eigenvalues)
+    eigenvalues = np.asarray(eigenvalues, dtype=float)
 
-    for i in range(n):
-        degenerate_count = sum(
-            abs(eigenvalues[i] - eigenvalues[j]) < tolerance
-            for j in range(n) if j != i
-        )
-        if degenerate_count == 0:
-            return i
+    close = np.abs(eigenvalues[..., :, None] - eigenvalues[..., None, :]) < tolerance
+    # every eigenvalue is close to itself
+    isolated = close.sum(axis=-1) == 1
 
-    raise RuntimeError("Could not identify a unique non-degenerate eigenvalue based on the provided tolerance.")
+    if not np.all(isolated.any(axis=-1)):
+        raise RuntimeError("Could not identify a unique non-degenerate eigenvalue based on the provided tolerance.")
+
+    index = np.argmax(isolated, axis=-1)
+    if index.ndim == 0:
+        return int(index)
+    return index
+
+def pairwise_angles(references, targets, tol=1e-5):
+    """
+    Compute angles (in radians) between every reference vector and every target vector.
+
+    Batched counterpart of `angles_between_vector_and_vectors`: pairs where the
+    product of norms is below `tol` get an angle of 0.
+
+    Parameters
+    ----------
+    references : ndarray of shape (..., M, 3)
+        Reference 3D vectors.
+    targets : ndarray of shape (N, 3)
+        Target 3D vectors.
+    tol : float
+        Threshold below which vector norms are treated as zero.
+
+    Returns
+    -------
+    angles : ndarray of shape (..., M, N)
+        Angles between each reference and each target vector.
+    """
+    references = np.asarray(references)
+    targets = np.asarray(targets)
+
+    denom = np.linalg.norm(references, axis=-1)[..., :, None] * np.linalg.norm(targets, axis=-1)
+    dot_products = np.matmul(references, targets.T)
+
+    small = denom < tol
+    cos_theta = np.clip(dot_products / np.where(small, 1.0, denom), -1.0, 1.0)
+    return np.where(small, 0.0, np.arccos(cos_theta))
+
+def pairwise_radius_difference(references, targets, tol=1e-5):
+    """
+    Compute relative radial differences between every reference and every target vector.
+
+    Batched counterpart of `normalized_radius_difference`.
+
+    Parameters
+    ----------
+    references : ndarray of shape (..., M, 3)
+        Reference 3D vectors.
+    targets : ndarray of shape (N, 3)
+        Target 3D vectors.
+    tol : float
+        Minimum average radius to avoid divide-by-zero.
+
+    Returns
+    -------
+    rel_differences : ndarray of shape (..., M, N)
+        Absolute radius differences normalized by average radius.
+    """
+    ref_norms = np.linalg.norm(references, axis=-1)[..., :, None]
+    target_norms = np.linalg.norm(targets, axis=-1)
+
+    avg_radii = np.clip((target_norms + ref_norms) / 2.0, tol, None)
+    return np.abs(target_norms - ref_norms) / avg_radii
+
+def kabsch_rotations(source, targets):
+    """
+    Compute the proper rotations that best map a set of points onto target sets (Kabsch algorithm).
+
+    For each target set the rotation R minimizing Σ ‖R·s_i - t_i‖² is returned.
+
+    Parameters
+    ----------
+    source : ndarray of shape (N, 3)
+        Source points.
+    targets : ndarray of shape (..., N, 3)
+        Target points, in the same order as the source points.
+
+    Returns
+    -------
+    rotations : ndarray of shape (..., 3, 3)
+        Proper rotation matrices (determinant +1).
+
+    Examples
+    --------
+    >>> points = np.array([[1.0, 0.0, 0.0], [0.0, 2.0, 0.0], [0.0, 0.0, 3.0]])
+    >>> np.allclose(kabsch_rotations(points, points), np.identity(3))
+    True
+    """
+    source = np.asarray(source, dtype=float)
+    targets = np.asarray(targets, dtype=float)
+
+    covariance = np.matmul(source.T, targets)
+    u, _, vt = np.linalg.svd(covariance)
+    v = np.swapaxes(vt, -1, -2)
+    ut = np.swapaxes(u, -1, -2)
+
+    # flip the weakest direction if needed to exclude reflections
+    sign = np.sign(np.linalg.det(np.matmul(v, ut)))
+    sign = np.where(sign == 0, 1.0, sign)
+    v = v * np.concatenate([np.ones(sign.shape + (2,)), sign[..., None]], axis=-1)[..., None, :]
+
+    return np.matmul(v, ut)
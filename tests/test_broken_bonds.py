@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+
+from ode_gen.complexes.examples import get_example
+from ode_gen.complexes.subcomplexes import get_unique_fully_connected_subgraphs
+from ode_gen.hashset import pair_key, popcount
+from ode_gen.reactions.dimer import (
+    all_unique_induced_splits, find_all_dimer_reactions, get_broken_edges, split_work_units)
+from ode_gen.stats import EnumerationStats
+
+
+def all_splits(H, **kwargs):
+    return sorted((sorted(A), sorted(B), cut_mask)
+                  for A, B, _, _, cut_mask in all_unique_induced_splits(H, details=True, unique=False, **kwargs))
+
+
+class TestMaxBrokenBonds(unittest.TestCase):
+    def test_low_cut_splits_match_filtered_enumeration(self):
+        for name in ["asymmetry_4mer", "ring_8", "random_12"]:
+            species = get_unique_fully_connected_subgraphs(get_example(name))
+            for H in species[-3:]:
+                full = all_splits(H)
+                for k in (1, 2, 3):
+                    with self.subTest(case=name, size=len(H), k=k):
+                        low_cut = all_splits(H, max_broken_bonds=k)
+                        self.assertEqual(low_cut, [split for split in full if popcount(split[2]) <= k])
+                        for A, B, cut_mask in low_cut:
+                            self.assertEqual(len(get_broken_edges(H, A, set(B))), popcount(cut_mask))
+                            self.assertLessEqual(len(A), len(B))
+
+    def test_reactions_are_pruned(self):
+        species = get_unique_fully_connected_subgraphs(get_example("octahedral_cage"))
+        full = find_all_dimer_reactions(species)
+        stats = EnumerationStats()
+        pruned = find_all_dimer_reactions(species, stats=stats, max_broken_bonds=2)
+        self.assertTrue(pruned)
+        self.assertTrue(all(reaction.n_broken_bonds <= 2 for reaction in pruned))
+        self.assertLess(len(pruned), len(full))
+        self.assertEqual(stats.counters["split_subsets_examined"],
+                         sum(split_work_units(H.number_of_edges(), 2) for H in pruned[0].species))
+
+        # every low-cut split type is found, even where the full run kept another interface
+        def keys(reactions):
+            return {(r.product, pair_key(*sorted(r.reactants))) for r in reactions}
+        self.assertLessEqual(keys(r for r in full if r.n_broken_bonds <= 2), keys(pruned))
+
+    def test_checkpoint_records_the_bound(self):
+        species = get_unique_fully_connected_subgraphs(get_example("ring_8"))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "run.ckpt")
+            first = find_all_dimer_reactions(species, checkpoint=path, max_broken_bonds=1)
+            again = find_all_dimer_reactions(species, checkpoint=path, max_broken_bonds=1)
+            self.assertEqual([r.cut_mask for r in first], [r.cut_mask for r in again])
+            with self.assertRaises(ValueError):
+                find_all_dimer_reactions(species, checkpoint=path, max_broken_bonds=2)
+
+
+if __name__ == "__main__":
+    unittest.main()
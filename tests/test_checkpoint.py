@@ -0,0 +1,80 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import networkx as nx
+
+from ode_gen.checkpoint import load_checkpoint, graph_fingerprint
+from ode_gen.complexes import subcomplexes
+from ode_gen.complexes.examples import get_example
+from ode_gen.reactions import dimer
+
+
+class Interrupted(Exception):
+    pass
+
+
+def interrupt_after(func, n_calls):
+    """Wrap func so that it raises Interrupted on call number n_calls."""
+    calls = [0]
+
+    def wrapper(*args, **kwargs):
+        calls[0] += 1
+        if calls[0] == n_calls:
+            raise Interrupted
+        return func(*args, **kwargs)
+    return wrapper
+
+
+def as_nodes(reactions):
+    return [(sorted(a), sorted(b), list(H)) for a, b, H in reactions]
+
+
+class TestCheckpointResume(unittest.TestCase):
+    def setUp(self):
+        self.G = get_example("ring_8")
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "run.ckpt")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_species_resume_gives_identical_output(self):
+        expected = [list(H) for H in subcomplexes.get_unique_fully_connected_subgraphs(self.G)]
+
+        with mock.patch.object(subcomplexes.nx, "is_connected", interrupt_after(nx.is_connected, 100)):
+            with self.assertRaises(Interrupted):
+                subcomplexes.get_unique_fully_connected_subgraphs(self.G, checkpoint=self.path, checkpoint_interval=0)
+        state = load_checkpoint(self.path, "species", graph_fingerprint([self.G]))
+        self.assertIsNotNone(state["position"])
+
+        resumed = subcomplexes.get_unique_fully_connected_subgraphs(self.G, checkpoint=self.path, checkpoint_interval=0)
+        self.assertEqual([list(H) for H in resumed], expected)
+        self.assertIsNone(load_checkpoint(self.path, "species", graph_fingerprint([self.G]))["position"])
+
+    def test_dimer_resume_gives_identical_output(self):
+        species = subcomplexes.get_unique_fully_connected_subgraphs(self.G)
+        expected = as_nodes(dimer.find_all_dimer_reactions(species))
+
+        for use_multiprocessing in (False, True):
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+            # interrupt in the middle of a species' split enumeration
+            with mock.patch.object(dimer, "is_connected", interrupt_after(dimer.is_connected, 300)):
+                with self.assertRaises(Interrupted):
+                    dimer.find_all_dimer_reactions(species, checkpoint=self.path, checkpoint_interval=0)
+            self.assertIsNotNone(load_checkpoint(self.path, "dimer_reactions", graph_fingerprint(species))["split"])
+
+            resumed = dimer.find_all_dimer_reactions(species, use_multiprocessing,
+                                                     checkpoint=self.path, checkpoint_interval=0)
+            self.assertEqual(as_nodes(resumed), expected)
+
+    def test_checkpoint_of_other_input_is_refused(self):
+        subcomplexes.get_unique_fully_connected_subgraphs(self.G, checkpoint=self.path)
+        with self.assertRaises(ValueError):
+            subcomplexes.get_unique_fully_connected_subgraphs(get_example("8y7s"), checkpoint=self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
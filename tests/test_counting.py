@@ -0,0 +1,52 @@
+import unittest
+
+import networkx as nx
+
+from ode_gen.complexes.counting import (
+    count_species, count_species_by_size, orbit_upper_bound_by_size, typed_automorphisms)
+from ode_gen.complexes.examples import get_example
+from ode_gen.complexes.subcomplexes import get_unique_fully_connected_subgraphs, iter_species_by_level
+from ode_gen.stats import EnumerationStats
+
+
+class TestCounting(unittest.TestCase):
+    def test_species_counts_match_enumeration(self):
+        for name in ["8y7s", "asymmetry_4mer", "ring_8", "tetrahedral_cage", "random_12"]:
+            G = get_example(name)
+            with self.subTest(case=name):
+                expected = {size: len(species) for size, species in iter_species_by_level(G)}
+                self.assertEqual(count_species_by_size(G), expected)
+                self.assertEqual(count_species(G), len(get_unique_fully_connected_subgraphs(G)))
+                self.assertEqual(count_species_by_size(G, max_size=3), {k: expected[k] for k in (1, 2, 3)})
+
+    def test_orbits_bound_species(self):
+        for name, exact in [("ring_8", True), ("octahedral_cage", True), ("tetrahedral_cage", False),
+                            ("random_12", False)]:
+            G = get_example(name)
+            stats = EnumerationStats()
+            orbits = orbit_upper_bound_by_size(G, stats=stats)
+            species = count_species_by_size(G)
+            with self.subTest(case=name):
+                self.assertEqual(orbits == species, exact)
+                self.assertTrue(all(orbits[size] >= count for size, count in species.items()))
+                self.assertEqual(stats.counters["automorphisms"], len(typed_automorphisms(G)))
+
+    def test_orbits_of_untyped_cycle(self):
+        # C6 under its dihedral group: one orbit of paths per size, plus the whole cycle
+        G = nx.cycle_graph(6)
+        nx.set_node_attributes(G, "A", "type")
+        nx.set_edge_attributes(G, "a", "type")
+        self.assertEqual(len(typed_automorphisms(G)), 12)
+        self.assertEqual(orbit_upper_bound_by_size(G), {size: 1 for size in range(1, 7)})
+
+    def test_automorphisms_respect_types(self):
+        G = nx.path_graph(3)
+        nx.set_node_attributes(G, "A", "type")
+        nx.set_edge_attributes(G, {(0, 1): "x", (1, 2): "x"}, "type")
+        self.assertEqual(sorted(typed_automorphisms(G)), [(0, 1, 2), (2, 1, 0)])
+        G.edges[1, 2]["type"] = "y"
+        self.assertEqual(typed_automorphisms(G), [(0, 1, 2)])
+
+
+if __name__ == "__main__":
+    unittest.main()
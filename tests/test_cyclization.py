@@ -0,0 +1,50 @@
+import unittest
+
+import networkx as nx
+
+from ode_gen.complexes.examples import get_example
+from ode_gen.complexes.subcomplexes import get_unique_fully_connected_subgraphs
+from ode_gen.complexes.wl import BatchedWL, wl_hash
+from ode_gen.reactions.transformation import (
+    are_type_isomorphic, find_all_transformable_subgraph_pairs, find_cyclization_transformations)
+from ode_gen.stats import EnumerationStats
+
+
+class TestCyclizations(unittest.TestCase):
+    def test_edge_removal_hashes_match_wl_hash(self):
+        G = get_example("random_12")
+        hasher = BatchedWL(G)
+        expected = []
+        for u, v in G.edges():
+            H = G.copy()
+            H.remove_edge(u, v)
+            expected.append(wl_hash(H))
+        self.assertEqual(hasher.hash_edge_removals(range(G.number_of_edges())), expected)
+        self.assertEqual(hasher.hash_edge_removals([]), [])
+
+    def test_covers_single_bond_pairwise_transformations(self):
+        for name in ["asymmetry_4mer", "octahedral_cage", "tetrahedral_cage"]:
+            G = get_example(name)
+            species = get_unique_fully_connected_subgraphs(G)
+            with self.subTest(case=name):
+                direct = {(t.source, t.target): t for t in find_cyclization_transformations(G, species)}
+                for t in find_all_transformable_subgraph_pairs(G, species):
+                    if len(t.edges) == 1:
+                        self.assertIn((t.source, t.target), direct)
+                        self.assertEqual(direct[t.source, t.target].direction, t.direction)
+
+    def test_transformations_are_single_bond_changes(self):
+        G = get_example("tetrahedral_cage")
+        species = get_unique_fully_connected_subgraphs(G)
+        stats = EnumerationStats()
+        transformations = find_cyclization_transformations(G, species, stats=stats)
+        self.assertGreater(len(transformations), 0)
+        self.assertEqual(stats.counters["transformations"], len(transformations))
+        for G1, G2, direction, edges in transformations:
+            closed, open_ = (G1, G2) if direction == "removed" else (G2, G1)
+            self.assertEqual(len(edges), 1)
+            self.assertTrue(nx.is_connected(open_))
+            self.assertEqual(closed.number_of_edges(), open_.number_of_edges() + 1)
+            # some copy of the closed form with one bond broken is the open form
+            self.assertTrue(any(are_type_isomorphic(nx.restricted_view(closed, [], [(u, v)]), open_)
+                                for u, v in closed.edges()))
@@ -0,0 +1,62 @@
+import math
+import unittest
+
+import networkx as nx
+import numpy as np
+
+from ode_gen.complexes.energy import SubsetEnergies, edge_energies, species_energies
+from ode_gen.complexes.examples import get_example
+from ode_gen.complexes.subcomplexes import iter_species_by_level
+from ode_gen.stats import EnumerationStats
+
+ENERGIES_5L93 = {"hex": -6.0, "tri": -4.0, "di": -2.0}
+
+
+def bond_energy(H, energies):
+    return sum(energies[t] for _, _, t in H.edges(data="type"))
+
+
+class TestEnergies(unittest.TestCase):
+    def setUp(self):
+        self.G = get_example("5l93")
+        self.species = [H for _, level in iter_species_by_level(self.G, max_size=8) for H in level]
+
+    def test_species_energies(self):
+        expected = [bond_energy(H, ENERGIES_5L93) for H in self.species]
+        np.testing.assert_allclose(species_energies(self.species, ENERGIES_5L93), expected)
+        np.testing.assert_allclose(species_energies(self.species, ENERGIES_5L93, G=self.G), expected)
+        model = SubsetEnergies(self.G, ENERGIES_5L93)
+        np.testing.assert_allclose(model.of_index_subsets([(0, 1), (0, 1, 7)]), [-6.0, -12.0])
+        self.assertEqual(len(edge_energies(self.G, ENERGIES_5L93)), self.G.number_of_edges())
+
+    def test_missing_edge_type(self):
+        with self.assertRaises(ValueError):
+            species_energies(self.species, {"hex": -6.0, "tri": -4.0})
+        with self.assertRaises(ValueError):
+            SubsetEnergies(self.G, {"hex": -6.0})
+
+    def test_window_pruning(self):
+        full = {size: len(level) for size, level in iter_species_by_level(self.G)}
+        unpruned = {size: len(level) for size, level in
+                    iter_species_by_level(self.G, energies=ENERGIES_5L93, energy_window=math.inf)}
+        self.assertEqual(unpruned, full)
+
+        stats = EnumerationStats()
+        levels = list(iter_species_by_level(self.G, stats=stats, energies=ENERGIES_5L93, energy_window=2.0))
+        self.assertLess(sum(len(level) for _, level in levels), sum(full.values()))
+        self.assertGreater(stats.counters["energy_pruned"], 0)
+        for size, level in levels:
+            energies = [bond_energy(H, ENERGIES_5L93) for H in level]
+            # the most stable species of a size is never pruned, the others lie within the window
+            self.assertLessEqual(max(energies) - min(energies), 2.0)
+        # the hexamer ring is the most stable 6-mer
+        hexamers = dict(levels)[6]
+        self.assertIn(sorted(range(6)), [sorted(H) for H in hexamers])
+
+    def test_arguments_come_together(self):
+        with self.assertRaises(ValueError):
+            next(iter_species_by_level(nx.path_graph(3), energy_window=1.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+import networkx as nx
+from networkx.algorithms.isomorphism import categorical_edge_match, categorical_node_match
+
+from ode_gen.complexes.examples import (
+    get_example,
+    graph_5l93,
+    graph_cage,
+    graph_hexamer_lattice,
+    graph_random,
+    graph_registry,
+)
+from ode_gen.symmetry.species import SpeciesSymmetry
+
+def typed_isomorphic(G1, G2):
+    return nx.is_isomorphic(
+        G1, G2,
+        node_match=categorical_node_match("type", None),
+        edge_match=categorical_edge_match("type", None),
+    )
+
+class TestSyntheticAssemblies(unittest.TestCase):
+    def test_registry_entries_build(self):
+        for name in graph_registry:
+            G = get_example(name)
+            self.assertTrue(nx.is_connected(G), name)
+            self.assertTrue(all("type" in d for _, d in G.nodes(data=True)), name)
+            self.assertTrue(all("type" in d for _, _, d in G.edges(data=True)), name)
+
+    def test_hexamer_lattice_reproduces_5l93(self):
+        self.assertTrue(typed_isomorphic(graph_hexamer_lattice(0), graph_5l93()))
+
+    def test_hexamer_lattice_sizes(self):
+        self.assertEqual(graph_hexamer_lattice(1, partners=False).number_of_nodes(), 42)
+        self.assertEqual(graph_hexamer_lattice(1).number_of_nodes(), 72)
+
+    def test_cage_sizes_and_symmetry(self):
+        symmetry = SpeciesSymmetry()
+        for kind, order, n_faces in [("tetrahedron", 12, 4), ("octahedron", 24, 8), ("icosahedron", 60, 20)]:
+            for per_face in (1, 3):
+                G = graph_cage(kind, per_face)
+                self.assertEqual(G.number_of_nodes(), n_faces * per_face)
+                self.assertEqual(symmetry.symmetry_number(G), order)
+
+    def test_random_graph_is_reproducible(self):
+        G = graph_random(12, seed=3)
+        self.assertTrue(nx.is_connected(G))
+        self.assertTrue(nx.utils.graphs_equal(G, graph_random(12, seed=3)))
+        self.assertFalse(nx.utils.graphs_equal(G, graph_random(12, seed=4)))
+
+    def test_family_names(self):
+        self.assertEqual(get_example("ring:7").number_of_nodes(), 7)
+        self.assertEqual(get_example("cage:octahedron,3").number_of_nodes(), 24)
+        with self.assertRaises(ValueError):
+            get_example("not_a_family:3")
+        with self.assertRaises(ValueError):
+            get_example("not_an_example")
+
+    def test_ring_sizes(self):
+        self.assertEqual(get_example("ring:3").number_of_edges(), 3)
+        for n in (0, 1, 2):
+            with self.subTest(n=n), self.assertRaises(ValueError):
+                get_example(f"ring:{n}")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import pickle
+import random
+import unittest
+
+from ode_gen.hashset import CompactHashSet, digest_to_int, pair_key
+
+
+class TestCompactHashSet(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(0)
+        self.keys = [rng.getrandbits(128) for _ in range(5000)]
+
+    def test_matches_python_set_through_growth(self):
+        for bits in (64, 128):
+            mask = (1 << bits) - 1
+            compact, reference = CompactHashSet(bits=bits, capacity=8), set()
+            for key in self.keys + self.keys[:100]:
+                self.assertEqual(compact.add(key), (key & mask) not in reference)
+                reference.add(key & mask)
+            self.assertEqual(len(compact), len(reference))
+            self.assertEqual(set(compact), reference)
+            self.assertTrue(all(key in compact for key in self.keys))
+            self.assertNotIn(1 << 200 | 12345, compact)
+
+    def test_batches_match_python_set(self):
+        rng = random.Random(1)
+        for bits in (64, 128):
+            mask = (1 << bits) - 1
+            pool = self.keys[:3000] + [0, 1 << 64]
+            compact, reference = CompactHashSet(bits=bits, capacity=8), set()
+            for _ in range(20):
+                batch = [rng.choice(pool) for _ in range(rng.randint(0, 800))]
+                expected = []
+                for key in batch:
+                    expected.append((key & mask) not in reference)
+                    reference.add(key & mask)
+                self.assertEqual(compact.add_many(batch), expected)
+            self.assertEqual(len(compact), len(reference))
+            self.assertEqual(set(compact), reference)
+            self.assertIn(0, compact)
+
+    def test_batch_with_colliding_low_lanes(self):
+        compact = CompactHashSet()
+        batch = [7 | i << 64 for i in range(100)] + [7, 7 | 3 << 64] + self.keys[:100]
+        self.assertEqual(compact.add_many(batch), [True] * 100 + [False, False] + [True] * 100)
+        self.assertEqual(set(compact), set(batch))
+
+    def test_zero_key(self):
+        compact = CompactHashSet()
+        self.assertNotIn(0, compact)
+        self.assertTrue(compact.add(0))
+        self.assertFalse(compact.add(0))
+        self.assertEqual(compact.add_many([0, 5]), [False, True])
+        self.assertEqual(set(pickle.loads(pickle.dumps(compact))), {0, 5})
+        self.assertEqual(set(CompactHashSet.from_array(compact.to_array())), {0, 5})
+
+    def test_colliding_low_lanes(self):
+        compact = CompactHashSet()
+        self.assertTrue(compact.add(7))
+        self.assertTrue(compact.add(7 | 1 << 64))
+        self.assertFalse(compact.add(7 | 1 << 64))
+        self.assertEqual(len(compact), 2)
+
+    def test_memory_per_entry(self):
+        compact = CompactHashSet()
+        compact.update(self.keys)
+        self.assertLessEqual(compact.nbytes / len(compact), 43)
+
+    def test_export_and_pickle(self):
+        compact = CompactHashSet()
+        compact.update(self.keys)
+        for restored in (CompactHashSet.from_array(compact.to_array()), pickle.loads(pickle.dumps(compact))):
+            self.assertEqual(set(restored), set(self.keys))
+            self.assertFalse(restored.add(self.keys[0]))
+        self.assertEqual(compact.to_array().shape, (len(self.keys), 2))
+
+    def test_keys(self):
+        h1, h2 = digest_to_int("0f" * 16), digest_to_int("a1" * 16)
+        self.assertEqual(h2, int("a1" * 16, 16))
+        self.assertEqual(pair_key(h1, h2), pair_key(h2, h1))
+        self.assertNotEqual(pair_key(h1, h2), pair_key(h1, h1))
+        self.assertLess(pair_key(h1, h2, bits=64), 1 << 64)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+import subprocess
+import sys
+
+def loaded_packages(statement, packages):
+    """Import in a fresh interpreter and return which of `packages` got loaded."""
+    code = f"{statement}; import sys; print(','.join(p for p in {packages!r} if p in sys.modules))"
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return [p for p in proc.stdout.strip().split(",") if p]
+
+class TestLazyImports(unittest.TestCase):
+    """
+    Guard the import cost by checking which heavy packages get loaded,
+    which is deterministic, instead of timing the import.
+    """
+
+    def test_package_import_is_light(self):
+        self.assertEqual(
+            loaded_packages("import ode_gen", ["networkx", "numpy", "pandas", "matplotlib"]), []
+        )
+
+    def test_reactions_package_defers_networkx(self):
+        self.assertEqual(
+            loaded_packages("import ode_gen.reactions", ["networkx", "numpy", "pandas", "matplotlib"]), []
+        )
+
+    def test_enumeration_does_not_load_plotting_or_dataframes(self):
+        statement = (
+            "import ode_gen.complexes.subcomplexes, ode_gen.reactions.dimer, "
+            "ode_gen.reactions.transformation, ode_gen.symmetry.species"
+        )
+        self.assertEqual(loaded_packages(statement, ["pandas", "matplotlib", "scipy"]), [])
+
+    def test_lazy_attributes_resolve(self):
+        import ode_gen
+        from ode_gen.reactions import find_all_dimer_reactions
+        from ode_gen.reactions.dimer import find_all_dimer_reactions as direct
+
+        self.assertIs(find_all_dimer_reactions, direct)
+        self.assertEqual(ode_gen.symmetry.__name__, "ode_gen.symmetry")
+        with self.assertRaises(AttributeError):
+            ode_gen.not_a_subpackage
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import random
+import unittest
+
+import networkx as nx
+from networkx.algorithms.isomorphism import GraphMatcher
+
+from ode_gen.complexes.examples import get_example
+from ode_gen.complexes.isomorphism import is_typed_isomorphic, typed_invariants, typed_isomorphism
+from ode_gen.complexes.subcomplexes import get_unique_fully_connected_subgraphs
+from ode_gen.reactions.transformation import are_type_isomorphic, edge_match, node_match
+from ode_gen.stats import EnumerationStats
+
+
+def typed(G, node_type="A", edge_type="x"):
+    nx.set_node_attributes(G, node_type, "type")
+    nx.set_edge_attributes(G, edge_type, "type")
+    return G
+
+
+def shuffled(G, rng):
+    """A copy of G with permuted node labels and node insertion order."""
+    nodes = list(G)
+    images = dict(zip(nodes, rng.sample(nodes, len(nodes))))
+    H = nx.Graph()
+    for node in rng.sample(nodes, len(nodes)):
+        H.add_node(images[node], **G.nodes[node])
+    H.add_edges_from((images[u], images[v], d) for u, v, d in G.edges(data=True))
+    return H
+
+
+class TestTypedIsomorphism(unittest.TestCase):
+    def assertValidIsomorphism(self, mapping, G1, G2):
+        self.assertEqual(sorted(mapping), sorted(G1))
+        self.assertEqual(set(mapping.values()), set(G2))
+        for u in G1:
+            self.assertEqual(G1.nodes[u]["type"], G2.nodes[mapping[u]]["type"])
+        self.assertEqual(G1.number_of_edges(), G2.number_of_edges())
+        for u, v, t in G1.edges(data="type"):
+            self.assertEqual(G2[mapping[u]][mapping[v]]["type"], t)
+
+    def test_matches_graph_matcher(self):
+        rng = random.Random(0)
+        for name in ["asymmetry_4mer", "octahedral_cage", "tetrahedral_cage", "random_12"]:
+            species = get_unique_fully_connected_subgraphs(get_example(name))
+            with self.subTest(case=name):
+                for _ in range(300):
+                    G1 = rng.choice(species)
+                    G2 = shuffled(G1, rng) if rng.random() < 0.5 else rng.choice(species)
+                    expected = GraphMatcher(G1, G2, node_match=node_match, edge_match=edge_match).is_isomorphic()
+                    mapping = typed_isomorphism(G1, G2)
+                    self.assertEqual(mapping is not None, expected)
+                    if mapping is not None:
+                        self.assertValidIsomorphism(mapping, G1, G2)
+
+    def test_regular_graphs_with_equal_colors(self):
+        # color refinement cannot tell these apart; the matching must
+        hexagon = typed(nx.cycle_graph(6))
+        triangles = typed(nx.disjoint_union(nx.cycle_graph(3), nx.cycle_graph(3)))
+        self.assertEqual(typed_invariants(hexagon).color_histogram.keys(),
+                         typed_invariants(triangles).color_histogram.keys())
+        self.assertFalse(is_typed_isomorphic(hexagon, triangles))
+        prism = typed(nx.circular_ladder_graph(3))
+        bipartite = typed(nx.complete_bipartite_graph(3, 3))
+        self.assertFalse(is_typed_isomorphic(prism, bipartite))
+        mapping = typed_isomorphism(hexagon, shuffled(hexagon, random.Random(1)))
+        self.assertIsNotNone(mapping)
+
+    def test_types_are_respected(self):
+        path = typed(nx.path_graph(3))
+        other = path.copy()
+        other.nodes[0]["type"] = "B"
+        stats = EnumerationStats()
+        self.assertFalse(is_typed_isomorphic(path, other, stats))
+        self.assertEqual(stats.counters["invariant_rejections"], 1)
+        other = path.copy()
+        nx.set_edge_attributes(other, {(0, 1): "y"}, "type")
+        self.assertFalse(is_typed_isomorphic(path, other))
+        self.assertEqual(typed_isomorphism(nx.Graph(), nx.Graph()), {})
+
+    def test_colliding_type_hashes(self):
+        # hash(-1) == hash(-2): equal colors must not stand in for equal types
+        self.assertEqual(hash(-1), hash(-2))
+        path1, path2 = typed(nx.path_graph(3), edge_type="e"), typed(nx.path_graph(3), edge_type="e")
+        nx.set_node_attributes(path1, {0: -1, 1: -2, 2: -1}, "type")
+        nx.set_node_attributes(path2, {0: -2, 1: -1, 2: -1}, "type")
+        self.assertFalse(GraphMatcher(path1, path2, node_match=node_match, edge_match=edge_match).is_isomorphic())
+        self.assertIsNone(typed_isomorphism(path1, path2))
+        self.assertFalse(are_type_isomorphic(path1, path2))
+
+    def test_invariants_are_cached_and_refreshed(self):
+        G = typed(nx.path_graph(4))
+        invariants = typed_invariants(G)
+        self.assertIs(typed_invariants(G), invariants)
+        G.add_edge(0, 3, type="x")
+        self.assertIsNot(typed_invariants(G), invariants)
+        self.assertTrue(is_typed_isomorphic(G, typed(nx.cycle_graph(4))))
@@ -0,0 +1,78 @@
+import itertools
+import unittest
+
+import networkx as nx
+
+from ode_gen.complexes.examples import get_example
+from ode_gen.complexes.subcomplexes import get_unique_fully_connected_subgraphs
+from ode_gen.reactions import DimerReaction, LumpedReaction, find_all_lumped_dimer_reactions, lump_reactions
+from ode_gen.reactions.dimer import (
+    all_unique_induced_splits, compute_reactions_for_species, find_all_dimer_reactions)
+from ode_gen.reactions.lumping import reduction_ratio
+from ode_gen.stats import EnumerationStats
+
+
+def count_connected_splits(H):
+    # unordered splits of H into two connected induced parts
+    nodes = list(H)
+    count = 0
+    for r in range(1, len(nodes)):
+        for part in itertools.combinations(nodes, r):
+            rest = set(nodes).difference(part)
+            if nx.is_connected(H.subgraph(part)) and nx.is_connected(H.subgraph(rest)):
+                count += 1
+    return count // 2
+
+
+class TestLumping(unittest.TestCase):
+    def test_multiplicities_count_all_interfaces(self):
+        for name in ["asymmetry_4mer", "ring_8", "octahedral_cage"]:
+            species = get_unique_fully_connected_subgraphs(get_example(name))
+            stats = EnumerationStats()
+            lumped = find_all_lumped_dimer_reactions(species, stats=stats)
+            with self.subTest(case=name):
+                self.assertTrue(all(isinstance(r, LumpedReaction) for r in lumped))
+                self.assertEqual(sum(r.multiplicity for r in lumped),
+                                 sum(count_connected_splits(H) for H in species))
+                self.assertEqual(stats.counters["lumped_reactions"], len(lumped))
+                # one lumped reaction per distinct (product, reactants, broken bond types)
+                self.assertEqual(len(lumped), len(find_all_dimer_reactions(species)))
+
+    def test_ring_interfaces(self):
+        species = get_unique_fully_connected_subgraphs(get_example("ring_8"))
+        lumped = find_all_lumped_dimer_reactions(species)
+        sizes = {(len(r.product_graph), tuple(sorted(len(species[i]) for i in r.reactants))): r.multiplicity
+                 for r in lumped}
+        # a chain of 2 breaks in one place, a chain of 4 into 2 + 2 once and into 1 + 3 twice
+        self.assertEqual(sizes[(2, (1, 1))], 1)
+        self.assertEqual(sizes[(4, (2, 2))], 1)
+        self.assertEqual(sizes[(4, (1, 3))], 2)
+        # the closed ring breaks two bonds at 8 equivalent positions per split size
+        self.assertEqual(sizes[(8, (4, 4))], 4)
+        self.assertEqual(lumped[-1].bond_types, ("ring", "ring"))
+        self.assertLess(reduction_ratio(lumped), 1)
+
+    def test_symmetric_assembly_shrinks(self):
+        species = get_unique_fully_connected_subgraphs(get_example("octahedral_cage"))
+        lumped = find_all_lumped_dimer_reactions(species)
+        n_splits = sum(count_connected_splits(H) for H in species)
+        self.assertLess(reduction_ratio(lumped), 1)
+        self.assertAlmostEqual(reduction_ratio(lumped), len(lumped) / n_splits)
+        # the deduplicated default path is already at the lumped size
+        self.assertEqual(reduction_ratio(lump_reactions(find_all_dimer_reactions(species))), 1.0)
+
+    def test_records_without_reactant_ids(self):
+        G = get_example("ring_8")
+        chain = G.subgraph(list(G)[:4])
+        self.assertEqual(len(lump_reactions(compute_reactions_for_species(chain))), 2)
+        # all splits, with parts matched by hash and bonds found from the graph
+        species = [chain]
+        splits = [DimerReaction(species, 0, None, None, A, B)
+                  for A, B in all_unique_induced_splits(chain, unique=False)]
+        lumped = lump_reactions(splits)
+        self.assertEqual(sorted(r.multiplicity for r in lumped), [1, 2])
+        self.assertEqual(reduction_ratio([]), 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+
+import networkx as nx
+
+from ode_gen.complexes.examples import get_example
+from ode_gen.complexes.subcomplexes import get_unique_fully_connected_subgraphs
+from ode_gen.reactions import ReactionNetwork
+from ode_gen.reactions.dimer import find_all_dimer_reactions
+from ode_gen.reactions.network import ASSOCIATION, DISSOCIATION, TRANSFORMATION
+from ode_gen.reactions.records import DimerReaction
+from ode_gen.reactions.transformation import find_all_transformable_subgraph_pairs
+
+
+class TestReactionNetwork(unittest.TestCase):
+    def setUp(self):
+        self.G = get_example("asymmetry_4mer")
+        self.species = get_unique_fully_connected_subgraphs(self.G)
+        self.reactions = find_all_dimer_reactions(self.species)
+
+    def test_lookups_match_scans(self):
+        network = ReactionNetwork.from_reactions(iter(self.reactions))
+        self.assertEqual(network.n_reactions, len(self.reactions))
+        self.assertEqual(network.n_species, len(self.species))
+
+        for s in range(network.n_species):
+            producing = [k for k, r in enumerate(self.reactions) if r.product == s]
+            consuming = [k for k, r in enumerate(self.reactions) if s in r.reactants]
+            self.assertEqual(network.producing(s).tolist(), producing)
+            self.assertEqual(network.consuming(s).tolist(), consuming)
+
+        for k, r in enumerate(self.reactions):
+            self.assertEqual(sorted(network.consumed(k).tolist()), sorted(r.reactants))
+            self.assertEqual(network.produced(k).tolist(), [r.product])
+            self.assertIs(network.records[k], r)
+
+    def test_reversible_network(self):
+        network = ReactionNetwork.from_reactions(self.reactions, reversible=True)
+        self.assertEqual(network.n_reactions, 2 * len(self.reactions))
+        self.assertEqual(network.kinds[:2].tolist(), [ASSOCIATION, DISSOCIATION])
+        for k in range(0, network.n_reactions, 2):
+            self.assertEqual(network.consumed(k + 1).tolist(), network.produced(k).tolist())
+            self.assertEqual(network.produced(k + 1).tolist(), network.consumed(k).tolist())
+
+    def test_homodimer_stoichiometry(self):
+        G = nx.path_graph(2)
+        nx.set_node_attributes(G, "A", "type")
+        nx.set_edge_attributes(G, "aa", "type")
+        species = get_unique_fully_connected_subgraphs(G)
+        network = ReactionNetwork.from_reactions(find_all_dimer_reactions(species))
+        self.assertEqual(network.consumed(0).tolist(), [0, 0])
+        self.assertEqual(network.consuming(0).tolist(), [0])
+
+    def test_transformations_on_the_species_list(self):
+        pairs = find_all_transformable_subgraph_pairs(self.G, self.species)
+        network = ReactionNetwork.from_reactions(self.reactions, pairs, reversible=True)
+        self.assertEqual(network.n_reactions, 2 * len(self.reactions) + 2 * len(pairs))
+        k = 2 * len(self.reactions)
+        self.assertEqual(network.kind_name(k), "transformation")
+        self.assertEqual(network.kinds[k], TRANSFORMATION)
+        self.assertEqual(network.consumed(k).tolist(), [self.species.index(pairs[0].source_graph)])
+
+    def test_unknown_species_is_rejected(self):
+        orphan = DimerReaction(self.reactions[0].species, 0, None, 1, (0,), (1,))
+        with self.assertRaises(ValueError):
+            ReactionNetwork.from_reactions([orphan])
+
+    def test_empty_network(self):
+        network = ReactionNetwork.from_reactions([], species=self.species)
+        self.assertEqual(network.n_reactions, 0)
+        self.assertEqual(network.producing(0).tolist(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+"""
+Performance regression tests based on deterministic work units.
+
+Instead of timing the pipeline, each stage is run with an
+`ode_gen.stats.EnumerationStats` that counts its hot operations (candidate
+subsets examined, connectivity checks, WL hashes computed, VF2 matchers
+built) and the counts are compared against the
+baselines recorded in `perf_baselines.json`. A test fails when a stage does
+more work than its baseline, independent of the speed of the machine.
+
+After an intentional algorithmic change, re-record the baselines with
+
+    python tests/test_performance.py --update-baselines
+
+Every example of the registry is a fast or a slow case and has a recorded
+baseline; cases listed in SLOW_CASES are only checked when
+ODE_GEN_SLOW_TESTS=1 (and only re-recorded with it set).
+"""
+import json
+import os
+import sys
+import unittest
+from pathlib import Path
+
+from ode_gen.complexes.examples import get_example, graph_registry
+from ode_gen.complexes.subcomplexes import get_unique_fully_connected_subgraphs
+from ode_gen.reactions.dimer import find_all_dimer_reactions
+from ode_gen.reactions.transformation import find_all_transformable_subgraph_pairs
+from ode_gen.stats import EnumerationStats
+
+BASELINE_FILE = Path(__file__).with_name("perf_baselines.json")
+
+FAST_CASES = ["8y7s", "asymmetry_4mer", "ring_8", "octahedral_cage", "tetrahedral_cage"]
+SLOW_CASES = ["random_12", "5l93", "icosahedral_cage"]
+
+# work-unit counters of each stage, as reported by EnumerationStats
+WORK_COUNTERS = {
+    "species": ["subsets_examined", "connectivity_checks", "hash_computations"],
+    "dimer_reactions": ["split_subsets_examined", "split_connectivity_checks",
+                        "split_hash_computations", "dedupe_hash_computations"],
+    "transformations": ["pairs_compared", "isomorphism_calls"],
+}
+
+def select(stats, stage, results):
+    return dict({key: stats.counters[key] for key in WORK_COUNTERS[stage]}, results=results)
+
+def count_work(name):
+    """Run the pipeline on an example and return the work units of each stage."""
+    G = get_example(name)
+    work = {}
+
+    stats = EnumerationStats()
+    species = get_unique_fully_connected_subgraphs(G, stats=stats)
+    work["species"] = select(stats, "species", len(species))
+
+    stats = EnumerationStats()
+    reactions = find_all_dimer_reactions(species, stats=stats)
+    work["dimer_reactions"] = select(stats, "dimer_reactions", len(reactions))
+
+    stats = EnumerationStats()
+    pairs = find_all_transformable_subgraph_pairs(G, species, stats=stats)
+    work["transformations"] = select(stats, "transformations", len(pairs))
+
+    return work
+
+def load_baselines():
+    if not BASELINE_FILE.exists():
+        return {}
+    with open(BASELINE_FILE) as f:
+        return json.load(f)
+
+class TestWorkUnitBaselines(unittest.TestCase):
+    baselines = load_baselines()
+
+    def check_case(self, name):
+        self.assertIn(name, self.baselines, f"no recorded baseline for {name}, run with --update-baselines")
+
+        work = count_work(name)
+        for stage, expected in self.baselines[name].items():
+            for counter, baseline in expected.items():
+                with self.subTest(case=name, stage=stage, counter=counter):
+                    current = work[stage][counter]
+                    if counter == "results":
+                        # the output itself must not change
+                        self.assertEqual(current, baseline, f"{name}/{stage}: result count changed")
+                    else:
+                        self.assertLessEqual(
+                            current, baseline,
+                            f"{name}/{stage}: {counter} regressed from {baseline} to {current}",
+                        )
+
+    def test_every_example_has_a_baseline(self):
+        self.assertEqual(sorted(FAST_CASES + SLOW_CASES), sorted(graph_registry))
+        self.assertEqual(sorted(self.baselines), sorted(graph_registry))
+
+    def test_fast_cases(self):
+        for name in FAST_CASES:
+            self.check_case(name)
+
+    @unittest.skipUnless(os.environ.get("ODE_GEN_SLOW_TESTS") == "1", "set ODE_GEN_SLOW_TESTS=1 to run")
+    def test_slow_cases(self):
+        for name in SLOW_CASES:
+            self.check_case(name)
+
+def update_baselines(names):
+    baselines = load_baselines()
+    for name in names:
+        print(f"recording {name}")
+        baselines[name] = count_work(name)
+    with open(BASELINE_FILE, "w") as f:
+        json.dump(baselines, f, indent=4, sort_keys=True)
+        f.write("\n")
+
+if __name__ == '__main__':
+    if "--update-baselines" in sys.argv:
+        slow = os.environ.get("ODE_GEN_SLOW_TESTS") == "1"
+        update_baselines(FAST_CASES + (SLOW_CASES if slow else []))
+    else:
+        unittest.main()
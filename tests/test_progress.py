@@ -0,0 +1,71 @@
+import io
+import unittest
+from math import comb
+
+from ode_gen.complexes.examples import get_example
+from ode_gen.complexes.subcomplexes import get_unique_fully_connected_subgraphs
+from ode_gen.progress import ProgressTracker, ProgressUpdate, print_progress
+from ode_gen.reactions.dimer import find_all_dimer_reactions, split_work_units
+from ode_gen.reactions.transformation import find_all_transformable_subgraph_pairs
+
+
+def final_updates(updates):
+    """Last update of every (stage, level)."""
+    return {(u.stage, u.level): u for u in updates}
+
+
+class TestProgressTracker(unittest.TestCase):
+    def test_throttled_updates_end_at_total(self):
+        updates = []
+        tracker = ProgressTracker(updates.append, "species", every=4)
+        tracker.start_level(3, 10)
+        for _ in range(10):
+            tracker.advance()
+        self.assertEqual([u.done for u in updates], [4, 8, 10])
+        self.assertEqual(updates[-1].total, 10)
+        self.assertEqual(updates[-1].fraction, 1.0)
+
+    def test_rate_and_eta(self):
+        update = ProgressUpdate("species", 2, 25, 100, 5.0)
+        self.assertEqual(update.rate, 5.0)
+        self.assertEqual(update.eta, 15.0)
+        self.assertIsNone(ProgressUpdate("species", 2, 0, 100, 0.0).eta)
+
+        out = io.StringIO()
+        print_progress(update, file=out)
+        self.assertIn("25/100", out.getvalue())
+
+
+class TestPipelineProgress(unittest.TestCase):
+    def setUp(self):
+        self.G = get_example("ring_8")
+
+    def test_species_levels_are_complete(self):
+        updates = []
+        get_unique_fully_connected_subgraphs(self.G, progress=updates.append)
+        levels = final_updates(updates)
+        n = len(self.G)
+        self.assertEqual(sorted(level for _, level in levels), list(range(1, n + 1)))
+        for (_, r), update in levels.items():
+            self.assertEqual((update.done, update.total), (comb(n, r), comb(n, r)))
+
+    def test_dimer_progress_serial_and_pool(self):
+        species = get_unique_fully_connected_subgraphs(self.G)
+        for use_multiprocessing in (False, True):
+            updates = []
+            reactions = find_all_dimer_reactions(species, use_multiprocessing, progress=updates.append)
+            self.assertEqual(len(reactions), 16)
+            for (_, size), update in final_updates(updates).items():
+                n_species = sum(len(H) == size for H in species)
+                self.assertEqual(update.done, update.total)
+                self.assertEqual(update.total, n_species * split_work_units(size))
+
+    def test_transformation_progress(self):
+        updates = []
+        species = get_unique_fully_connected_subgraphs(self.G)
+        find_all_transformable_subgraph_pairs(self.G, species, progress=updates.append)
+        self.assertEqual(updates[-1].done, comb(len(species), 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
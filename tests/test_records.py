@@ -0,0 +1,71 @@
+import pickle
+import unittest
+
+from ode_gen.complexes.examples import get_example
+from ode_gen.complexes.subcomplexes import canonical_hash, get_unique_fully_connected_subgraphs
+from ode_gen.reactions import DimerReaction, Transformation
+from ode_gen.reactions.dimer import find_all_dimer_reactions, get_broken_edges
+from ode_gen.reactions.transformation import find_all_transformable_subgraph_pairs
+
+
+class TestDimerReactionRecords(unittest.TestCase):
+    def setUp(self):
+        self.G = get_example("asymmetry_4mer")
+        self.species = get_unique_fully_connected_subgraphs(self.G)
+        self.reactions = find_all_dimer_reactions(self.species)
+
+    def test_records_share_the_species_list(self):
+        self.assertTrue(all(isinstance(r, DimerReaction) for r in self.reactions))
+        self.assertEqual(len({id(r.species) for r in self.reactions}), 1)
+        with self.assertRaises(AttributeError):
+            self.reactions[0].extra = None
+
+    def test_reactant_ids_match_parts(self):
+        for r in self.reactions:
+            for part, reactant in zip(r.part_graphs(), r.reactants):
+                self.assertIsNotNone(reactant)
+                self.assertEqual(canonical_hash(part), canonical_hash(r.species[reactant]))
+
+    def test_legacy_unpacking(self):
+        for r in self.reactions:
+            part1, part2, specie = r
+            self.assertEqual(part1 | part2, set(specie))
+            self.assertIs(r[2], r.product_graph)
+            self.assertEqual([r[0], r[1], r[-1]], list(r))
+            self.assertEqual(r[:2], (part1, part2))
+            with self.assertRaises(IndexError):
+                r[3]
+            # the fused cut mask gives the same bonds as the separate pass
+            self.assertEqual(sorted(r.broken_edges()), sorted(get_broken_edges(specie, part1, part2)))
+            self.assertEqual(r.n_broken_bonds, len(r.broken_edges()))
+            self.assertTrue(r.broken_edges())
+
+    def test_pool_records_refer_to_parent_species(self):
+        pooled = find_all_dimer_reactions(self.species, use_multiprocessing=True)
+        self.assertEqual([(r.product, r.reactants, r.part1, r.part2, r.cut_mask) for r in pooled],
+                         [(r.product, r.reactants, r.part1, r.part2, r.cut_mask) for r in self.reactions])
+        self.assertIs(pooled[0].product_graph, pooled[-1].species[pooled[0].product])
+
+
+class TestTransformationRecords(unittest.TestCase):
+    def test_records_and_legacy_unpacking(self):
+        G = get_example("asymmetry_4mer")
+        species = get_unique_fully_connected_subgraphs(G)
+        pairs = find_all_transformable_subgraph_pairs(G, species)
+        self.assertEqual(len(pairs), 1)
+
+        t = pairs[0]
+        self.assertIsInstance(t, Transformation)
+        G1, G2, direction, edges = t
+        self.assertIs(G1, species[t.source])
+        self.assertIs(G2, t.target_graph)
+        self.assertEqual(direction, t.direction)
+        self.assertEqual(edges, list(t.edges))
+        self.assertEqual([t[i] for i in range(-4, 4)], list(t) * 2)
+        with self.assertRaises(IndexError):
+            t[4]
+        self.assertEqual(pickle.loads(pickle.dumps(t)).edges, t.edges)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+
+import networkx as nx
+
+from ode_gen.complexes.counting import count_species_by_size, orbit_upper_bound_by_size
+from ode_gen.complexes.examples import get_example
+from ode_gen.complexes.sampling import estimate_species_counts, sample_connected_subsets
+from ode_gen.complexes.subcomplexes import _bit_indices
+from ode_gen.hashset import popcount
+from ode_gen.stats import EnumerationStats
+
+
+class TestSampling(unittest.TestCase):
+    def test_walks_visit_growing_connected_subsets(self):
+        G = get_example("tetrahedral_cage")
+        nodes = list(G)
+        walks = list(sample_connected_subsets(G, 200, max_size=8, seed=0))
+        self.assertEqual(len(walks), 200)
+        for walk in walks:
+            self.assertLessEqual(len(walk), 8)
+            for size, (mask, weight) in enumerate(walk, 1):
+                self.assertEqual(popcount(mask), size)
+                self.assertTrue(nx.is_connected(G.subgraph(nodes[i] for i in _bit_indices(mask))))
+                self.assertGreaterEqual(weight, len(G))
+            for (smaller, _), (larger, _) in zip(walk, walk[1:]):
+                self.assertEqual(smaller & larger, smaller)
+        self.assertEqual(walks, list(sample_connected_subsets(G, 200, max_size=8, seed=0)))
+
+    def test_estimates_cover_exact_counts(self):
+        G = get_example("tetrahedral_cage")
+        stats = EnumerationStats()
+        estimates = estimate_species_counts(G, n_samples=3000, seed=1, stats=stats)
+        orbits = orbit_upper_bound_by_size(G)
+        species = count_species_by_size(G)
+        # single nodes and bonds are reached by every walk with known weights
+        self.assertEqual(estimates[1].subsets, 12)
+        self.assertEqual(estimates[1].orbits, 1)
+        for size in range(1, 6):
+            estimate = estimates[size]
+            with self.subTest(size=size):
+                low, high = estimate.orbits_interval
+                self.assertLessEqual(low - 1e-9, orbits[size])
+                self.assertLessEqual(orbits[size], high + 1e-9)
+        for size, estimate in estimates.items():
+            self.assertLessEqual(estimate.observed_species, species[size])
+        self.assertEqual(stats.counters["automorphisms"], 24)
+
+
+if __name__ == "__main__":
+    unittest.main()
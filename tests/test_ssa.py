@@ -0,0 +1,100 @@
+import unittest
+
+import numpy as np
+
+from ode_gen.complexes.examples import get_example
+from ode_gen.complexes.subcomplexes import get_unique_fully_connected_subgraphs
+from ode_gen.reactions import ReactionNetwork
+from ode_gen.reactions.dimer import find_all_dimer_reactions
+from ode_gen.reactions.network import ASSOCIATION
+from ode_gen.reactions.ssa import GillespieSimulator
+from ode_gen.stats import EnumerationStats
+
+
+def brute_force_propensities(network, rate_constants, counts):
+    propensities = []
+    for k in range(network.n_reactions):
+        consumed = list(network.consumed(k))
+        a = rate_constants[k] * counts[consumed[0]]
+        if len(consumed) == 2:
+            same = consumed[0] == consumed[1]
+            a *= (counts[consumed[1]] - same) / (1 + same)
+        propensities.append(a)
+    return np.array(propensities)
+
+
+class TestGillespieSimulator(unittest.TestCase):
+    def setUp(self):
+        species = get_unique_fully_connected_subgraphs(get_example("ring_8"))
+        self.network = ReactionNetwork.from_reactions(find_all_dimer_reactions(species), reversible=True)
+        self.sizes = np.array([len(H) for H in self.network.species])
+        self.counts = np.where(self.sizes == 1, 50, 0)
+        self.rates = np.where(self.network.kinds == ASSOCIATION, 0.01, 0.5)
+
+    def test_propensities_and_conservation(self):
+        sim = GillespieSimulator(self.network, self.rates, self.counts, seed=3)
+        np.testing.assert_allclose(sim.propensities, brute_force_propensities(self.network, self.rates, self.counts))
+        # A + A -> A2 among 50 monomers
+        self.assertAlmostEqual(sim.total_propensity, 0.01 * 50 * 49 / 2)
+        for _ in range(500):
+            self.assertIsNotNone(sim.step())
+            self.assertEqual((sim.counts * self.sizes).sum(), 50)
+            self.assertTrue((sim.counts >= 0).all())
+        np.testing.assert_allclose(sim.propensities, brute_force_propensities(self.network, self.rates, sim.counts))
+        self.assertAlmostEqual(sim.total_propensity, sim.propensities.sum())
+
+    def test_selection_never_returns_a_zero_propensity_reaction(self):
+        # only closed rings: everything but their dissociations (not reactions 0 and 1) has zero propensity
+        counts = np.where(self.sizes == 8, 10, 0)
+        sim = GillespieSimulator(self.network, self.rates, counts, seed=0)
+        self.assertTrue((sim.propensities[:2] == 0.0).all())
+        # a rounding residue in the sums above reactions 0 and 1, as left by an overshooting descent
+        eps = 1e-9 * sim.total_propensity
+        node = (sim._offset + 1) >> 1
+        while node:
+            sim._tree[node] += eps
+            node >>= 1
+        self.assertGreater(sim.propensities[sim._select(0.5 * eps)], 0.0)
+        self.assertGreater(sim.propensities[sim._select(sim.total_propensity)], 0.0)
+
+    def test_run_is_reproducible_and_sampled(self):
+        stats = EnumerationStats()
+        times = np.linspace(0.0, 5.0, 11)
+        samples = GillespieSimulator(self.network, self.rates, self.counts, seed=7).run(t_end=5.0, sample_times=times,
+                                                                                        stats=stats)
+        again = GillespieSimulator(self.network, self.rates, self.counts, seed=7).run(t_end=5.0, sample_times=times)
+        self.assertEqual(samples.shape, (11, self.network.n_species))
+        np.testing.assert_array_equal(samples, again)
+        np.testing.assert_array_equal(samples[0], self.counts)
+        self.assertTrue(((samples * self.sizes).sum(axis=1) == 50).all())
+        self.assertGreater(stats.counters["ssa_events"], 0)
+
+        sim = GillespieSimulator(self.network, self.rates, self.counts, seed=7)
+        sim.run(max_events=25)
+        self.assertEqual(sim.n_events, 25)
+
+    def test_exhausted_network(self):
+        sim = GillespieSimulator(self.network, self.rates, np.zeros(self.network.n_species, dtype=int))
+        self.assertIsNone(sim.step())
+        sim.run(t_end=1.0)
+        self.assertEqual(sim.n_events, 0)
+        with self.assertRaises(ValueError):
+            GillespieSimulator(self.network, self.rates, [1, 2])
+
+    def test_waiting_times(self):
+        # only the monomer dimerization can fire: mean first waiting time 1 / (c x (x - 1) / 2)
+        rates = np.zeros(self.network.n_reactions)
+        first = next(k for k in range(self.network.n_reactions)
+                     if self.network.kinds[k] == ASSOCIATION and self.sizes[self.network.consumed(k)].sum() == 2)
+        rates[first] = 1.0
+        counts = np.where(self.sizes == 1, 5, 0)
+        waits = []
+        for seed in range(2000):
+            sim = GillespieSimulator(self.network, rates, counts, seed=seed)
+            sim.step()
+            waits.append(sim.time)
+        self.assertAlmostEqual(np.mean(waits), 0.1, delta=0.01)
+
+
+if __name__ == "__main__":
+    unittest.main()
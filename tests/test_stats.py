@@ -0,0 +1,56 @@
+import pickle
+import unittest
+
+from ode_gen.complexes.examples import get_example
+from ode_gen.complexes.subcomplexes import get_unique_fully_connected_subgraphs
+from ode_gen.reactions.dimer import find_all_dimer_reactions
+from ode_gen.reactions.transformation import find_all_transformable_subgraph_pairs
+from ode_gen.stats import EnumerationStats
+
+
+class TestEnumerationStats(unittest.TestCase):
+    def setUp(self):
+        self.G = get_example("asymmetry_4mer")
+
+    def test_species_counters(self):
+        stats = EnumerationStats()
+        species = get_unique_fully_connected_subgraphs(self.G, stats=stats)
+        counters = stats.counters
+
+        self.assertEqual(counters["species"], len(species))
+        self.assertEqual(counters["subsets_examined"], 2 ** len(self.G) - 1)
+        self.assertEqual(counters["hash_computations"],
+                         counters["subsets_examined"] - counters["connectivity_rejections"])
+        self.assertEqual(counters["hash_cache_hits"], counters["hash_computations"] - len(species))
+        self.assertIn("hashing", stats.timings)
+        self.assertEqual([list(H) for H in get_unique_fully_connected_subgraphs(self.G)], [list(H) for H in species])
+
+    def test_pool_workers_are_aggregated(self):
+        species = get_unique_fully_connected_subgraphs(self.G)
+        serial, pooled = EnumerationStats(), EnumerationStats()
+        reactions = find_all_dimer_reactions(species, stats=serial)
+        pooled_reactions = find_all_dimer_reactions(species, use_multiprocessing=True, stats=pooled)
+
+        self.assertEqual(len(reactions), len(pooled_reactions))
+        self.assertEqual(serial.counters, pooled.counters)
+        self.assertEqual(serial.counters["splits"], len(reactions))
+
+    def test_transformation_counters(self):
+        stats = EnumerationStats()
+        species = get_unique_fully_connected_subgraphs(self.G)
+        pairs = find_all_transformable_subgraph_pairs(self.G, species, stats=stats)
+        self.assertEqual(stats.counters["transformations"], len(pairs))
+        self.assertEqual(stats.counters["pairs_compared"], len(species) * (len(species) - 1) // 2)
+
+    def test_merge_and_pickle(self):
+        a, b = EnumerationStats(), EnumerationStats()
+        a.count("x", 2)
+        with b.phase("work"):
+            b.count("x")
+        merged = pickle.loads(pickle.dumps(a)).merge(b)
+        self.assertEqual(merged.counters["x"], 3)
+        self.assertEqual(set(merged.as_dict()["timings"]), {"work"})
+
+
+if __name__ == '__main__':
+    unittest.main()
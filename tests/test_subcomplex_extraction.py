@@ -1,7 +1,5 @@
 import unittest
 import networkx as nx
-import time
-import warnings
 
 # Replace with actual import path
 from ode_gen.complexes.subcomplexes import get_unique_fully_connected_subgraphs
@@ -22,22 +20,13 @@ class TestFullyConnectedSubgraphDetection8y7s(unittest.TestCase):
         self.G.add_edge(1, 2, type="c")
 
     def test_unique_subgraphs(self):
-        start = time.time()
         result = get_unique_fully_connected_subgraphs(self.G)
-        elapsed = time.time() - start
-
-        if elapsed > 10.0:
-            self.fail(f"ERROR: Test terminated — elapsed time {elapsed:.2f}s exceeds 10 seconds.")
-        elif elapsed > 0.01:
-            warnings.warn(f"WARNING: Elapsed time {elapsed:.2f}s exceeds 0.1 second.")
 
         self.assertEqual(
             len(result), 6,
             f"ERROR: Expected 6 unique subgraphs, but got {len(result)}."
         )
 
-        print(f"Test passed in {elapsed:.4f} seconds.")
-
 class TestFullyConnectedSubgraphDetectionHetero8mer(unittest.TestCase):
     def setUp(self):
         self.G = nx.Graph()
@@ -60,21 +49,12 @@ class TestFullyConnectedSubgraphDetectionHetero8mer(unittest.TestCase):
         self.G.add_edge(7, 0, type="ha")
 
     def test_unique_subgraphs(self):
-        start = time.time()
         result = get_unique_fully_connected_subgraphs(self.G)
-        elapsed = time.time() - start
-
-        if elapsed > 10.0:
-            self.fail(f"ERROR: Test terminated — elapsed time {elapsed:.2f}s exceeds 10 seconds.")
-        elif elapsed > 0.1:
-            warnings.warn(f"WARNING: Elapsed time {elapsed:.2f}s exceeds 0.1 second.")
 
         self.assertEqual(
             len(result), 57,
             f"ERROR: Expected 57 unique subgraphs, but got {len(result)}."
         ) # 7 * 8 + 1 = 57
-
-        print(f"Test passed in {elapsed:.4f} seconds.")
         
 class TestFullyConnectedSubgraphDetectionAsymmetric(unittest.TestCase):
     def setUp(self):
@@ -92,21 +72,12 @@ class TestFullyConnectedSubgraphDetectionAsymmetric(unittest.TestCase):
         self.G.add_edge(1, 3, type="ab")
 
     def test_unique_subgraphs(self):
-        start = time.time()
         result = get_unique_fully_connected_subgraphs(self.G)
-        elapsed = time.time() - start
-
-        if elapsed > 10.0:
-            self.fail(f"ERROR: Test terminated — elapsed time {elapsed:.2f}s exceeds 10 seconds.")
-        elif elapsed > 0.1:
-            warnings.warn(f"WARNING: Elapsed time {elapsed:.2f}s exceeds 0.1 second.")
 
         self.assertEqual(
             len(result), 10,
             f"ERROR: Expected 10 unique subgraphs, but got {len(result)}."
         ) # 3 + 3 + 3 + 1 = 10
 
-        print(f"Test passed in {elapsed:.4f} seconds.")
-
 if __name__ == '__main__':
     unittest.main()
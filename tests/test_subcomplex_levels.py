@@ -0,0 +1,46 @@
+import unittest
+
+import networkx as nx
+
+from ode_gen.complexes.examples import get_example
+from ode_gen.complexes.subcomplexes import get_unique_fully_connected_subgraphs, iter_species_by_level
+from ode_gen.complexes.wl import wl_hash
+from ode_gen.stats import EnumerationStats
+
+
+class TestSpeciesByLevel(unittest.TestCase):
+    def test_levels_match_full_enumeration(self):
+        for name in ["8y7s", "asymmetry_4mer", "ring_8", "tetrahedral_cage", "random_12"]:
+            G = get_example(name)
+            expected = [tuple(H) for H in get_unique_fully_connected_subgraphs(G)]
+            with self.subTest(case=name):
+                levels = list(iter_species_by_level(G))
+                self.assertEqual([size for size, _ in levels], list(range(1, len(levels) + 1)))
+                for size, species in levels:
+                    self.assertTrue(all(len(H) == size for H in species))
+                self.assertEqual([tuple(H) for _, species in levels for H in species], expected)
+
+    def test_max_size_and_early_stop(self):
+        G = get_example("random_12")
+        stats = EnumerationStats()
+        levels = list(iter_species_by_level(G, max_size=3, stats=stats))
+        self.assertEqual([size for size, _ in levels], [1, 2, 3])
+        self.assertEqual(stats.counters["species"], sum(len(species) for _, species in levels))
+
+        # the first level is available before the larger ones are grown
+        stats = EnumerationStats()
+        size, species = next(iter_species_by_level(G, stats=stats))
+        self.assertEqual(size, 1)
+        self.assertEqual(stats.counters["subsets_examined"], len(G))
+
+    def test_several_components(self):
+        G = nx.disjoint_union(get_example("ring_8"), get_example("asymmetry_4mer"))
+        G.add_node("free", type="Z")
+        expected = {wl_hash(H) for H in get_unique_fully_connected_subgraphs(G)}
+        found = [wl_hash(H) for _, species in iter_species_by_level(G) for H in species]
+        self.assertEqual(len(found), len(set(found)))
+        self.assertEqual(set(found), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
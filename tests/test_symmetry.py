@@ -0,0 +1,245 @@
+import unittest
+import itertools
+import numpy as np
+
+from ode_gen.symmetry import tensors
+from ode_gen.symmetry import utils
+from ode_gen.symmetry.pointgroup import PointGroup
+from ode_gen.symmetry.species import SpeciesSymmetry, set_node_positions, get_species_coordinates
+from ode_gen.complexes.subcomplexes import get_unique_fully_connected_subgraphs
+from ode_gen.complexes.wl import BatchedWL
+import networkx as nx
+from ode_gen.symmetry.rotations import (
+    Rotation,
+    ImproperRotation,
+    rotation_matrix,
+    rotation_matrices,
+    improper_rotation_matrices,
+    get_group_operations,
+    orient_operations,
+)
+
+GOLDEN_RATIO = (1 + np.sqrt(5)) / 2
+
+TETRAHEDRON = np.array([[1, 1, 1], [-1, -1, 1], [-1, 1, -1], [1, -1, -1]], dtype=float)
+CUBE = np.array(list(itertools.product([1, -1], repeat=3)), dtype=float)
+ICOSAHEDRON = np.array([
+    p for s1 in (1, -1) for s2 in (1, -1)
+    for p in [(0, s1, s2 * GOLDEN_RATIO), (s1, s2 * GOLDEN_RATIO, 0), (s2 * GOLDEN_RATIO, 0, s1)]
+], dtype=float)
+
+
+def ring(n, radius=1.0, height=0.0):
+    angles = 2 * np.pi * np.arange(n) / n
+    return np.c_[radius * np.cos(angles), radius * np.sin(angles), np.full(n, height)]
+
+
+def maps_onto_itself(matrix, coords):
+    transformed = np.dot(coords, matrix.T)
+    distances = np.linalg.norm(transformed[:, None] - coords[None], axis=-1)
+    return np.all(distances.min(axis=1) < 1e-6)
+
+
+def reference_inertia_tensor(coords):
+    """Per-site accumulation the vectorized kernel must agree with."""
+    inertia_tensor = np.zeros((3, 3))
+    total_inertia = 0.0
+    for c in coords:
+        r2 = np.dot(c, c)
+        inertia_tensor += np.identity(3) * r2 - np.outer(c, c)
+        total_inertia += r2
+    return inertia_tensor / total_inertia
+
+
+class TestInertiaTensor(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.batch = rng.normal(size=(7, 12, 3))
+
+    def test_single_configuration(self):
+        for coords in self.batch:
+            np.testing.assert_allclose(
+                tensors.get_inertia_tensor(coords), reference_inertia_tensor(coords)
+            )
+
+    def test_batched_configurations(self):
+        result = tensors.get_inertia_tensor(self.batch)
+        self.assertEqual(result.shape, (7, 3, 3))
+        for coords, tensor in zip(self.batch, result):
+            np.testing.assert_allclose(tensor, reference_inertia_tensor(coords))
+
+    def test_zero_padding_does_not_contribute(self):
+        padded = np.concatenate([self.batch, np.zeros((7, 5, 3))], axis=1)
+        np.testing.assert_allclose(
+            tensors.get_inertia_tensor(padded), tensors.get_inertia_tensor(self.batch)
+        )
+
+    def test_degenerate_configuration_is_not_normalized(self):
+        np.testing.assert_array_equal(tensors.get_inertia_tensor(np.zeros((3, 3))), np.zeros((3, 3)))
+
+
+class TestDegeneracy(unittest.TestCase):
+    def test_scalar_results(self):
+        self.assertEqual(tensors.get_degeneracy([1.0, 1.0, 2.0]), 2)
+        self.assertEqual(tensors.get_degeneracy([1.0, 1.2, 1.4], tolerance=0.01), 1)
+        self.assertEqual(tensors.get_degeneracy([1.0, 1.0, 1.0]), 3)
+        self.assertEqual(utils.get_non_degenerated([1.0, 1.0, 2.0]), 2)
+        self.assertEqual(utils.get_non_degenerated([2.0, 1.0, 2.0]), 1)
+
+    def test_batched_results(self):
+        eigenvalues = np.array([[1.0, 1.0, 2.0], [1.0, 2.0, 3.0], [0.5, 0.5, 0.5]])
+        np.testing.assert_array_equal(tensors.get_degeneracy(eigenvalues), [2, 1, 3])
+        np.testing.assert_array_equal(
+            utils.get_non_degenerated([[1.0, 1.0, 2.0], [3.0, 1.0, 1.0]]), [2, 0]
+        )
+
+    def test_non_degenerated_raises(self):
+        with self.assertRaises(RuntimeError):
+            utils.get_non_degenerated([1.0, 1.0, 1.0])
+
+
+class TestRotations(unittest.TestCase):
+    def test_stacked_rodrigues_matches_single(self):
+        rng = np.random.default_rng(1)
+        axes = rng.normal(size=(9, 3))
+        angles = rng.uniform(0, 2 * np.pi, size=9)
+        stacked = rotation_matrices(axes, angles)
+        self.assertEqual(stacked.shape, (9, 3, 3))
+        for axis, angle, matrix in zip(axes, angles, stacked):
+            np.testing.assert_allclose(matrix, rotation_matrix(axis, angle))
+            np.testing.assert_allclose(np.dot(matrix, matrix.T), np.identity(3), atol=1e-12)
+
+    def test_broadcast_single_axis(self):
+        stacked = rotation_matrices([0, 0, 1], np.pi / 2 * np.arange(4))
+        np.testing.assert_allclose(stacked[1], [[0, -1, 0], [1, 0, 0], [0, 0, 1]], atol=1e-12)
+
+    def test_improper_rotation(self):
+        axis = np.array([0.0, 0.0, 2.0])
+        matrix = improper_rotation_matrices(axis, np.pi / 2)
+        np.testing.assert_allclose(matrix, [[0, -1, 0], [1, 0, 0], [0, 0, -1]], atol=1e-12)
+        np.testing.assert_allclose(ImproperRotation(axis, order=4).get_matrix(), matrix)
+
+    def test_operation_matrix_is_cached(self):
+        c3 = Rotation([1, 1, 1], order=3)
+        self.assertIs(c3.get_matrix(), c3.get_matrix())
+        with self.assertRaises(AttributeError):
+            c3.extra = None
+
+    def test_spherical_group_tables(self):
+        for symbol, order, coords in [("T", 12, TETRAHEDRON), ("O", 24, CUBE), ("I", 60, ICOSAHEDRON)]:
+            operations = get_group_operations(symbol)
+            self.assertEqual(len(operations), order)
+            np.testing.assert_allclose(operations[0], np.identity(3))
+            np.testing.assert_allclose(np.linalg.det(operations), 1.0)
+            self.assertTrue(all(maps_onto_itself(op, coords) for op in operations))
+
+    def test_orient_operations(self):
+        rotation = rotation_matrix([0.3, -0.2, 0.9], 0.7)
+        operations = get_group_operations("O")
+        x, y = np.identity(3)[:2]
+        oriented = orient_operations(operations, (x, y), (rotation[:, 0], rotation[:, 1]))
+        rotated_cube = np.dot(CUBE, rotation.T)
+        self.assertTrue(all(maps_onto_itself(op, rotated_cube) for op in oriented))
+
+
+class TestPointGroup(unittest.TestCase):
+    def assertPointGroup(self, coords, expected):
+        pg = PointGroup(positions=coords, symbols=["A"] * len(coords))
+        self.assertEqual(pg.get_point_group(), expected)
+
+    def test_spherical_groups(self):
+        self.assertPointGroup(TETRAHEDRON, "T")
+        self.assertPointGroup(CUBE, "O")
+        self.assertPointGroup(ICOSAHEDRON, "I")
+
+    def test_axial_groups(self):
+        self.assertPointGroup(ring(5), "C5")
+        self.assertPointGroup(np.vstack([ring(6, height=0.5), ring(6, height=-0.5)]), "C6")
+        self.assertPointGroup(np.array([[2, 1, 0], [-2, 1, 0], [2, -1, 0], [-2, -1, 0]], dtype=float), "C2")
+
+    def test_batched_check_matches_single_checks(self):
+        pg = PointGroup(positions=ring(4), symbols=["A"] * 4)
+        orders = np.arange(2, 7)
+        found = pg._check_ops(rotation_matrices([0, 0, 1], 2 * np.pi / orders))
+        expected = [pg._check_op(Rotation([0, 0, 1], order=n)) for n in orders]
+        np.testing.assert_array_equal(found, expected)
+        np.testing.assert_array_equal(found, [True, False, True, False, False])
+
+
+class TestProperRotations(unittest.TestCase):
+    def assertSymmetryNumber(self, coords, expected, symbols=None):
+        symbols = symbols or ["A"] * len(coords)
+        rotation = rotation_matrix([0.2, 0.5, -0.7], 1.1)
+        for positions in (coords, np.dot(coords, rotation.T)):
+            pg = PointGroup(positions=positions, symbols=symbols)
+            matrices, permutations = pg.get_proper_rotations()
+            self.assertEqual(pg.get_symmetry_number(), expected)
+            np.testing.assert_allclose(matrices[0], np.identity(3), atol=1e-12)
+
+            # every operation maps each site onto its permuted partner of the same symbol
+            standard = np.array(pg.get_standard_coordinates())
+            for matrix, permutation in zip(matrices, permutations):
+                np.testing.assert_allclose(np.dot(standard, matrix.T), standard[permutation], atol=1e-9)
+                self.assertEqual([symbols[k] for k in permutation], list(symbols))
+
+    def test_spherical_groups(self):
+        self.assertSymmetryNumber(TETRAHEDRON, 12)
+        self.assertSymmetryNumber(CUBE, 24)
+        self.assertSymmetryNumber(ICOSAHEDRON, 60)
+
+    def test_dihedral_axes(self):
+        self.assertSymmetryNumber(ring(5), 10)
+        self.assertSymmetryNumber(np.vstack([ring(6, height=0.5), ring(6, height=-0.5)]), 12)
+        self.assertSymmetryNumber(np.array([[2, 1, 0], [-2, 1, 0], [2, -1, 0], [-2, -1, 0]], dtype=float), 4)
+
+    def test_chiral_propeller(self):
+        propeller = np.vstack([ring(3), np.dot(ring(3, radius=0.6, height=0.4), rotation_matrix([0, 0, 1], 0.3).T)])
+        self.assertSymmetryNumber(propeller, 3, symbols=["A"] * 3 + ["B"] * 3)
+
+    def test_linear_and_single_site(self):
+        self.assertSymmetryNumber(np.array([[1.0, 0, 0], [-1.0, 0, 0]]), 2)
+        self.assertSymmetryNumber(np.array([[1.0, 0, 0], [-1.0, 0, 0]]), 1, symbols=["A", "B"])
+        self.assertSymmetryNumber(np.zeros((1, 3)), 1)
+
+
+class TestSpeciesSymmetry(unittest.TestCase):
+    def setUp(self):
+        # planar hexameric ring with binding sites on a hexagon
+        self.G = nx.cycle_graph(6)
+        nx.set_node_attributes(self.G, "A", "type")
+        nx.set_edge_attributes(self.G, "hex", "type")
+        set_node_positions(self.G, dict(enumerate(ring(6))))
+
+    def test_each_unique_species_is_classified_once(self):
+        symmetry = SpeciesSymmetry()
+        subsets = [self.G.subgraph(nodes) for nodes in [(0,), (3,), (0, 1), (2, 3), (4, 5), (0, 1, 2), (1, 2, 3)]]
+        groups = list(symmetry.point_groups(subsets))
+
+        self.assertEqual(len(groups), 7)
+        self.assertEqual(symmetry.n_classified, 3)
+        self.assertIs(groups[2][1], groups[4][1])
+
+    def test_symmetry_numbers_of_enumerated_species(self):
+        symmetry = SpeciesSymmetry()
+        numbers = {len(H): symmetry.symmetry_number(H) for H in get_unique_fully_connected_subgraphs(self.G)}
+        self.assertEqual(numbers, {1: 1, 2: 2, 3: 2, 4: 2, 5: 2, 6: 12})
+
+    def test_dedup_hashes_are_cache_keys(self):
+        symmetry = SpeciesSymmetry()
+        hashes = BatchedWL(self.G).hash_subsets([(0, 1), (3, 4)])
+        first = symmetry.point_group(self.G.subgraph((0, 1)))
+        self.assertIs(symmetry.point_group(self.G.subgraph((3, 4)), hashes[1]), first)
+        self.assertEqual(hashes[0], hashes[1])
+        self.assertEqual(symmetry.n_classified, 1)
+
+    def test_species_without_positions(self):
+        G = nx.path_graph(3)
+        nx.set_node_attributes(G, "A", "type")
+        nx.set_edge_attributes(G, "ab", "type")
+        self.assertIsNone(get_species_coordinates(G))
+        self.assertIsNone(SpeciesSymmetry().point_group(G))
+        self.assertEqual(SpeciesSymmetry().symmetry_number(G), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import itertools
+import unittest
+
+import networkx as nx
+
+from ode_gen.complexes.examples import get_example
+from ode_gen.complexes.subcomplexes import canonical_hash
+from ode_gen.complexes.wl import BatchedWL, wl_hash
+
+
+def connected_subsets(G):
+    nodes = list(G)
+    for r in range(1, len(nodes) + 1):
+        for subset in itertools.combinations(nodes, r):
+            if r == 1 or nx.is_connected(G.subgraph(subset)):
+                yield subset
+
+
+class TestBatchedWL(unittest.TestCase):
+    def assertSamePartition(self, keys, reference):
+        # equal batched hashes <=> equal NetworkX WL hashes
+        self.assertEqual(len(set(zip(keys, reference))), len(set(keys)))
+        self.assertEqual(len(set(keys)), len(set(reference)))
+
+    def test_partition_matches_networkx(self):
+        for name in ["asymmetry_4mer", "ring_8", "octahedral_cage", "random_12"]:
+            G = get_example(name)
+            subsets = list(connected_subsets(G))
+            with self.subTest(case=name):
+                self.assertSamePartition(
+                    BatchedWL(G).hash_subsets(subsets),
+                    [canonical_hash(G.subgraph(subset)) for subset in subsets],
+                )
+
+    def test_batches_and_parents_are_consistent(self):
+        G = get_example("random_12")
+        subsets = list(connected_subsets(G))[:300]
+        wl = BatchedWL(G)
+        batched = wl.hash_subsets(subsets)
+        self.assertEqual(batched[:7] + batched[7:], wl.hash_subsets(subsets[:7]) + wl.hash_subsets(subsets[7:]))
+        # a subgraph hashes the same as a relabeled copy of itself
+        for subset, h in zip(subsets[::37], batched[::37]):
+            copy = nx.convert_node_labels_to_integers(G.subgraph(subset).copy(), first_label=100)
+            self.assertEqual(wl_hash(copy), h)
+
+    def test_splits_hash_both_parts(self):
+        G = get_example("asymmetry_4mer")
+        wl = BatchedWL(G)
+        parts, complements = wl.hash_splits([(0,), (0, 1)])
+        self.assertEqual(parts, wl.hash_index_subsets([(0,), (0, 1)]))
+        self.assertEqual(complements, wl.hash_index_subsets([(1, 2, 3), (2, 3)]))
+
+    def test_types_matter(self):
+        G = nx.path_graph(3)
+        nx.set_node_attributes(G, {0: "A", 1: "A", 2: "B"}, "type")
+        nx.set_edge_attributes(G, {(0, 1): "x", (1, 2): "y"}, "type")
+        wl = BatchedWL(G)
+        h01, h12, h0, h2 = wl.hash_subsets([(0, 1), (1, 2), (0,), (2,)])
+        self.assertNotEqual(h01, h12)
+        self.assertNotEqual(h0, h2)
+        self.assertLess(max(h01, h12), 1 << 128)
+
+
+if __name__ == '__main__':
+    unittest.main()